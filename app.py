@@ -1,12 +1,17 @@
-import requests
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template, send_file
 import os
-import numpy as np
+import sqlite3
+import time
+import uuid
+import threading
+from functools import partial, wraps
 
-from src.data_loader import DataLoader
-from src.policy_checker import PolicyChecker
-from src.complaint_analyzer import ComplaintAnalyzer
-from src.update_tracker import UpdateTracker
+from src.data_loader import DataLoader, DocumentTooLarge
+from src.job_queue import JobStore, JobQueue
+from src.result_cache import ResultCache
+from src.utils.metrics import metrics
+from src.utils.profiler import profiler
+from src.utils.nltk_data import verify_nltk_data
 
 # Initialize Flask app with template folder
 app = Flask(
@@ -16,10 +21,310 @@ app = Flask(
 )
 
 # Initialize components
-policy_checker = PolicyChecker()
-complaint_analyzer = ComplaintAnalyzer()
-update_tracker = UpdateTracker()
-data_loader = DataLoader()
+data_loader = DataLoader(os.environ.get('APP_CONFIG', 'config.yaml'))
+
+try:
+    verify_nltk_data(data_loader.config.get('processing', {}).get('nltk_data_dir'))
+except LookupError as e:
+    # NLTK's default search path is still tried on first use; other endpoints are unaffected
+    app.logger.warning(str(e))
+
+metrics_config = data_loader.config.get('metrics', {})
+metrics.configure(
+    enabled=metrics_config.get('enabled', False),
+    multiprocess_dir=metrics_config.get('multiprocess_dir'),
+    flush_interval=metrics_config.get('flush_interval', 5)
+)
+
+profiling_config = data_loader.config.get('profiling', {})
+profiler.configure(
+    enabled=profiling_config.get('enabled', False),
+    output_dir=profiling_config.get('output_dir'),
+    # The token is a secret, so the config only names the variable holding it
+    token=os.environ.get(profiling_config.get('token_env') or 'PROFILE_TOKEN'),
+    sample_every=profiling_config.get('sample_every', 0),
+    endpoints=profiling_config.get('endpoints'),
+    mode=profiling_config.get('mode', 'cprofile'),
+    interval=profiling_config.get('interval', 0.005),
+    max_profiles=profiling_config.get('max_profiles', 200)
+)
+
+cache_config = data_loader.config.get('cache', {})
+result_cache = ResultCache(
+    max_entries=cache_config.get('max_entries', 1024),
+    db_path=cache_config.get('db_path'),
+    max_disk_entries=cache_config.get('max_disk_entries', 100000)
+)
+
+# The analysis components pull in sklearn, pandas, scipy and nltk, so each is
+# built (and its modules imported) on first use instead of at import time
+_components = {}
+_components_lock = threading.RLock()
+
+def component(factory):
+    """Build ``factory()`` once, on first call, and share it between requests."""
+    @wraps(factory)
+    def get():
+        try:
+            return _components[factory.__name__]
+        except KeyError:
+            pass
+        with _components_lock:
+            if factory.__name__ not in _components:
+                _components[factory.__name__] = factory()
+            return _components[factory.__name__]
+    return get
+
+@component
+def get_policy_checker():
+    from src.policy_checker import PolicyChecker
+    return PolicyChecker(result_cache=result_cache)
+
+@component
+def get_complaint_analyzer():
+    from src.complaint_analyzer import ComplaintAnalyzer
+    return ComplaintAnalyzer()
+
+@component
+def get_update_tracker():
+    from src.update_tracker import UpdateTracker
+    from src.history_store import SQLiteHistoryStore
+    from src.models.similarity_model import SimilarityModel
+    history_config = data_loader.config.get('history', {})
+    vectorizer_config = data_loader.config.get('ml_models', {}).get('similarity_vectorizer', {})
+    return UpdateTracker(
+        history_store=SQLiteHistoryStore(
+            db_path=history_config.get('db_path', './data/update_history.db'),
+            max_records=history_config.get('max_records', 100000),
+            max_age_days=history_config.get('max_age_days')
+        ),
+        similarity_model=SimilarityModel(
+            vectorizer_path=vectorizer_config.get('path'),
+            hashing_features=vectorizer_config.get('hashing_features', 2 ** 18)
+        )
+    )
+
+@component
+def get_compliance_model():
+    """The fitted ComplianceModel, or None when no artifact has been trained."""
+    from src.models.artifact import is_bundle
+    path = data_loader.config.get('ml_models', {}).get('compliance_checker', {}).get('path')
+    if is_bundle(path):
+        from src.models.compliance_model import ComplianceModel
+        return ComplianceModel().load_bundle(path)
+    if not path or not os.path.isfile(path):
+        return None
+    from src.models.compliance_model import ComplianceModel
+    return ComplianceModel().load_model(path)
+
+def _load_complaint_classifier(base_path):
+    # A bundle directory at base_path, else the older four joblib files next to it
+    from src.models.artifact import is_bundle
+    if is_bundle(base_path):
+        from src.models.complaint_classifier import ComplaintClassifier
+        return ComplaintClassifier().load_bundle(base_path)
+    if not base_path or not os.path.exists(f"{base_path}_classifier.pkl"):
+        return None
+    from src.models.complaint_classifier import ComplaintClassifier
+    classifier = ComplaintClassifier()
+    classifier.load_models(base_path)
+    return classifier
+
+def _classifier_batcher(classifier):
+    if classifier is None:
+        return None
+    from src.micro_batcher import MicroBatcher
+    classifier_config = data_loader.config.get('ml_models', {}).get('complaint_classifier', {})
+    return MicroBatcher(
+        classifier.predict_batch,
+        max_batch_size=classifier_config.get('batch_max_size', 64),
+        max_wait=classifier_config.get('batch_max_wait_ms', 5) / 1000
+    )
+
+@component
+def get_complaint_classifier():
+    """The fitted ComplaintClassifier, or None when no artifact has been trained."""
+    return _load_complaint_classifier(data_loader.config.get('ml_models', {}).get('complaint_classifier', {}).get('path'))
+
+@component
+def get_fast_complaint_classifier():
+    """The fitted linear ComplaintClassifier, or None when no artifact has been trained."""
+    return _load_complaint_classifier(data_loader.config.get('ml_models', {}).get('complaint_classifier', {}).get('fast_path'))
+
+@component
+def get_classifier_batcher():
+    return _classifier_batcher(get_complaint_classifier())
+
+@component
+def get_fast_classifier_batcher():
+    return _classifier_batcher(get_fast_complaint_classifier())
+
+@component
+def get_batch_engine():
+    from src.batch_engine import BatchEngine
+    from src.policy_checker import PolicyChecker
+    batch_config = data_loader.config.get('batch', {})
+    return BatchEngine(
+        max_workers=batch_config.get('max_workers'),
+        chunk_size=batch_config.get('chunk_size', 16),
+        item_timeout=batch_config.get('item_timeout', 30),
+        checker_factory=partial(PolicyChecker, result_cache=result_cache)
+    )
+
+def summarize_batch(results):
+    succeeded = [r for r in results if r['status'] == 'ok']
+    compliance_scores = [r.get('compliance_percentage', 0) for r in succeeded if isinstance(r.get('compliance_percentage'), (int, float))]
+    import numpy as np
+    summary = {
+        'total_policies': len(succeeded),
+        'failed_policies': len(results) - len(succeeded),
+        'average_compliance': np.mean(compliance_scores) if compliance_scores else 0,
+        'total_violations': sum(len(r.get('rule_violations', [])) for r in results),
+        'total_warnings': sum(len(r.get('warnings', [])) for r in results)
+    }
+    
+    return {
+        'results': results,
+        'summary': summary
+    }
+
+def run_check_policy_job(payload, context):
+    return get_policy_checker().check_policy_compliance(payload['policy_text'])
+
+def run_batch_check_job(payload, context):
+    policies = payload['policies']
+    batch_engine = get_batch_engine()
+    step = batch_engine.chunk_size * batch_engine.max_workers
+    results = []
+    for start in range(0, len(policies), step):
+        results.extend(batch_engine.check_policies(policies[start:start + step], checker=get_policy_checker()))
+        context.progress(len(results), len(policies))
+    return summarize_batch(results)
+
+def run_complaint_report_job(payload, context):
+    try:
+        return get_complaint_analyzer().generate_complaint_report_from_csv(payload['csv_path'], progress=context.progress)
+    finally:
+        discard_complaint_report_job(payload)
+
+def discard_complaint_report_job(payload):
+    try:
+        os.remove(payload['csv_path'])
+    except FileNotFoundError:
+        pass
+
+jobs_config = data_loader.config.get('jobs', {})
+job_spool_dir = jobs_config.get('spool_dir', './data/jobs')
+job_queue = JobQueue(
+    JobStore(jobs_config.get('db_path', './data/jobs.db')),
+    {
+        'check_policy': run_check_policy_job,
+        'batch_check': run_batch_check_job,
+        'complaint_report': run_complaint_report_job
+    },
+    num_workers=jobs_config.get('workers', 2),
+    stale_after=jobs_config.get('stale_after', 300),
+    cleanup={'complaint_report': discard_complaint_report_job}
+)
+# Threads do not survive fork; a preloading server starts them in each worker (gunicorn.conf.py).
+# Batch engine processes re-import this file as __mp_main__ under `python app.py` and run no jobs.
+if os.environ.get('PRELOAD_APP') != '1' and __name__ != '__mp_main__':
+    job_queue.start()
+
+def warm_up():
+    """Build every component and load the fitted models, e.g. before forking workers.
+    
+    Fitted arrays are made read-only so forked workers keep sharing their
+    pages. Returns the names of the components that were loaded.
+    """
+    from src.utils.freeze import freeze_arrays
+    
+    loaded = {
+        'policy_checker': get_policy_checker(),
+        'complaint_analyzer': get_complaint_analyzer(),
+        'update_tracker': get_update_tracker(),
+        'batch_engine': get_batch_engine(),
+        'compliance_model': get_compliance_model(),
+        'complaint_classifier': get_complaint_classifier(),
+        'fast_complaint_classifier': get_fast_complaint_classifier(),
+        'classifier_batcher': get_classifier_batcher(),
+        'fast_classifier_batcher': get_fast_classifier_batcher()
+    }
+    # Modules the components only import on first use
+    import nltk.tokenize
+    import pandas
+    import scipy.sparse
+    import sklearn.feature_extraction.text
+    import textstat
+    
+    similarity_model = loaded['update_tracker'].similarity_model
+    # The online vectorizer's document frequencies keep changing, so only a fitted one is frozen
+    if not similarity_model.is_online:
+        freeze_arrays(similarity_model.tfidf)
+    freeze_arrays(loaded['compliance_model'])
+    freeze_arrays(loaded['complaint_classifier'])
+    freeze_arrays(loaded['fast_complaint_classifier'])
+    return [name for name, instance in loaded.items() if instance is not None]
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_start = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    if metrics.enabled and 'request_start' in g:
+        # The route pattern, not the path, so job ids do not each become a series
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.record_request(
+            endpoint, request.method, response.status_code,
+            time.perf_counter() - g.request_start,
+            request.content_length,
+            None if response.is_streamed else response.calculate_content_length()
+        )
+    return response
+
+@app.before_request
+def start_request_profile():
+    if profiler.enabled:
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        trigger = profiler.trigger(request.headers.get('X-Profile') or request.args.get('profile'), endpoint)
+        if trigger is not None:
+            g.profile = profiler.start(request.headers.get('X-Request-ID'), trigger)
+
+@app.after_request
+def add_profile_header(response):
+    if 'profile' in g:
+        g.profile_status = response.status_code
+        response.headers['X-Profile-Id'] = g.profile['id']
+    return response
+
+@app.teardown_request
+def save_request_profile(exc):
+    # Teardown also runs when the view raised, which is when a profile is most wanted
+    profile = g.pop('profile', None)
+    if profile is not None:
+        try:
+            profiler.finish(
+                profile, request.method,
+                request.url_rule.rule if request.url_rule is not None else 'unmatched',
+                request.path, g.get('profile_status', 500)
+            )
+        except (OSError, sqlite3.Error) as e:
+            app.logger.warning(f"Could not save profile {profile['id']}: {e}")
+
+def trusted_profile_caller(view):
+    """Restrict ``view`` to callers sending the profiling token; nobody without one configured."""
+    @wraps(view)
+    def checked(*args, **kwargs):
+        if not profiler.enabled:
+            return jsonify({'error': 'Profiling is disabled'}), 404
+        if not profiler.token:
+            return jsonify({'error': 'No profiling token is configured'}), 403
+        if not profiler.is_trusted(request.headers.get('X-Profile') or request.args.get('profile')):
+            return jsonify({'error': 'Profiling token required'}), 403
+        return view(*args, **kwargs)
+    return checked
 
 @app.route('/')
 def home():
@@ -35,6 +340,36 @@ def health():
         'version': '1.0.0'
     })
 
+@app.route('/api/metrics')
+def prometheus_metrics():
+    """Stage and endpoint metrics of every worker, in Prometheus text format"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/profiles')
+@trusted_profile_caller
+def list_profiles():
+    """Stored request profiles of every worker, newest first"""
+    try:
+        limit = int(request.args.get('limit', 100))
+    except ValueError:
+        limit = 100
+    profiles = profiler.list_profiles(limit, request.args.get('endpoint'))
+    for record in profiles:
+        record['url'] = f"/api/profiles/{record['id']}"
+    return jsonify({'profiles': profiles, 'count': len(profiles)})
+
+@app.route('/api/profiles/<profile_id>')
+@trusted_profile_caller
+def get_profile(profile_id):
+    path = profiler.profile_path(profile_id)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_file(os.path.abspath(path), as_attachment=True, download_name=os.path.basename(path))
+
+@app.route('/api/cache/stats')
+def cache_stats():
+    return jsonify(result_cache.stats())
+
 @app.route('/api/check_policy', methods=['POST'])
 def check_policy():
     data = request.json
@@ -43,7 +378,7 @@ def check_policy():
         return jsonify({'error': 'No policy text provided'}), 400
     
     try:
-        result = policy_checker.check_policy_compliance(data['policy_text'])
+        result = get_policy_checker().check_policy_compliance(data['policy_text'])
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -56,11 +391,38 @@ def analyze_complaint():
         return jsonify({'error': 'No complaint text provided'}), 400
     
     try:
-        result = complaint_analyzer.analyze_complaint(data['complaint_text'])
+        result = get_complaint_analyzer().analyze_complaint(data['complaint_text'])
         return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _format_prediction(prediction):
+    categories, severity = prediction
+    return {'categories': [str(category) for category in categories], 'severity': str(severity)}
+
+@app.route('/api/classify_complaint', methods=['POST'])
+def classify_complaint():
+    data = request.json or {}
+    fast = data.get('mode') == 'fast'
+    classifier = get_fast_complaint_classifier() if fast else get_complaint_classifier()
+    if classifier is None:
+        return jsonify({'error': 'Complaint classifier has not been trained'}), 503
+    
+    try:
+        if 'complaints' in data:
+            if not isinstance(data['complaints'], list):
+                return jsonify({'error': 'Complaints list required'}), 400
+            predictions = classifier.predict_batch(data['complaints'])
+            return jsonify({'results': [_format_prediction(p) for p in predictions]})
+        
+        if 'complaint_text' not in data:
+            return jsonify({'error': 'No complaint text provided'}), 400
+        # Single requests go through the micro-batcher so concurrent ones share a predict call
+        batcher = get_fast_classifier_batcher() if fast else get_classifier_batcher()
+        return jsonify(_format_prediction(batcher(data['complaint_text'])))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/track_update', methods=['POST'])
 def track_update():
     data = request.json
@@ -74,7 +436,7 @@ def track_update():
         policy_id = data.get('policy_id')
         version = data.get('version')
         
-        result = update_tracker.track_policy_update(
+        result = get_update_tracker().track_policy_update(
             data['old_policy'],
             data['new_policy'],
             policy_id,
@@ -96,22 +458,21 @@ def upload_policy_file():
         return jsonify({'error': 'No file selected'}), 400
     
     try:
-        upload_dir = 'uploads'
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        filepath = os.path.join(upload_dir, file.filename)
-        file.save(filepath)
+        file.stream.seek(0, os.SEEK_END)
+        file_size = file.stream.tell()
+        file.stream.seek(0)
         
-        policy_text = data_loader.load_policy_document(filepath)
+        document_hash = 'document:' + data_loader.hash_stream(file.stream)
+        policy_chunks = data_loader.iter_policy_text(file.stream, file.filename)
         
-        result = policy_checker.check_policy_compliance(policy_text)
+        result = get_policy_checker().check_policy_stream(policy_chunks, content_hash=document_hash)
         
         result['filename'] = file.filename
-        result['file_size'] = os.path.getsize(filepath)
-        
-        os.remove(filepath)
+        result['file_size'] = file_size
         
         return jsonify(result)
+    except DocumentTooLarge as e:
+        return jsonify({'error': str(e)}), 413
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -122,31 +483,13 @@ def batch_check():
     if 'policies' not in data or not isinstance(data['policies'], list):
         return jsonify({'error': 'Policies list required'}), 400
     
-    results = []
-    for policy_data in data['policies']:
-        if 'text' in policy_data:
-            try:
-                result = policy_checker.check_policy_compliance(policy_data['text'])
-                result['policy_id'] = policy_data.get('id', 'unknown')
-                results.append(result)
-            except:
-                continue
+    results = get_batch_engine().check_policies(data['policies'], checker=get_policy_checker())
+    succeeded = [r for r in results if r['status'] == 'ok']
     
-    if not results:
-        return jsonify({'error': 'No valid policies processed'}), 400
+    if not succeeded:
+        return jsonify({'error': 'No valid policies processed', 'results': results}), 400
     
-    compliance_scores = [r.get('compliance_percentage', 0) for r in results if isinstance(r.get('compliance_percentage'), (int, float))]
-    summary = {
-        'total_policies': len(results),
-        'average_compliance': np.mean(compliance_scores) if compliance_scores else 0,
-        'total_violations': sum(len(r.get('rule_violations', [])) for r in results),
-        'total_warnings': sum(len(r.get('warnings', [])) for r in results)
-    }
-    
-    return jsonify({
-        'results': results,
-        'summary': summary
-    })
+    return jsonify(summarize_batch(results))
 
 @app.route('/api/complaint_report', methods=['POST'])
 def complaint_report():
@@ -156,18 +499,74 @@ def complaint_report():
     file = request.files['file']
     
     try:
-        if file.filename.endswith('.csv'):
-            import pandas as pd
-            complaints_df = pd.read_csv(file)
-        else:
+        if not file.filename.endswith('.csv'):
             return jsonify({'error': 'Unsupported file format. Use CSV.'}), 400
         
-        complaint_analyzer.load_complaints(complaints_df)
-        report = complaint_analyzer.generate_complaint_report(complaints_df)
+        report = get_complaint_analyzer().generate_complaint_report_from_csv(file.stream)
         
         return jsonify(report)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
+    finally:
+        # Drop the spooled upload now rather than when the request is torn down
+        file.close()
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    if 'file' in request.files:
+        job_type = request.form.get('type', 'complaint_report')
+        file = request.files['file']
+        if job_type != 'complaint_report':
+            return jsonify({'error': f'Job type {job_type} does not accept files'}), 400
+        if not file.filename.endswith('.csv'):
+            return jsonify({'error': 'Unsupported file format. Use CSV.'}), 400
+        
+        os.makedirs(job_spool_dir, exist_ok=True)
+        csv_path = os.path.join(job_spool_dir, f"{uuid.uuid4().hex}.csv")
+        file.save(csv_path)
+        payload = {'csv_path': csv_path, 'filename': file.filename}
+    else:
+        data = request.json or {}
+        job_type = data.get('type')
+        if job_type == 'check_policy' and 'policy_text' not in data:
+            return jsonify({'error': 'No policy text provided'}), 400
+        if job_type == 'batch_check' and not isinstance(data.get('policies'), list):
+            return jsonify({'error': 'Policies list required'}), 400
+        if job_type == 'complaint_report':
+            return jsonify({'error': 'No file uploaded'}), 400
+        payload = {k: v for k, v in data.items() if k != 'type'}
+    
+    try:
+        job_id = job_queue.submit(job_type, payload)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'job_id': job_id, 'status': 'queued'}), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_queue.store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    job = job_queue.store.get(job_id, include_result=True)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] == 'completed':
+        return jsonify(job['result'])
+    if job['status'] in ('queued', 'running'):
+        return jsonify({'status': job['status'], 'progress': job['progress']}), 202
+    return jsonify({'status': job['status'], 'error': job['error']}), 409
 
 @app.route('/api/update_history', methods=['GET'])
 def get_update_history():
@@ -177,7 +576,7 @@ def get_update_history():
     except:
         days_back = 30
     
-    history = update_tracker.get_update_history(policy_id, days_back)
+    history = get_update_tracker().get_update_history(policy_id, days_back)
     
     return jsonify({
         'history': history,
@@ -202,88 +601,54 @@ def upload_page():
     return render_template('upload.html')
 
 
-# Add this route to your app.py
+# Answers used when the model is unavailable (no key, errors, open circuit, busy)
+CHAT_FALLBACK_RESPONSES = [
+    "I'm here to help with data policy compliance questions. Remember to review GDPR requirements for EU data protection.",
+    "For data compliance, ensure your policies cover data collection, storage, sharing, and user rights clearly.",
+    "Data retention policies should specify exact timeframes and deletion procedures for different data types."
+]
+CHAT_EMPTY_RESPONSE = ('I understand you\'re asking about data policies. For data compliance, ensure you have clear '
+                       'privacy policies, proper consent mechanisms, and robust security measures in place.')
+
+@component
+def get_llm_client():
+    from src.llm_client import GeminiClient
+    chat_config = data_loader.config.get('chat', {})
+    return GeminiClient(
+        api_key=os.getenv('GEMINI_API_KEY'),
+        # GEMINI_API_BASE points load tests at a local stub
+        base_url=os.getenv('GEMINI_API_BASE') or chat_config.get('base_url', 'https://generativelanguage.googleapis.com'),
+        model=chat_config.get('model', 'gemini-pro'),
+        connect_timeout=chat_config.get('connect_timeout', 3.05),
+        read_timeout=chat_config.get('read_timeout', 20),
+        total_timeout=chat_config.get('total_timeout', 30),
+        retries=chat_config.get('retries', 2),
+        backoff=chat_config.get('backoff', 0.5),
+        max_backoff=chat_config.get('max_backoff', 4),
+        pool_size=chat_config.get('pool_size', 10),
+        max_concurrent=chat_config.get('max_concurrent', 8),
+        failure_threshold=chat_config.get('failure_threshold', 5),
+        reset_timeout=chat_config.get('reset_timeout', 30),
+        cache_entries=chat_config.get('cache_entries', 512)
+    )
+
 @app.route('/api/chat', methods=['POST'])
 def chat():
     """Chat with AI assistant (connects to Gemini API)"""
+    from src.llm_client import EmptyResponse, LLMError
     data = request.json
     
     if 'message' not in data:
         return jsonify({'error': 'No message provided'}), 400
     
     try:
-        # Get Gemini API key from environment or config
-        GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', 'YOUR_API_KEY_HERE')
-        
-        # Prepare request to Gemini API
-        gemini_url = f'https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={GEMINI_API_KEY}'
-        
-        # Prepare conversation history
-        messages = []
-        if 'history' in data:
-            for msg in data['history']:
-                role = "user" if msg['role'] == 'user' else "model"
-                messages.append({
-                    "role": role,
-                    "parts": [{"text": msg['content']}]
-                })
-        
-        # Add current message
-        messages.append({
-            "role": "user",
-            "parts": [{"text": data['message']}]
-        })
-        
-        # Prepare the request payload
-        payload = {
-            "contents": messages,
-            "generationConfig": {
-                "temperature": 0.7,
-                "topK": 40,
-                "topP": 0.95,
-                "maxOutputTokens": 1024,
-            },
-            "safetySettings": [
-                {
-                    "category": "HARM_CATEGORY_HARASSMENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_HATE_SPEECH",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                }
-            ]
-        }
-        
-        # Call Gemini API
-        response = requests.post(gemini_url, json=payload)
-        
-        if response.status_code == 200:
-            result = response.json()
-            if 'candidates' in result and len(result['candidates']) > 0:
-                ai_response = result['candidates'][0]['content']['parts'][0]['text']
-                return jsonify({'response': ai_response})
-            else:
-                # Fallback response if no candidates
-                return jsonify({'response': 'I understand you\'re asking about data policies. For data compliance, ensure you have clear privacy policies, proper consent mechanisms, and robust security measures in place.'})
-        else:
-            # Fallback response if API call fails
-            fallback_responses = [
-                "I'm here to help with data policy compliance questions. Remember to review GDPR requirements for EU data protection.",
-                "For data compliance, ensure your policies cover data collection, storage, sharing, and user rights clearly.",
-                "Data retention policies should specify exact timeframes and deletion procedures for different data types."
-            ]
-            import random
-            return jsonify({'response': random.choice(fallback_responses)})
-            
+        return jsonify({'response': get_llm_client().generate(data['message'], data.get('history'))})
+    except EmptyResponse:
+        return jsonify({'response': CHAT_EMPTY_RESPONSE})
+    except LLMError as e:
+        app.logger.info(f"Chat fallback: {e}")
+        import random
+        return jsonify({'response': random.choice(CHAT_FALLBACK_RESPONSES)})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -0,0 +1,49 @@
+"""Throughput of BatchEngine for 1/2/4/8 worker processes.
+
+Usage: python benchmarks/bench_batch_engine.py [--policies 500] [--sections 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_policy
+from src.batch_engine import BatchEngine
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--policies', type=int, default=500)
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--chunk-size', type=int, default=16)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    policies = [
+        {'id': f"policy_{i}", 'text': generate_policy(args.sections, seed=i)}
+        for i in range(args.policies)
+    ]
+
+    baseline = None
+    for workers in args.workers:
+        engine = BatchEngine(max_workers=workers, chunk_size=args.chunk_size, inline_threshold=0)
+        try:
+            # Warm the pool so process start-up is not part of the measurement
+            engine.check_policies(policies[:workers * args.chunk_size])
+            start = time.perf_counter()
+            results = engine.check_policies(policies)
+            elapsed = time.perf_counter() - start
+        finally:
+            engine.shutdown()
+
+        failed = sum(1 for r in results if r['status'] != 'ok')
+        throughput = len(policies) / elapsed
+        baseline = baseline or throughput
+        print(f"workers={workers:2d} time={elapsed:7.2f}s "
+              f"throughput={throughput:8.1f} policies/s speedup={throughput / baseline:4.1f}x failed={failed}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Compare per-item ComplaintAnalyzer.analyze_complaint with the batch analyze_complaints.
+
+Usage: python benchmarks/bench_complaint_analysis.py [--complaints 20000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_complaints
+from src.complaint_analyzer import ComplaintAnalyzer, FEATURE_COLUMNS
+
+
+def per_item(analyzer, descriptions):
+    rows = []
+    for text in descriptions:
+        result = analyzer.analyze_complaint(text)
+        rows.append([result['features'][name] for name in FEATURE_COLUMNS] + [result['sentiment_score']])
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--complaints', type=int, default=20000)
+    parser.add_argument('--check', type=int, default=2000, help='rows compared against the per-item path')
+    args = parser.parse_args()
+
+    descriptions = generate_complaints(args.complaints)['description']
+    analyzer = ComplaintAnalyzer()
+
+    start = time.perf_counter()
+    legacy = per_item(analyzer, descriptions)
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = analyzer.analyze_complaints(descriptions)
+    batch_time = time.perf_counter() - start
+
+    expected = legacy[:args.check]
+    actual = batch[FEATURE_COLUMNS + ['sentiment_score']].head(args.check).values.tolist()
+    if expected != actual:
+        raise SystemExit('analyze_complaints output differs from analyze_complaint')
+
+    print(f"complaints={args.complaints}")
+    print(f"per-item: {legacy_time:8.2f} s  {args.complaints / legacy_time:10.0f} complaints/s")
+    print(f"batch:    {batch_time:8.2f} s  {args.complaints / batch_time:10.0f} complaints/s")
+    print(f"speedup:  {legacy_time / batch_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
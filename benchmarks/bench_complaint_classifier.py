@@ -0,0 +1,115 @@
+"""Accuracy and latency of the forest and linear ComplaintClassifier, per item and batched.
+
+Usage: python benchmarks/bench_complaint_classifier.py [--complaints 5000] [--concurrency 32]
+
+Synthetic complaints get a few words tied to their category and severity so
+there is something to learn. For each model type it reports training time,
+pickled size, category exact-match and severity accuracy on a held-out
+quarter, per-item predict_all latency, predict_batch throughput and the
+throughput of concurrent single calls through a MicroBatcher.
+"""
+import argparse
+import os
+import pickle
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import COMPLAINT_CATEGORIES, COMPLAINT_SEVERITIES, generate_complaints
+from src.micro_batcher import MicroBatcher
+from src.models.complaint_classifier import ComplaintClassifier
+
+CATEGORY_HINTS = {
+    'security': ['hacked', 'breach', 'password', 'encryption'],
+    'privacy': ['tracking', 'profiling', 'surveillance', 'cookies'],
+    'consent': ['permission', 'agreed', 'checkbox', 'optin'],
+    'retention': ['years', 'archived', 'kept', 'stored'],
+    'third_party': ['advertisers', 'sold', 'partners', 'brokers'],
+    'access': ['request', 'copy', 'download', 'export']
+}
+SEVERITY_HINTS = {
+    'low': ['minor'],
+    'medium': ['annoying'],
+    'high': ['serious'],
+    'critical': ['lawsuit', 'emergency']
+}
+
+
+def labelled_complaints(n_complaints, seed=0):
+    rng = random.Random(seed)
+    complaints = generate_complaints(n_complaints, seed)
+    texts = []
+    for text, category, severity in zip(complaints['description'], complaints['category'], complaints['severity']):
+        hints = rng.sample(CATEGORY_HINTS[category], 2) if rng.random() < 0.8 else []
+        hints += SEVERITY_HINTS[severity] if rng.random() < 0.7 else []
+        texts.append(' '.join([text] + hints))
+    return texts, [[category] for category in complaints['category']], list(complaints['severity'])
+
+
+def latency_ms(func, items):
+    timings = []
+    for item in items:
+        start = time.perf_counter()
+        func(item)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--complaints', type=int, default=5000)
+    parser.add_argument('--single', type=int, default=200, help='predict_all calls timed one by one')
+    parser.add_argument('--concurrency', type=int, default=32)
+    args = parser.parse_args()
+
+    texts, categories, severities = labelled_complaints(args.complaints)
+    split = args.complaints * 3 // 4
+    test_texts = texts[split:]
+
+    print(f"complaints={args.complaints} train={split} test={len(test_texts)} "
+          f"categories={len(COMPLAINT_CATEGORIES)} severities={len(COMPLAINT_SEVERITIES)}")
+    for model_type in ('random_forest', 'linear'):
+        classifier = ComplaintClassifier(model_type=model_type)
+        start = time.perf_counter()
+        X = classifier.prepare_complaint_features(texts[:split])
+        classifier.train_category_classifier(X, categories[:split])
+        classifier.train_severity_classifier(X, severities[:split])
+        train_time = time.perf_counter() - start
+        size = len(pickle.dumps((classifier.classifier, classifier.severity_classifier)))
+
+        start = time.perf_counter()
+        predictions = classifier.predict_batch(test_texts)
+        batch_time = time.perf_counter() - start
+
+        category_accuracy = statistics.mean(
+            set(predicted) == set(expected) for (predicted, _), expected in zip(predictions, categories[split:])
+        )
+        severity_accuracy = statistics.mean(
+            predicted == expected for (_, predicted), expected in zip(predictions, severities[split:])
+        )
+
+        single_ms = latency_ms(classifier.predict_all, test_texts[:args.single])
+
+        batcher = MicroBatcher(classifier.predict_batch, max_batch_size=64, max_wait=0.005)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            batched = list(executor.map(batcher, test_texts))
+        batcher_time = time.perf_counter() - start
+        if batched != predictions:
+            raise SystemExit('micro-batched predictions differ from predict_batch')
+
+        print(f"{model_type}:")
+        print(f"  train {train_time:6.2f}s  model {size / 1e6:6.2f}MB  "
+              f"category exact match {category_accuracy:.3f}  severity accuracy {severity_accuracy:.3f}")
+        print(f"  predict_all p50 {single_ms:7.2f}ms ({1000 / single_ms:6.0f}/s)  "
+              f"predict_batch {len(test_texts) / batch_time:9.0f}/s  "
+              f"micro-batched x{args.concurrency} {len(test_texts) / batcher_time:9.0f}/s "
+              f"(mean batch {batcher.stats()['mean_batch_size']:.1f})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""Peak memory and time of the whole-file vs streaming complaint report.
+
+Usage: python benchmarks/bench_complaint_report.py [--complaints 20000 200000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from benchmarks.synthetic import write_complaints_csv
+from src.complaint_analyzer import ComplaintAnalyzer
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--complaints', type=int, nargs='+', default=[20000, 200000])
+    parser.add_argument('--chunksize', type=int, default=10000)
+    args = parser.parse_args()
+
+    analyzer = ComplaintAnalyzer()
+
+    for n_complaints in args.complaints:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'complaints.csv')
+            write_complaints_csv(path, n_complaints)
+            size = os.path.getsize(path)
+
+            def whole_file():
+                return analyzer.generate_complaint_report(pd.read_csv(path))
+
+            def streaming():
+                return analyzer.generate_complaint_report_from_csv(path, chunksize=args.chunksize)
+
+            whole_time, whole_peak, whole_report = measure(whole_file)
+            stream_time, stream_peak, stream_report = measure(streaming)
+
+        for key in ('total_complaints', 'category_distribution', 'severity_distribution', 'date_range'):
+            if whole_report[key] != stream_report[key]:
+                raise SystemExit(f'streaming {key} differs from whole-file report')
+
+        print(f"complaints={n_complaints} csv={size / 1e6:.1f}MB")
+        print(f"  whole file: {whole_time:6.2f}s peak={whole_peak / 1e6:7.1f}MB")
+        print(f"  streaming:  {stream_time:6.2f}s peak={stream_peak / 1e6:7.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
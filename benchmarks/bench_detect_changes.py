@@ -0,0 +1,88 @@
+"""Compare the tiered section diff against the original character-level SequenceMatcher.
+
+Usage: python benchmarks/bench_detect_changes.py [--sections 12] [--sentences 150]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_sections, generate_sentence, render_policy
+from src.models.similarity_model import SECTION_HEADING_MAX_LENGTH, SimilarityModel
+from src.parsed_policy import ParsedPolicy, clear_parse_cache
+
+
+def legacy_detect_changes(old_policy, new_policy):
+    old_sections = ParsedPolicy(old_policy, max_heading_length=SECTION_HEADING_MAX_LENGTH).sections
+    new_sections = ParsedPolicy(new_policy, max_heading_length=SECTION_HEADING_MAX_LENGTH).sections
+    changes = []
+    for section_name in set(list(old_sections.keys()) + list(new_sections.keys())):
+        old_content = old_sections.get(section_name, "")
+        new_content = new_sections.get(section_name, "")
+        if old_content != new_content:
+            changes.append((section_name, SequenceMatcher(None, old_content, new_content).ratio()))
+    return changes
+
+
+def revise(sections, seed=1):
+    """Leave some sections alone, lightly edit, rewrite or rename the rest."""
+    rng = random.Random(seed)
+    revised = []
+    for index, (title, body) in enumerate(sections):
+        sentences = body.split('. ')
+        kind = index % 4
+        if kind == 1:
+            sentences = [generate_sentence(rng) if rng.random() < 0.1 else s for s in sentences]
+        elif kind == 2:
+            sentences = [generate_sentence(rng) for _ in sentences]
+        elif kind == 3:
+            title = f"{title} AND MORE"
+        revised.append((title, '. '.join(sentences)))
+    return revised
+
+
+def tiered_detect_changes(model, old_policy, new_policy):
+    clear_parse_cache()
+    return model.detect_changes(old_policy, new_policy)
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sections', type=int, default=12)
+    parser.add_argument('--sentences', type=int, default=150)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    sections = generate_sections(args.sections, args.sentences)
+    old_policy = render_policy(sections)
+    new_policy = render_policy(revise(sections))
+    model = SimilarityModel()
+
+    legacy_time, legacy = best_of(args.repeat, legacy_detect_changes, old_policy, new_policy)
+    tiered_time, tiered = best_of(args.repeat, tiered_detect_changes, model, old_policy, new_policy)
+
+    change_types = {}
+    for change in tiered:
+        change_types[change['change_type']] = change_types.get(change['change_type'], 0) + 1
+
+    print(f"sections={args.sections} chars={len(old_policy)}")
+    print(f"legacy: {legacy_time * 1000:9.2f} ms  changes={len(legacy)}")
+    print(f"tiered: {tiered_time * 1000:9.2f} ms  changes={len(tiered)} {change_types}")
+    print(f"speedup: {legacy_time / tiered_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
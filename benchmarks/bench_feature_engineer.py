@@ -0,0 +1,71 @@
+"""Batch text feature build: the former FeatureEngineer path vs fit/transform with caching.
+
+Usage: python benchmarks/bench_feature_engineer.py [--policies 100000]
+
+The former extract_text_features ran TfidfVectorizer, CountVectorizer (its
+result discarded) and TruncatedSVD fit_transform on every call, so inference
+refitted everything too. It is compared with extract_text_features returning
+both feature sets from one tokenization, and with transform_text_features
+for inference on a batch where ``--repeat`` of the documents were seen before.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_sentence
+from src.feature_engineer import FeatureEngineer
+
+
+def generate_policies(n_policies, sentences=12, seed=0):
+    rng = random.Random(seed)
+    return [' '.join(generate_sentence(rng) for _ in range(sentences)) for _ in range(n_policies)]
+
+
+def former_extract(texts):
+    # The pre-split implementation, with LSA seeded so the outputs are comparable
+    from sklearn.decomposition import TruncatedSVD
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    tfidf = TfidfVectorizer(max_features=1000, stop_words='english').fit_transform(texts)
+    CountVectorizer(max_features=500, stop_words='english').fit_transform(texts)
+    return TruncatedSVD(n_components=50, random_state=0).fit_transform(tfidf)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--policies', type=int, default=100000)
+    parser.add_argument('--batch', type=int, default=10000)
+    parser.add_argument('--repeat', type=float, default=0.8, help='share of the inference batch seen before')
+    args = parser.parse_args()
+
+    texts = generate_policies(args.policies)
+    seen = int(args.batch * args.repeat)
+    first_batch = generate_policies(args.batch, seed=1)
+    second_batch = first_batch[:seen] + generate_policies(args.batch - seen, seed=2)
+
+    former, former_time = timed(former_extract, texts)
+    engineer = FeatureEngineer(random_state=0, cache_size=args.batch)
+    (fitted, counts), fit_time = timed(engineer.extract_text_features, texts, True)
+    _, former_batch_time = timed(former_extract, second_batch)
+    _, cold_time = timed(engineer.transform_text_features, first_batch)
+    _, warm_time = timed(engineer.transform_text_features, second_batch)
+
+    print(f"policies={args.policies} batch={args.batch} repeat={args.repeat:.0%}")
+    print(f"fit   former extract_text_features  {former_time:8.2f} s")
+    print(f"fit   extract_text_features         {fit_time:8.2f} s  same features: {abs(former - fitted).max() < 1e-9}")
+    print(f"infer former (refits per call)      {former_batch_time:8.2f} s")
+    print(f"infer transform, cold cache         {cold_time:8.2f} s")
+    print(f"infer transform, {args.repeat:.0%} cached          {warm_time:8.2f} s")
+
+
+if __name__ == '__main__':
+    main()
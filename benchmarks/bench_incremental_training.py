@@ -0,0 +1,78 @@
+"""Daily retraining cost: full refits on the whole history vs partial_fit on the delta.
+
+Usage: python benchmarks/bench_incremental_training.py [--history 20000] [--delta 2000]
+
+The forest and linear ComplaintClassifier are refitted on history + delta,
+as the nightly job does today; the online model is first trained on the
+history in chunks and then only fed the delta. Accuracy (category exact
+match, severity) is measured on a held-out set of the same synthetic data.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_complaint_classifier import labelled_complaints
+from benchmarks.synthetic import COMPLAINT_CATEGORIES, COMPLAINT_SEVERITIES
+from src.models.complaint_classifier import ComplaintClassifier
+
+
+def full_fit(model_type, texts, categories, severities):
+    classifier = ComplaintClassifier(model_type=model_type)
+    X = classifier.prepare_complaint_features(texts)
+    classifier.train_category_classifier(X, categories)
+    classifier.train_severity_classifier(X, severities)
+    return classifier
+
+
+def online_fit(classifier, texts, categories, severities, chunksize):
+    for start in range(0, len(texts), chunksize):
+        end = start + chunksize
+        classifier.partial_fit(texts[start:end], categories[start:end], severities[start:end],
+                               category_classes=COMPLAINT_CATEGORIES, severity_classes=COMPLAINT_SEVERITIES)
+    return classifier
+
+
+def accuracy(classifier, texts, categories, severities):
+    predictions = classifier.predict_batch(texts)
+    category_hits = sum(set(predicted) == set(expected) for (predicted, _), expected in zip(predictions, categories))
+    severity_hits = sum(predicted == expected for (_, predicted), expected in zip(predictions, severities))
+    return category_hits / len(texts), severity_hits / len(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--history', type=int, default=20000)
+    parser.add_argument('--delta', type=int, default=2000)
+    parser.add_argument('--chunksize', type=int, default=10000)
+    args = parser.parse_args()
+
+    texts, categories, severities = labelled_complaints(args.history + args.delta + 2000)
+    split = args.history + args.delta
+    train = (texts[:split], categories[:split], severities[:split])
+    test = (texts[split:], categories[split:], severities[split:])
+
+    print(f"history={args.history} delta={args.delta}")
+    for model_type in ('random_forest', 'linear'):
+        start = time.perf_counter()
+        classifier = full_fit(model_type, *train)
+        elapsed = time.perf_counter() - start
+        category_acc, severity_acc = accuracy(classifier, *test)
+        print(f"{model_type:>13} full refit:    {elapsed:8.2f} s  category {category_acc:.3f}  severity {severity_acc:.3f}")
+
+    classifier = ComplaintClassifier(model_type='online')
+    start = time.perf_counter()
+    online_fit(classifier, texts[:args.history], categories[:args.history], severities[:args.history], args.chunksize)
+    history_time = time.perf_counter() - start
+    start = time.perf_counter()
+    online_fit(classifier, texts[args.history:split], categories[args.history:split], severities[args.history:split], args.chunksize)
+    delta_time = time.perf_counter() - start
+    category_acc, severity_acc = accuracy(classifier, *test)
+    print(f"{'online':>13} history once: {history_time:8.2f} s")
+    print(f"{'online':>13} delta update: {delta_time:8.2f} s  category {category_acc:.3f}  severity {severity_acc:.3f}")
+
+
+if __name__ == '__main__':
+    main()
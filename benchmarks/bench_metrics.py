@@ -0,0 +1,74 @@
+"""Overhead of the stage instrumentation, disabled and enabled.
+
+Usage: python benchmarks/bench_metrics.py [--calls 200000] [--policies 300]
+
+Reports the per-call cost of a ``timed`` function and a ``stage`` block
+against a bare call, then PolicyChecker.check_policy_compliance (uncached)
+with metrics off and on.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_policy
+from src.policy_checker import PolicyChecker
+from src.parsed_policy import clear_parse_cache
+from src.utils.metrics import metrics, stage, timed
+
+
+def bare():
+    return None
+
+
+@timed('bench.timed')
+def decorated():
+    return None
+
+
+def with_stage():
+    with stage('bench.stage'):
+        return None
+
+
+def per_call_ns(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def check_all(checker, policies):
+    clear_parse_cache()
+    start = time.perf_counter()
+    for policy in policies:
+        checker.check_policy_compliance(policy)
+    return (time.perf_counter() - start) / len(policies) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--calls', type=int, default=200000)
+    parser.add_argument('--policies', type=int, default=300)
+    args = parser.parse_args()
+
+    policies = [generate_policy(n_sections=5, sentences_per_section=10, seed=seed) for seed in range(args.policies)]
+    checker = PolicyChecker()
+    check_all(checker, policies[:10])
+
+    base = per_call_ns(bare, args.calls)
+    print(f"bare call:            {base:8.0f} ns")
+    for enabled in (False, True):
+        metrics.enabled = enabled
+        label = 'on ' if enabled else 'off'
+        print(f"timed, metrics {label}:   {per_call_ns(decorated, args.calls):8.0f} ns")
+        print(f"stage, metrics {label}:   {per_call_ns(with_stage, args.calls):8.0f} ns")
+    for enabled in (False, True, False, True):
+        metrics.enabled = enabled
+        print(f"check_policy_compliance, metrics {'on ' if enabled else 'off'}: {check_all(checker, policies):7.3f} ms/policy")
+
+
+if __name__ == '__main__':
+    main()
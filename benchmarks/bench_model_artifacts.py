@@ -0,0 +1,102 @@
+"""Cold load time and memory of joblib pickles vs model bundles.
+
+Usage: python benchmarks/bench_model_artifacts.py [--complaints 5000] [--runs 3]
+
+Trains a forest and a linear ComplaintClassifier on synthetic complaints
+(vocabulary capped by max_features as in production) and saves each both
+ways: save_models (four joblib pickles) and save_bundle. Every load runs in
+a fresh interpreter with sklearn already imported, and reports the load
+time plus the growth in RSS and in private (unshared) memory, read from
+/proc/self/smaps_rollup (Linux only).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_complaint_classifier import labelled_complaints
+from src.models.complaint_classifier import ComplaintClassifier
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+LOADER = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+
+def memory_kb():
+    values = {{}}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return values['Rss'], values['Private_Clean'] + values['Private_Dirty']
+
+import sklearn.ensemble, sklearn.linear_model, sklearn.multiclass, sklearn.feature_extraction.text
+from src.models.complaint_classifier import ComplaintClassifier
+rss_before, private_before = memory_kb()
+start = time.perf_counter()
+classifier = ComplaintClassifier()
+if {bundle}:
+    classifier.load_bundle({path!r})
+else:
+    classifier.load_models({path!r})
+load_time = time.perf_counter() - start
+classifier.predict_all('my password was leaked')
+rss_after, private_after = memory_kb()
+print(json.dumps({{'load': load_time, 'rss': rss_after - rss_before, 'private': private_after - private_before}}))
+"""
+
+
+def cold_load(path, bundle, runs):
+    results = []
+    for _ in range(runs):
+        completed = subprocess.run([sys.executable, '-c', LOADER.format(root=ROOT, path=path, bundle=bundle)],
+                                   capture_output=True, text=True, check=True)
+        results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return {key: statistics.median(result[key] for result in results) for key in results[0]}
+
+
+def size_mb(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    return sum(os.path.getsize(os.path.join(directory, name))
+               for directory, _, names in os.walk(path) for name in names) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--complaints', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+
+    texts, categories, severities = labelled_complaints(args.complaints)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for model_type in ('random_forest', 'linear'):
+            classifier = ComplaintClassifier(model_type=model_type)
+            X = classifier.prepare_complaint_features(texts)
+            classifier.train_category_classifier(X, categories)
+            classifier.train_severity_classifier(X, severities)
+
+            legacy_path = os.path.join(tmpdir, f'{model_type}_legacy')
+            bundle_path = os.path.join(tmpdir, f'{model_type}_bundle')
+            classifier.save_models(legacy_path)
+            classifier.save_bundle(bundle_path)
+            legacy_size = sum(size_mb(os.path.join(tmpdir, name)) for name in os.listdir(tmpdir)
+                              if name.startswith(f'{model_type}_legacy_'))
+
+            print(f"{model_type}: vocabulary={len(classifier.tfidf.vocabulary_)}")
+            for label, path, bundle, size in (('joblib', legacy_path, False, legacy_size),
+                                              ('bundle', bundle_path, True, size_mb(bundle_path))):
+                result = cold_load(path, bundle, args.runs)
+                print(f"  {label}: {size:7.2f}MB on disk  load {result['load'] * 1000:8.1f}ms  "
+                      f"rss +{result['rss'] / 1024:6.1f}MB  private +{result['private'] / 1024:6.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Measure repeated parsing on the track_update and check_policy paths.
+
+Replays a chain of policy revisions the way clients use the API: each new
+version is checked, then tracked against the previous one. "unshared"
+clears the parse cache before every call, so every consumer parses the
+text itself; "shared" lets them reuse one ParsedPolicy per text and
+heading rule (the checker and the tracker split sections differently).
+
+Usage: python benchmarks/bench_parse_cache.py [--versions 20] [--sections 12]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_sections, generate_sentence, render_policy
+from src.history_store import InMemoryHistoryStore
+from src.parsed_policy import clear_parse_cache, parse_cache_info
+from src.policy_checker import PolicyChecker
+from src.update_tracker import UpdateTracker
+
+
+def revisions(n_versions, n_sections, seed=0):
+    rng = random.Random(seed)
+    sections = generate_sections(n_sections, 40, seed=seed)
+    versions = [render_policy(sections)]
+    for _ in range(n_versions - 1):
+        index = rng.randrange(len(sections))
+        title, body = sections[index]
+        sections[index] = (title, body + ' ' + generate_sentence(rng))
+        versions.append(render_policy(sections))
+    return versions
+
+
+def replay(versions, shared):
+    checker = PolicyChecker()
+    tracker = UpdateTracker(history_store=InMemoryHistoryStore())
+    clear_parse_cache()
+    parses = 0
+
+    start = time.perf_counter()
+    for version in range(1, len(versions)):
+        calls = [
+            lambda: checker.check_policy_compliance(versions[version]),
+            lambda: tracker.track_policy_update(versions[version - 1], versions[version], 'bench', version)
+        ]
+        for call in calls:
+            if not shared:
+                parses += parse_cache_info()['misses']
+                clear_parse_cache()
+            call()
+    elapsed = time.perf_counter() - start
+    return elapsed, parses + parse_cache_info()['misses']
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--versions', type=int, default=20)
+    parser.add_argument('--sections', type=int, default=12)
+    args = parser.parse_args()
+
+    versions = revisions(args.versions, args.sections)
+    unshared_time, unshared_parses = replay(versions, shared=False)
+    shared_time, shared_parses = replay(versions, shared=True)
+
+    calls = 2 * (len(versions) - 1)
+    print(f"versions={len(versions)} chars/version={len(versions[-1])} calls={calls}")
+    print(f"unshared: {unshared_time * 1000:9.2f} ms  parses={unshared_parses}")
+    print(f"shared:   {shared_time * 1000:9.2f} ms  parses={shared_parses}")
+    print(f"speedup:  {unshared_time / shared_time:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
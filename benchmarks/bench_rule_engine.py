@@ -0,0 +1,74 @@
+"""Compare the compiled rule matcher against the original per-rule scan.
+
+Usage: python benchmarks/bench_rule_engine.py [--pages 100] [--rules 200]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_pages, generate_rules
+from src.rule_matcher import RuleMatcher
+
+
+def legacy_section_analysis(policy_rules, sections):
+    section_analysis = {}
+    for rule_name, rule in policy_rules.items():
+        for section_name, section_text in sections.items():
+            section_lower = section_text.lower()
+            keyword_count = sum(1 for keyword in rule['keywords'] if keyword in section_lower)
+            if keyword_count > 0:
+                section_analysis[f"{rule_name}_{section_name}"] = keyword_count
+    return section_analysis
+
+
+def compiled_section_analysis(matcher, policy_rules, sections):
+    section_analysis = {}
+    matches = matcher.match(sections)
+    for rule_name in policy_rules:
+        for section_name, keyword_count, _ in matches.get(rule_name, []):
+            section_analysis[f"{rule_name}_{section_name}"] = keyword_count
+    return section_analysis
+
+
+def best_of(repeat, func, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, default=100)
+    parser.add_argument('--rules', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    sections = {title.lower(): body for title, body in generate_pages(args.pages)}
+    policy_rules = generate_rules(args.rules)
+
+    start = time.perf_counter()
+    matcher = RuleMatcher(policy_rules)
+    compile_time = time.perf_counter() - start
+
+    legacy_time, legacy = best_of(args.repeat, legacy_section_analysis, policy_rules, sections)
+    compiled_time, compiled = best_of(args.repeat, compiled_section_analysis, matcher, policy_rules, sections)
+
+    if list(legacy.items()) != list(compiled.items()):
+        raise SystemExit('compiled matcher output differs from the legacy scan')
+
+    size = sum(len(text) for text in sections.values())
+    print(f"pages={args.pages} rules={args.rules} chars={size} hits={len(compiled)}")
+    print(f"compile:  {compile_time * 1000:8.2f} ms (once per rule set)")
+    print(f"legacy:   {legacy_time * 1000:8.2f} ms")
+    print(f"compiled: {compiled_time * 1000:8.2f} ms")
+    print(f"speedup:  {legacy_time / compiled_time:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
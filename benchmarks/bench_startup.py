@@ -0,0 +1,68 @@
+"""Cold-start cost of the Flask app: import profile and time to first /api/health.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--target 1.0] [--top 15]
+
+Each run is a fresh interpreter, as for a gunicorn worker without preload.
+The import profile comes from ``python -X importtime``. The script exits
+non-zero when the median time to the first /api/health response is over
+``--target`` seconds.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+FIRST_REQUEST = (
+    "import app\n"
+    "response = app.app.test_client().get('/api/health')\n"
+    "assert response.status_code == 200, response.status_code\n"
+)
+
+
+def import_profile():
+    """``[(cumulative_seconds, self_seconds, module)]`` for ``import app``."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                               cwd=ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us) / 1e6, int(self_us) / 1e6, module.rstrip()))
+    return rows
+
+
+def time_to_first_request():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', FIRST_REQUEST], cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target', type=float, default=1.0, help='seconds to the first /api/health response')
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    rows = import_profile()
+    total = next(cumulative for cumulative, _, module in rows if module.strip() == 'app')
+    print(f"import app: {total:6.3f}s")
+    for cumulative, self_time, module in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative:6.3f}s cumulative {self_time:6.3f}s self  {module}")
+
+    timings = [time_to_first_request() for _ in range(args.runs)]
+    median = statistics.median(timings)
+    print(f"first /api/health: median {median:.3f}s min {min(timings):.3f}s max {max(timings):.3f}s "
+          f"over {args.runs} runs (target {args.target:.3f}s)")
+    if median > args.target:
+        raise SystemExit(f"cold start {median:.3f}s exceeds target {args.target:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
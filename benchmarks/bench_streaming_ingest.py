@@ -0,0 +1,64 @@
+"""Peak memory and time of whole-document vs streaming policy upload checks.
+
+Usage: python benchmarks/bench_streaming_ingest.py [--pages 500]
+"""
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.synthetic import generate_pages, render_pdf
+from src.data_loader import DataLoader
+from src.policy_checker import PolicyChecker
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--pages', type=int, nargs='+', default=[50, 500])
+    args = parser.parse_args()
+
+    loader = DataLoader()
+    checker = PolicyChecker()
+
+    for pages in args.pages:
+        pdf = render_pdf([f"{title}:\n{body}" for title, body in generate_pages(pages)])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'policy.pdf')
+            with open(path, 'wb') as f:
+                f.write(pdf)
+
+            def whole_document():
+                return checker.check_policy_compliance(loader.load_policy_document(path))
+
+            def streaming():
+                return checker.check_policy_stream(loader.iter_policy_text(io.BytesIO(pdf), 'policy.pdf'))
+
+            whole_time, whole_peak, whole_result = measure(whole_document)
+            stream_time, stream_peak, stream_result = measure(streaming)
+
+        if whole_result != stream_result:
+            raise SystemExit('streaming result differs from whole-document result')
+
+        print(f"pages={pages} pdf={len(pdf) / 1e6:.1f}MB")
+        print(f"  whole document: {whole_time:6.2f}s peak={whole_peak / 1e6:7.1f}MB")
+        print(f"  streaming:      {stream_time:6.2f}s peak={stream_peak / 1e6:7.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
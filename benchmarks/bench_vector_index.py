@@ -0,0 +1,87 @@
+"""Compare VectorIndex exact and LSH search against the dense cosine scan.
+
+Usage: python benchmarks/bench_vector_index.py [--docs 200000] [--features 50000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.vector_index import VectorIndex
+
+
+def random_corpus(n_docs, n_features, terms_per_doc, seed=0):
+    """Sparse TF-IDF-like rows with a Zipf-ish term distribution."""
+    rng = np.random.default_rng(seed)
+    probabilities = 1.0 / np.arange(1, n_features + 1)
+    probabilities /= probabilities.sum()
+    indices = rng.choice(n_features, size=n_docs * terms_per_doc, p=probabilities)
+    rows = np.repeat(np.arange(n_docs), terms_per_doc)
+    data = rng.random(len(indices)) + 0.1
+    matrix = sparse.csr_matrix((data, (rows, indices)), shape=(n_docs, n_features))
+    matrix.sum_duplicates()
+    return matrix
+
+
+def legacy_search(query, vectors, k):
+    similarities = cosine_similarity(query, vectors)[0]
+    return list(np.argsort(-similarities)[:k])
+
+
+def timed_queries(search, queries):
+    start = time.perf_counter()
+    results = [search(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--docs', type=int, default=200000)
+    parser.add_argument('--features', type=int, default=50000)
+    parser.add_argument('--terms', type=int, default=60)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    vectors = random_corpus(args.docs, args.features, args.terms)
+    rng = np.random.default_rng(1)
+    # Queries are perturbed copies of stored rows, i.e. near duplicates
+    sources = rng.choice(args.docs, size=args.queries, replace=False)
+    noise = random_corpus(args.queries, args.features, args.terms // 10, seed=2)
+    queries = [vectors[row] + 0.3 * noise[i] for i, row in enumerate(sources)]
+    ids = np.arange(args.docs)
+
+    exact = VectorIndex()
+    start = time.perf_counter()
+    exact.add(ids, vectors)
+    exact_build = time.perf_counter() - start
+
+    approximate = VectorIndex(approximate=True)
+    start = time.perf_counter()
+    approximate.add(ids, vectors)
+    approximate_build = time.perf_counter() - start
+
+    legacy_time, legacy = timed_queries(lambda q: legacy_search(q, vectors, args.k), queries)
+    exact_time, exact_results = timed_queries(lambda q: [i for i, _ in exact.search(q, k=args.k)], queries)
+    lsh_time, lsh_results = timed_queries(lambda q: [i for i, _ in approximate.search(q, k=args.k)], queries)
+
+    if [r[0] for r in legacy] != [r[0] for r in exact_results]:
+        raise SystemExit('exact index disagrees with the dense scan')
+    recall = np.mean([len(set(a) & set(b)) / args.k for a, b in zip(exact_results, lsh_results)])
+    top1 = np.mean([a[:1] == b[:1] for a, b in zip(exact_results, lsh_results)])
+
+    print(f"docs={args.docs} features={args.features} nnz={vectors.nnz} k={args.k}")
+    print(f"build:  exact {exact_build:6.2f} s   lsh {approximate_build:6.2f} s")
+    print(f"legacy: {legacy_time * 1000:8.2f} ms/query")
+    print(f"exact:  {exact_time * 1000:8.2f} ms/query")
+    print(f"lsh:    {lsh_time * 1000:8.2f} ms/query  recall@{args.k}={recall:.2f} top1={top1:.2f}")
+
+
+if __name__ == '__main__':
+    main()
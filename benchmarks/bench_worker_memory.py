@@ -0,0 +1,165 @@
+"""Memory per gunicorn worker with and without preloading the app.
+
+Usage: python benchmarks/bench_worker_memory.py [--workers 4] [--complaints 5000]
+
+Fits synthetic models (similarity vectorizer, compliance model, complaint
+classifier) into a temporary directory, then starts gunicorn with
+gunicorn.conf.py twice: once with GUNICORN_PRELOAD=0, where every worker
+loads everything itself, and once preloaded. Once the workers have warmed
+up, it reads /proc/<pid>/smaps_rollup for each of them (Linux only).
+PSS splits shared pages between the processes sharing them, so the total
+PSS is what the whole server actually costs.
+"""
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import yaml
+
+from benchmarks.synthetic import generate_complaints, generate_policy
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+def fit_models(directory, n_complaints):
+    from src.models.similarity_model import SimilarityModel
+    from src.models.compliance_model import ComplianceModel
+    from src.models.complaint_classifier import ComplaintClassifier
+
+    paths = {
+        'similarity': os.path.join(directory, 'similarity_tfidf.pkl'),
+        'compliance': os.path.join(directory, 'compliance_model.pkl'),
+        'classifier': os.path.join(directory, 'complaint_classifier')
+    }
+
+    similarity = SimilarityModel()
+    similarity.fit_vectorizer([generate_policy(seed=seed) for seed in range(50)])
+    similarity.save_vectorizer(paths['similarity'])
+
+    rng = np.random.default_rng(0)
+    features = rng.random((2000, 6))
+    compliance = ComplianceModel()
+    compliance.train(features, features[:, 0] + rng.random(2000) > 1)
+    compliance.save_model(paths['compliance'])
+
+    complaints = generate_complaints(n_complaints)
+    classifier = ComplaintClassifier()
+    X = classifier.prepare_complaint_features(complaints['description'])
+    classifier.train_category_classifier(X, [[category] for category in complaints['category']])
+    classifier.train_severity_classifier(X, complaints['severity'])
+    classifier.save_models(paths['classifier'])
+    return paths
+
+
+def write_config(directory, paths):
+    with open(os.path.join(ROOT, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    ml_models = config.setdefault('ml_models', {})
+    ml_models.setdefault('similarity_vectorizer', {})['path'] = paths['similarity']
+    ml_models.setdefault('compliance_checker', {})['path'] = paths['compliance']
+    ml_models.setdefault('complaint_classifier', {})['path'] = paths['classifier']
+    config.setdefault('history', {})['db_path'] = os.path.join(directory, 'update_history.db')
+    config.setdefault('jobs', {}).update(db_path=os.path.join(directory, 'jobs.db'),
+                                         spool_dir=os.path.join(directory, 'jobs'))
+    config_path = os.path.join(directory, 'config.yaml')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def memory_kb(pid):
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values['Rss'],
+        'pss': values['Pss'],
+        'private': values['Private_Clean'] + values['Private_Dirty']
+    }
+
+
+def worker_pids(master_pid):
+    with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+        return [int(pid) for pid in f.read().split()]
+
+
+def wait_until_settled(master_pid, n_workers, timeout):
+    """Wait until every worker is up and their memory stops growing."""
+    deadline = time.time() + timeout
+    previous = None
+    while time.time() < deadline:
+        pids = worker_pids(master_pid)
+        if len(pids) == n_workers:
+            current = sum(memory_kb(pid)['rss'] for pid in pids)
+            if previous is not None and abs(current - previous) < 1024:
+                return pids
+            previous = current
+        time.sleep(1)
+    raise SystemExit('workers did not settle in time')
+
+
+def measure(config_path, n_workers, preload, timeout):
+    port = free_port()
+    env = dict(os.environ, APP_CONFIG=config_path, PORT=str(port), WEB_CONCURRENCY=str(n_workers),
+               GUNICORN_PRELOAD='1' if preload else '0')
+    env.pop('PRELOAD_APP', None)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        deadline = time.time() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1).read()
+                break
+            except OSError:
+                if time.time() > deadline or server.poll() is not None:
+                    raise SystemExit('gunicorn did not come up')
+                time.sleep(0.5)
+        pids = wait_until_settled(server.pid, n_workers, timeout)
+        return memory_kb(server.pid), [memory_kb(pid) for pid in pids]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--complaints', type=int, default=5000, help='training size of the complaint classifier')
+    parser.add_argument('--timeout', type=float, default=120)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = fit_models(tmpdir, args.complaints)
+        config_path = write_config(tmpdir, paths)
+
+        print(f"workers={args.workers}")
+        for preload in (False, True):
+            master, workers = measure(config_path, args.workers, preload, args.timeout)
+            mean = {key: sum(worker[key] for worker in workers) / len(workers) / 1024 for key in master}
+            total_pss = (master['pss'] + sum(worker['pss'] for worker in workers)) / 1024
+            label = 'preload:   ' if preload else 'no preload:'
+            print(f"  {label} per worker rss={mean['rss']:7.1f}MB pss={mean['pss']:7.1f}MB "
+                  f"private={mean['private']:7.1f}MB  total pss={total_pss:7.1f}MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""Local stand-in for the Gemini generateContent API, for offline load tests.
+
+Usage: python benchmarks/gemini_stub.py [--port 8089] [--latency-ms 300] [--jitter-ms 100] [--error-rate 0]
+
+Answers ``POST /v1beta/models/<model>:generateContent`` with a canned
+candidate after ``latency-ms`` (+/- ``jitter-ms``), and with HTTP 503 for
+a fraction ``error-rate`` of the calls. Start the app with
+``GEMINI_API_BASE=http://127.0.0.1:<port>`` to send /api/chat here.
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class GeminiStubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._send(400, {'error': {'code': 400, 'message': 'Invalid JSON payload'}})
+        path = self.path.split('?')[0]
+        if not (path.startswith('/v1beta/models/') and path.endswith(':generateContent')):
+            return self._send(404, {'error': {'code': 404, 'message': 'Not found'}})
+
+        with server.lock:
+            server.calls += 1
+            delay = max(0.0, server.latency + server.rng.uniform(-server.jitter, server.jitter))
+            failed = server.rng.random() < server.error_rate
+        time.sleep(delay)
+        if failed:
+            return self._send(503, {'error': {'code': 503, 'message': 'The model is overloaded.'}})
+
+        contents = payload.get('contents') or [{}]
+        question = ' '.join(part.get('text', '') for part in contents[-1].get('parts', []))
+        text = f"(stub) Review your policy for GDPR and CCPA coverage. You asked: {question[:200]}"
+        self._send(200, {
+            'candidates': [{'content': {'role': 'model', 'parts': [{'text': text}]}, 'finishReason': 'STOP'}],
+            'usageMetadata': {'promptTokenCount': len(question.split()), 'candidatesTokenCount': len(text.split())}
+        })
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class GeminiStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients that gave up on a slow answer (read timeouts) are expected
+        if not isinstance(sys.exc_info()[1], (BrokenPipeError, ConnectionResetError)):
+            super().handle_error(request, client_address)
+
+
+def start_stub(port=0, latency=0.3, jitter=0.1, error_rate=0.0, seed=0):
+    """Serve the stub from a daemon thread; returns the server (``server_address`` has the port)."""
+    server = GeminiStubServer(('127.0.0.1', port), GeminiStubHandler)
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.calls = 0
+    threading.Thread(target=server.serve_forever, name='gemini-stub', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=300)
+    parser.add_argument('--jitter-ms', type=float, default=100)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = start_stub(args.port, args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate)
+    print(f"Gemini stub on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+"""Load test of the gunicorn deployment: throughput and latency percentiles under rising concurrency.
+
+Usage: python benchmarks/load_test.py [--workers 4] [--concurrency 1 2 4 8 16 32] [--duration 20]
+                                      [--mix check_policy=50,batch_check=10,track_update=20,complaint_report=10,chat=10]
+                                      [--url http://host:port] [--output load.json]
+
+Without ``--url`` it starts the Procfile command (``gunicorn -c
+gunicorn.conf.py app:app``) on a free port with its SQLite state in a
+temporary directory, and points /api/chat at benchmarks/gemini_stub.py
+through GEMINI_API_BASE, so the run needs no network. Virtual users, one
+thread and keep-alive session each, replay a weighted mix of endpoints
+for ``--duration`` seconds per concurrency step. Every step reports
+throughput, error rate and p50/p95/p99 latency overall and per endpoint;
+the saturation point is the last step that still raised throughput by
+``--min-gain``.
+
+Request bodies come from the title and body of every entry of
+requests.jsonl (``--corpus``), arranged into policy sections and
+complaint descriptions, or from benchmarks/synthetic.py when it is
+missing. Each policy gets a unique revision line so the result cache
+does not answer repeats; pass ``--cache-hits`` to allow them.
+
+The load generator shares the machine with the server, so on small hosts
+run it from another machine with ``--url``.
+"""
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import requests
+import yaml
+
+from benchmarks.gemini_stub import start_stub
+from benchmarks.synthetic import (
+    COMPLAINT_CATEGORIES, COMPLAINT_SEVERITIES, generate_complaint_rows, generate_sections, render_policy
+)
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+DEFAULT_MIX = 'check_policy=50,batch_check=10,track_update=20,complaint_report=10,chat=10'
+ENDPOINTS = {
+    'check_policy': '/api/check_policy',
+    'batch_check': '/api/batch_check',
+    'track_update': '/api/track_update',
+    'complaint_report': '/api/complaint_report',
+    'chat': '/api/chat'
+}
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint {name!r} in --mix, expected one of {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Corpus:
+    """Request bodies built from (title, body) entries."""
+
+    def __init__(self, entries, seed=0, unique=True, report_rows=200):
+        self.entries = entries
+        self.rng = random.Random(seed)
+        self.unique = unique
+        self.report_rows = report_rows
+        self._revision = 0
+        self._lock = threading.Lock()
+        self.reports = [self._complaints_csv(seed + index) for index in range(8)]
+
+    @classmethod
+    def load(cls, path, seed=0, unique=True, report_rows=200):
+        entries = []
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        entries.append((item.get('title', ''), item.get('body', '')))
+        if not entries:
+            entries = generate_sections(200, 8, seed=seed)
+        return cls(entries, seed, unique, report_rows)
+
+    def _section(self, rng):
+        title, body = rng.choice(self.entries)
+        # Short titles ending in ':' are what SectionBuilder treats as headings
+        title = ''.join(c for c in title if c.isalnum() or c in ' -').strip()[:80] or 'GENERAL'
+        return title.upper(), ' '.join(body.split())
+
+    def policy(self, rng, n_sections=None):
+        sections = [self._section(rng) for _ in range(n_sections or rng.randint(4, 10))]
+        return self._revise(sections)
+
+    def _revise(self, sections):
+        if self.unique:
+            with self._lock:
+                self._revision += 1
+                revision = self._revision
+            sections = sections + [('REVISION', f"Revision {revision} of this policy.")]
+        return render_policy(sections)
+
+    def policy_pair(self, rng):
+        old = [self._section(rng) for _ in range(rng.randint(4, 10))]
+        new = [self._section(rng) if rng.random() < 0.3 else section for section in old]
+        return self._revise(old), self._revise(new)
+
+    def _complaints_csv(self, seed):
+        rng = random.Random(seed)
+        output = io.StringIO()
+        writer = csv.DictWriter(output, fieldnames=['complaint_id', 'description', 'category', 'date_received',
+                                                    'severity'])
+        writer.writeheader()
+        sentences = [sentence.strip() for _, body in self.entries for sentence in body.split('.') if sentence.strip()]
+        for row in generate_complaint_rows(self.report_rows, seed):
+            if sentences:
+                row['description'] = rng.choice(sentences) + '.'
+            row['category'] = rng.choice(COMPLAINT_CATEGORIES)
+            row['severity'] = rng.choice(COMPLAINT_SEVERITIES)
+            writer.writerow(row)
+        return output.getvalue().encode('utf-8')
+
+    def request(self, name, rng):
+        """``(path, keyword arguments for requests.Session.post)`` of one call to endpoint ``name``."""
+        if name == 'check_policy':
+            body = {'json': {'policy_text': self.policy(rng)}}
+        elif name == 'batch_check':
+            body = {'json': {'policies': [{'id': f"policy_{index}", 'text': self.policy(rng)}
+                                          for index in range(rng.randint(2, 8))]}}
+        elif name == 'track_update':
+            old, new = self.policy_pair(rng)
+            body = {'json': {'old_policy': old, 'new_policy': new, 'policy_id': f"policy_{rng.randint(0, 99)}",
+                             'version': rng.randint(2, 20)}}
+        elif name == 'complaint_report':
+            body = {'files': {'file': ('complaints.csv', rng.choice(self.reports), 'text/csv')}}
+        else:
+            title, _ = rng.choice(self.entries)
+            body = {'json': {'message': title or 'What does GDPR require?', 'history': []}}
+        return ENDPOINTS[name], body
+
+
+def run_step(base_url, corpus, mix, users, duration, timeout, seed):
+    """Run ``users`` virtual users for ``duration`` seconds; returns their samples."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    samples = []
+    deadline = time.perf_counter() + duration
+
+    def user(index):
+        rng = random.Random(seed * 100003 + index)
+        session = requests.Session()
+        while time.perf_counter() < deadline:
+            name = rng.choices(names, weights)[0]
+            path, body = corpus.request(name, rng)
+            start = time.perf_counter()
+            try:
+                response = session.post(base_url + path, timeout=timeout, **body)
+                response.content
+                status = response.status_code
+            except requests.RequestException as e:
+                status = type(e).__name__
+            samples.append((name, time.perf_counter() - start, status))
+        session.close()
+
+    threads = [threading.Thread(target=user, args=(index,), daemon=True) for index in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - start
+
+
+def summarize(samples, elapsed):
+    def stats(latencies, errors):
+        latencies = sorted(latencies)
+        return {
+            'requests': len(latencies),
+            'throughput': len(latencies) / elapsed if elapsed else 0.0,
+            'error_rate': errors / len(latencies) if latencies else 0.0,
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+            'p99': percentile(latencies, 99),
+            'max': latencies[-1] if latencies else None
+        }
+
+    def is_error(status):
+        return not isinstance(status, int) or status >= 400
+
+    summary = stats([latency for _, latency, _ in samples], sum(is_error(status) for _, _, status in samples))
+    summary['endpoints'] = {}
+    for name in sorted({name for name, _, _ in samples}):
+        own = [(latency, status) for sample_name, latency, status in samples if sample_name == name]
+        summary['endpoints'][name] = stats([latency for latency, _ in own], sum(is_error(s) for _, s in own))
+    statuses = {}
+    for _, _, status in samples:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    summary['statuses'] = statuses
+    return summary
+
+
+def saturation_point(steps, min_gain):
+    """The step after which more users stopped adding ``min_gain`` throughput."""
+    best = steps[0]
+    for step in steps[1:]:
+        if step['throughput'] < best['throughput'] * (1 + min_gain) or step['error_rate'] > 0.01:
+            return best
+        best = step
+    return None
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def write_config(directory):
+    with open(os.path.join(ROOT, 'config.yaml'), 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    config.setdefault('history', {})['db_path'] = os.path.join(directory, 'update_history.db')
+    config.setdefault('jobs', {}).update(db_path=os.path.join(directory, 'jobs.db'),
+                                         spool_dir=os.path.join(directory, 'jobs'))
+    config.setdefault('metrics', {})['multiprocess_dir'] = os.path.join(directory, 'metrics')
+    config.setdefault('profiling', {})['output_dir'] = os.path.join(directory, 'profiles')
+    config_path = os.path.join(directory, 'config.yaml')
+    with open(config_path, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f)
+    return config_path
+
+
+def start_server(config_path, workers, stub_url, timeout):
+    port = free_port()
+    env = dict(os.environ, APP_CONFIG=config_path, PORT=str(port), WEB_CONCURRENCY=str(workers),
+               GEMINI_API_BASE=stub_url, GEMINI_API_KEY='stub')
+    env.pop('PRELOAD_APP', None)
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app'],
+                              cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(f"{base_url}/api/health", timeout=1).read()
+            return server, base_url
+        except OSError:
+            if time.time() > deadline or server.poll() is not None:
+                stop_server(server, timeout)
+                raise SystemExit('gunicorn did not come up')
+            time.sleep(0.5)
+
+
+def stop_server(server, timeout):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:8.1f}" if seconds is not None else '       -'
+
+
+def print_step(step):
+    print(f"{step['users']:>6} {step['throughput']:9.1f} {step['error_rate'] * 100:6.1f}% "
+          f"{_ms(step['p50'])} {_ms(step['p95'])} {_ms(step['p99'])}")
+    for name, endpoint in step['endpoints'].items():
+        print(f"{'':>6}   {name:<16} n={endpoint['requests']:<6} err={endpoint['error_rate'] * 100:5.1f}% "
+              f"p50={_ms(endpoint['p50']).strip()}ms p95={_ms(endpoint['p95']).strip()}ms "
+              f"p99={_ms(endpoint['p99']).strip()}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', help='test a running server instead of starting gunicorn')
+    parser.add_argument('--workers', type=int, default=4, help='WEB_CONCURRENCY of the started gunicorn')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument('--duration', type=float, default=20, help='seconds per concurrency step')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='endpoint=weight pairs')
+    parser.add_argument('--corpus', default=os.path.join(ROOT, 'requests.jsonl'))
+    parser.add_argument('--report-rows', type=int, default=200, help='rows per uploaded complaint CSV')
+    parser.add_argument('--cache-hits', action='store_true', help='let repeated policies hit the result cache')
+    parser.add_argument('--min-gain', type=float, default=0.10,
+                        help='throughput gain below which a step counts as saturated')
+    parser.add_argument('--stub-latency-ms', type=float, default=300)
+    parser.add_argument('--request-timeout', type=float, default=120)
+    parser.add_argument('--startup-timeout', type=float, default=180)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write every step as JSON')
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    corpus = Corpus.load(args.corpus, args.seed, not args.cache_hits, args.report_rows)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        server = None
+        base_url = args.url.rstrip('/') if args.url else None
+        if base_url is None:
+            stub = start_stub(latency=args.stub_latency_ms / 1000, jitter=args.stub_latency_ms / 3000)
+            server, base_url = start_server(write_config(tmpdir), args.workers,
+                                            f"http://127.0.0.1:{stub.server_address[1]}", args.startup_timeout)
+        try:
+            # One call per endpoint first, so lazily built components are not timed
+            warm_rng = random.Random(args.seed)
+            for name in mix:
+                path, body = corpus.request(name, warm_rng)
+                requests.post(base_url + path, timeout=args.request_timeout, **body)
+
+            print(f"{base_url} workers={args.workers if server else '?'} mix={args.mix} "
+                  f"corpus={len(corpus.entries)} entries")
+            print(f"{'users':>6} {'req/s':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+            steps = []
+            for index, users in enumerate(args.concurrency):
+                samples, elapsed = run_step(base_url, corpus, mix, users, args.duration, args.request_timeout,
+                                            args.seed + index)
+                step = dict(summarize(samples, elapsed), users=users, elapsed=elapsed)
+                steps.append(step)
+                print_step(step)
+        finally:
+            if server is not None:
+                stop_server(server, args.startup_timeout)
+
+    saturated = saturation_point(steps, args.min_gain)
+    if saturated is not None:
+        print(f"saturates at about {saturated['users']} concurrent users, {saturated['throughput']:.1f} req/s "
+              f"(p99 {saturated['p99'] * 1000:.0f}ms)")
+    else:
+        print('throughput still rising at the highest concurrency; extend --concurrency')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'url': base_url, 'workers': args.workers if server else None, 'mix': mix,
+                       'duration': args.duration, 'steps': steps,
+                       'saturation_users': saturated['users'] if saturated else None}, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,437 @@
+"""End-to-end benchmark suite with a regression check against a stored baseline.
+
+Usage: python benchmarks/suite.py run [--scale small|medium|large] [--only NAME ...] [--repeat 5] [--output results.json]
+       python benchmarks/suite.py compare BASELINE CURRENT [--threshold 0.10] [--min-delta 0.001]
+       python benchmarks/suite.py list
+
+``run`` times the analysis components directly (policy checks, complaint
+analysis and reports, update tracking, PDF/DOCX/TXT parsing) and every
+main API endpoint through the Flask test client, on synthetic data from
+benchmarks/synthetic.py. Each benchmark builds its inputs untimed, runs
+once to warm up, then is timed ``--repeat`` times; the JSON output holds
+every timing with the median, min, mean and standard deviation. The
+scale presets size the inputs, ``large`` includes a 10M-row complaint CSV
+(about 1.5 GB of temporary disk).
+
+``compare`` matches benchmarks by name and flags every one whose median
+grew by more than ``--threshold`` (a fraction) and ``--min-delta``
+seconds, exiting with status 1 when any did, so it can gate CI:
+
+    python benchmarks/suite.py run --output baseline.json
+    ... change the code ...
+    python benchmarks/suite.py run --output current.json
+    python benchmarks/suite.py compare baseline.json current.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic import (
+    generate_complaint_rows, generate_complaints, generate_policy, generate_sections, render_policy,
+    write_complaints_csv, write_policy
+)
+
+RESULTS_VERSION = 1
+
+SCALES = {
+    'small': {'policies': 20, 'sections': 10, 'sentences': 20, 'complaints': 1000, 'report_rows': 1000,
+              'pages': 10, 'requests': 20},
+    'medium': {'policies': 100, 'sections': 10, 'sentences': 20, 'complaints': 10000, 'report_rows': 100000,
+               'pages': 100, 'requests': 100},
+    'large': {'policies': 500, 'sections': 30, 'sentences': 30, 'complaints': 50000, 'report_rows': 10000000,
+              'pages': 1000, 'requests': 200}
+}
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register ``setup(context) -> (run, items)``; only ``run()`` is timed."""
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+class Context:
+    """Sizes, seed and scratch directory shared by the benchmarks of one run."""
+
+    def __init__(self, sizes, keyword_density, seed, workdir):
+        self.sizes = sizes
+        self.keyword_density = keyword_density
+        self.seed = seed
+        self.workdir = workdir
+        self._client = None
+        self._app = None
+
+    def policies(self, n=None):
+        return [generate_policy(self.sizes['sections'], self.sizes['sentences'], self.keyword_density, self.seed + index)
+                for index in range(n or self.sizes['policies'])]
+
+    def policy_pairs(self, n=None):
+        # The new version rewrites every third section and appends one
+        pairs = []
+        for index in range(n or self.sizes['policies']):
+            old = generate_sections(self.sizes['sections'], self.sizes['sentences'], self.keyword_density,
+                                    self.seed + index)
+            rewritten = generate_sections(self.sizes['sections'] + 1, self.sizes['sentences'], self.keyword_density,
+                                          self.seed + index + 100000)
+            new = [rewritten[i] if i % 3 == 0 else section for i, section in enumerate(old)] + rewritten[-1:]
+            pairs.append((render_policy(old), render_policy(new)))
+        return pairs
+
+    def path(self, name):
+        return os.path.join(self.workdir, name)
+
+    def app(self):
+        """The Flask app module, imported with its state redirected into the scratch directory."""
+        if self._app is None:
+            import yaml
+            with open(os.path.join(ROOT, 'config.yaml'), 'r', encoding='utf-8') as f:
+                config = yaml.safe_load(f)
+            config['history']['db_path'] = self.path('update_history.db')
+            config['jobs']['db_path'] = self.path('jobs.db')
+            config['jobs']['spool_dir'] = self.path('jobs')
+            config['cache']['db_path'] = None
+            config['metrics']['multiprocess_dir'] = None
+            config.setdefault('profiling', {})['enabled'] = False
+            config_path = self.path('config.yaml')
+            with open(config_path, 'w', encoding='utf-8') as f:
+                yaml.safe_dump(config, f)
+            os.environ['APP_CONFIG'] = config_path
+            import app
+            self._app = app
+        return self._app
+
+    def client(self):
+        if self._client is None:
+            self._client = self.app().app.test_client()
+        return self._client
+
+
+def _check_response(response):
+    if response.status_code >= 400:
+        raise RuntimeError(f"HTTP {response.status_code}: {response.get_data(as_text=True)[:200]}")
+    return response
+
+
+@benchmark('policy.check_policy_compliance')
+def bench_check_policy(context):
+    from src.parsed_policy import clear_parse_cache
+    from src.policy_checker import PolicyChecker
+    checker = PolicyChecker()
+    policies = context.policies()
+
+    def run():
+        clear_parse_cache()
+        for policy in policies:
+            checker.check_policy_compliance(policy)
+    return run, len(policies)
+
+
+@benchmark('complaint.analyze_complaint')
+def bench_analyze_complaint(context):
+    from src.complaint_analyzer import ComplaintAnalyzer
+    analyzer = ComplaintAnalyzer()
+    texts = [row['description'] for row in generate_complaint_rows(context.sizes['complaints'], context.seed)]
+
+    def run():
+        for text in texts:
+            analyzer.analyze_complaint(text)
+    return run, len(texts)
+
+
+@benchmark('complaint.generate_complaint_report')
+def bench_complaint_report(context):
+    from src.complaint_analyzer import ComplaintAnalyzer
+    analyzer = ComplaintAnalyzer()
+    complaints = generate_complaints(context.sizes['complaints'], context.seed)
+    return lambda: analyzer.generate_complaint_report(complaints), len(complaints)
+
+
+@benchmark('complaint.report_from_csv')
+def bench_report_from_csv(context):
+    from src.complaint_analyzer import ComplaintAnalyzer
+    analyzer = ComplaintAnalyzer()
+    path = write_complaints_csv(context.path('complaints.csv'), context.sizes['report_rows'], context.seed)
+    return lambda: analyzer.generate_complaint_report_from_csv(path), context.sizes['report_rows']
+
+
+@benchmark('update.track_policy_update')
+def bench_track_update(context):
+    from src.history_store import SQLiteHistoryStore
+    from src.parsed_policy import clear_parse_cache
+    from src.update_tracker import UpdateTracker
+    tracker = UpdateTracker(history_store=SQLiteHistoryStore(context.path('track_history.db')))
+    pairs = context.policy_pairs()
+
+    def run():
+        clear_parse_cache()
+        for index, (old, new) in enumerate(pairs):
+            tracker.track_policy_update(old, new, policy_id=f"policy_{index}", version=2)
+    return run, len(pairs)
+
+
+def _loader_benchmark(extension):
+    def setup(context):
+        from src.data_loader import DataLoader
+        loader = DataLoader(os.path.join(ROOT, 'config.yaml'))
+        path = write_policy(context.path(f"policy.{extension}"), context.sizes['pages'], 35, context.keyword_density,
+                            context.seed)
+        return lambda: loader.load_policy_document(path), context.sizes['pages']
+    return setup
+
+
+for _extension in ('txt', 'pdf', 'docx'):
+    benchmark(f"data_loader.{_extension}")(_loader_benchmark(_extension))
+
+
+@benchmark('api.health')
+def bench_api_health(context):
+    client = context.client()
+    n_requests = context.sizes['requests']
+
+    def run():
+        for _ in range(n_requests):
+            _check_response(client.get('/api/health'))
+    return run, n_requests
+
+
+@benchmark('api.check_policy')
+def bench_api_check_policy(context):
+    app = context.app()
+    client = context.client()
+    policies = context.policies(context.sizes['requests'])
+
+    def run():
+        # Uncached checks; the result cache would otherwise answer every repeat
+        app.result_cache.clear()
+        for policy in policies:
+            _check_response(client.post('/api/check_policy', json={'policy_text': policy}))
+    return run, len(policies)
+
+
+@benchmark('api.analyze_complaint')
+def bench_api_analyze_complaint(context):
+    client = context.client()
+    texts = [row['description'] for row in generate_complaint_rows(context.sizes['requests'], context.seed)]
+
+    def run():
+        for text in texts:
+            _check_response(client.post('/api/analyze_complaint', json={'complaint_text': text}))
+    return run, len(texts)
+
+
+@benchmark('api.track_update')
+def bench_api_track_update(context):
+    client = context.client()
+    pairs = context.policy_pairs(context.sizes['requests'])
+
+    def run():
+        for index, (old, new) in enumerate(pairs):
+            _check_response(client.post('/api/track_update', json={
+                'old_policy': old, 'new_policy': new, 'policy_id': f"policy_{index}", 'version': 2
+            }))
+    return run, len(pairs)
+
+
+@benchmark('api.complaint_report')
+def bench_api_complaint_report(context):
+    client = context.client()
+    path = write_complaints_csv(context.path('api_complaints.csv'), context.sizes['complaints'], context.seed)
+
+    def run():
+        with open(path, 'rb') as f:
+            _check_response(client.post('/api/complaint_report', data={'file': (f, 'complaints.csv')},
+                                        content_type='multipart/form-data'))
+    return run, context.sizes['complaints']
+
+
+@benchmark('api.upload_policy_file')
+def bench_api_upload_policy_file(context):
+    app = context.app()
+    client = context.client()
+    path = write_policy(context.path('upload.pdf'), context.sizes['pages'], 35, context.keyword_density, context.seed)
+
+    def run():
+        app.result_cache.clear()
+        with open(path, 'rb') as f:
+            _check_response(client.post('/api/upload_policy_file', data={'file': (f, 'policy.pdf')},
+                                        content_type='multipart/form-data'))
+    return run, context.sizes['pages']
+
+
+def run_benchmark(setup, context, repeat):
+    run, items = setup(context)
+    run()
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        seconds.append(time.perf_counter() - start)
+    median = statistics.median(seconds)
+    return {
+        'status': 'ok',
+        'items': items,
+        'seconds': seconds,
+        'median': median,
+        'min': min(seconds),
+        'mean': statistics.fmean(seconds),
+        'stdev': statistics.stdev(seconds) if len(seconds) > 1 else 0.0,
+        'items_per_second': items / median if median else None
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(names, sizes, scale, repeat, keyword_density=0.05, seed=0, log=print):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='bench-suite-') as workdir:
+        context = Context(sizes, keyword_density, seed, workdir)
+        for name in names:
+            try:
+                result = run_benchmark(BENCHMARKS[name], context, repeat)
+            except Exception as e:
+                # One broken path should not hide the timings of the others
+                result = {'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                log(f"{name:<40} ERROR {result['error']}")
+            else:
+                log(f"{name:<40} median {result['median'] * 1000:10.1f}ms  "
+                    f"min {result['min'] * 1000:10.1f}ms  items {result['items']}")
+            results[name] = result
+    return {
+        'version': RESULTS_VERSION,
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'scale': scale,
+            'sizes': sizes,
+            'keyword_density': keyword_density,
+            'seed': seed,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def compare_results(baseline, current, threshold=0.10, min_delta=0.001):
+    """Per-benchmark comparison of the medians of two result files.
+
+    Each row holds the name, both medians, their ratio and a status:
+    'regression', 'improvement', 'ok', 'error' (failed in either run),
+    'new' or 'missing'.
+    """
+    rows = []
+    base_results, current_results = baseline['results'], current['results']
+    for name in sorted(set(base_results) | set(current_results)):
+        before, after = base_results.get(name), current_results.get(name)
+        row = {'name': name, 'baseline': None, 'current': None, 'ratio': None}
+        if before is None:
+            row['status'] = 'new'
+        elif after is None:
+            row['status'] = 'missing'
+        elif before['status'] != 'ok' or after['status'] != 'ok':
+            row['status'] = 'error'
+        else:
+            row['baseline'], row['current'] = before['median'], after['median']
+            row['ratio'] = after['median'] / before['median'] if before['median'] else None
+            delta = after['median'] - before['median']
+            if delta > before['median'] * threshold and delta > min_delta:
+                row['status'] = 'regression'
+            elif -delta > before['median'] * threshold and -delta > min_delta:
+                row['status'] = 'improvement'
+            else:
+                row['status'] = 'ok'
+        rows.append(row)
+    return rows
+
+
+def _format_ms(seconds):
+    return f"{seconds * 1000:.1f}ms" if seconds is not None else '-'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end benchmarks and regression check.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks and write the results as JSON')
+    run_parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    run_parser.add_argument('--only', nargs='+', help='run benchmarks whose name contains any of these')
+    run_parser.add_argument('--repeat', type=int, default=5)
+    run_parser.add_argument('--output', default='benchmark-results.json')
+    run_parser.add_argument('--complaint-rows', type=int, help='rows of the CSV report benchmark (1k to 10M)')
+    run_parser.add_argument('--sections', type=int, help='sections per synthetic policy')
+    run_parser.add_argument('--sentences', type=int, help='sentences per policy section')
+    run_parser.add_argument('--keyword-density', type=float, default=0.05)
+    run_parser.add_argument('--seed', type=int, default=0)
+
+    compare_parser = commands.add_parser('compare', help='flag regressions of CURRENT against BASELINE')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10,
+                                help='fractional slowdown of the median that counts as a regression')
+    compare_parser.add_argument('--min-delta', type=float, default=0.001,
+                                help='ignore differences below this many seconds')
+
+    commands.add_parser('list', help='list the benchmark names')
+    args = parser.parse_args()
+
+    if args.command == 'list':
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    if args.command == 'run':
+        sizes = dict(SCALES[args.scale])
+        for key, value in (('report_rows', args.complaint_rows), ('sections', args.sections),
+                           ('sentences', args.sentences)):
+            if value is not None:
+                sizes[key] = value
+        names = [name for name in BENCHMARKS if not args.only or any(part in name for part in args.only)]
+        if not names:
+            parser.error(f"No benchmark matches {args.only}")
+        results = run_suite(names, sizes, args.scale, args.repeat, args.keyword_density, args.seed)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"wrote {args.output}")
+        return 1 if any(result['status'] != 'ok' for result in results['results'].values()) else 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+    if baseline['meta'].get('sizes') != current['meta'].get('sizes'):
+        print('warning: the runs used different input sizes, timings are not comparable')
+    rows = compare_results(baseline, current, args.threshold, args.min_delta)
+    for row in rows:
+        ratio = f"{row['ratio']:.2f}x" if row['ratio'] is not None else '-'
+        print(f"{row['name']:<40} {_format_ms(row['baseline']):>12} {_format_ms(row['current']):>12} "
+              f"{ratio:>7}  {row['status']}")
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"{len(regressions)} regression(s) above {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
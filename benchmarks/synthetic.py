@@ -0,0 +1,230 @@
+import random
+
+VOCABULARY = [
+    'data', 'personal', 'information', 'user', 'service', 'account', 'email',
+    'address', 'process', 'request', 'provide', 'purpose', 'legal', 'basis',
+    'cookie', 'device', 'browser', 'location', 'payment', 'contact', 'law',
+    'company', 'website', 'application', 'record', 'notice', 'update', 'policy',
+    'time', 'period', 'customer', 'support', 'analytics', 'marketing', 'vendor'
+]
+
+POLICY_KEYWORDS = [
+    'collect', 'gather', 'obtain', 'consent', 'permission', 'agree',
+    'third party', 'share with', 'partner', 'access', 'delete', 'modify',
+    'right', 'encrypt', 'secure', 'protect', 'retain', 'store', 'transfer',
+    'opt-out', 'rectify', 'erasure', 'portability', 'controller', 'processor',
+    'breach', 'notify', 'children', 'minor', 'sell', 'disclose', 'cookie'
+]
+
+SECTION_TITLES = [
+    'DATA COLLECTION', 'CONSENT', 'THIRD PARTY SHARING', 'USER RIGHTS',
+    'SECURITY', 'DATA RETENTION', 'COOKIES', 'INTERNATIONAL TRANSFERS',
+    'CHILDREN', 'CHANGES TO THIS POLICY', 'CONTACT US'
+]
+
+
+def generate_sentence(rng, keyword_density=0.05, min_words=8, max_words=20):
+    words = []
+    for _ in range(rng.randint(min_words, max_words)):
+        if rng.random() < keyword_density:
+            words.append(rng.choice(POLICY_KEYWORDS))
+        else:
+            words.append(rng.choice(VOCABULARY))
+    return ' '.join(words).capitalize() + '.'
+
+
+def generate_sections(n_sections=10, sentences_per_section=20, keyword_density=0.05, seed=0):
+    """Return an ordered list of (title, body) pairs."""
+    rng = random.Random(seed)
+    sections = []
+    for index in range(n_sections):
+        title = SECTION_TITLES[index % len(SECTION_TITLES)]
+        if index >= len(SECTION_TITLES):
+            title = f"{title} {index // len(SECTION_TITLES) + 1}"
+        body = ' '.join(generate_sentence(rng, keyword_density)
+                        for _ in range(sentences_per_section))
+        sections.append((title, body))
+    return sections
+
+
+def render_policy(sections):
+    lines = ['PRIVACY POLICY', '']
+    for title, body in sections:
+        lines.append(f"{title}:")
+        lines.append(body)
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def generate_policy(n_sections=10, sentences_per_section=20, keyword_density=0.05, seed=0):
+    return render_policy(generate_sections(n_sections, sentences_per_section, keyword_density, seed))
+
+
+def generate_pages(n_pages, keyword_density=0.05, seed=0):
+    # Roughly one section of ~500 words per page
+    return generate_sections(n_pages, 35, keyword_density, seed)
+
+
+def generate_rules(n_rules, keywords_per_rule=4, seed=0):
+    rng = random.Random(seed)
+    pool = POLICY_KEYWORDS + [f"{a} {b}" for a in POLICY_KEYWORDS[:12] for b in VOCABULARY[:12]]
+    rules = {}
+    for index in range(n_rules):
+        rules[f"rule_{index}"] = {
+            'required': index % 3 != 0,
+            'keywords': rng.sample(pool, keywords_per_rule),
+            'weight': 1.0
+        }
+    return rules
+
+
+COMPLAINT_WORDS = [
+    'urgent', 'asap', 'angry', 'frustrated', 'disappointed', 'violated', 'good',
+    'bad', 'poor', 'terrible', 'helpful', 'resolved', 'happy', 'cannot', 'breach',
+    'consent', 'shared', 'deleted', 'account', 'email', 'without', 'my', 'the', 'was'
+]
+
+COMPLAINT_CATEGORIES = ['security', 'privacy', 'consent', 'retention', 'third_party', 'access']
+COMPLAINT_SEVERITIES = ['low', 'medium', 'high', 'critical']
+
+
+def generate_complaint_text(rng, min_words=10, max_words=60):
+    words = []
+    for _ in range(rng.randint(min_words, max_words)):
+        words.append(rng.choice(COMPLAINT_WORDS) if rng.random() < 0.3 else rng.choice(VOCABULARY))
+    text = ' '.join(words).capitalize()
+    return text + rng.choice(['.', '!', '!!', '...', '?'])
+
+
+def generate_complaint_rows(n_complaints, seed=0, start_id=0):
+    """Yield complaint dicts with the columns DataLoader.load_complaints_data expects."""
+    rng = random.Random(seed)
+    for index in range(start_id, start_id + n_complaints):
+        yield {
+            'complaint_id': index,
+            'description': generate_complaint_text(rng),
+            'category': rng.choice(COMPLAINT_CATEGORIES),
+            'date_received': f"{rng.randint(2019, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            'severity': rng.choice(COMPLAINT_SEVERITIES)
+        }
+
+
+def generate_complaints(n_complaints, seed=0):
+    import pandas as pd
+    return pd.DataFrame(list(generate_complaint_rows(n_complaints, seed)))
+
+
+def write_complaints_csv(path, n_complaints, seed=0):
+    """Stream ``n_complaints`` rows to a CSV file; memory does not grow with the row count."""
+    import csv
+    rows = generate_complaint_rows(n_complaints, seed)
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['complaint_id', 'description', 'category', 'date_received', 'severity'])
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def render_pdf(pages, line_width=90):
+    """Build a minimal text-only PDF with one entry of ``pages`` per page."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None, b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    page_refs = []
+    for page_text in pages:
+        lines = []
+        for paragraph in page_text.split('\n'):
+            while len(paragraph) > line_width:
+                cut = paragraph.rfind(' ', 0, line_width)
+                cut = cut if cut > 0 else line_width
+                lines.append(paragraph[:cut])
+                paragraph = paragraph[cut:].lstrip()
+            lines.append(paragraph)
+        body = ['BT', '/F1 9 Tf', '11 TL', '40 800 Td']
+        body += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        body.append('ET')
+        stream = '\n'.join(body).encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        objects.append(b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (len(objects)))
+        page_refs.append(len(objects))
+    kids = ' '.join(f"{ref} 0 R" for ref in page_refs).encode()
+    objects[1] = b'<< /Type /Pages /Kids [' + kids + b'] /Count %d >>' % len(page_refs)
+
+    output = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b'%d 0 obj\n' % number + obj + b'\nendobj\n'
+    xref_offset = len(output)
+    output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        output += b'%010d 00000 n \n' % offset
+    output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(output)
+
+
+def render_docx(sections):
+    """A DOCX file (bytes) with a heading paragraph and a body paragraph per section."""
+    import io
+    from docx import Document
+    document = Document()
+    document.add_paragraph('PRIVACY POLICY')
+    for title, body in sections:
+        document.add_paragraph(f"{title}:")
+        document.add_paragraph(body)
+    output = io.BytesIO()
+    document.save(output)
+    return output.getvalue()
+
+
+def write_policy(path, n_sections=10, sentences_per_section=20, keyword_density=0.05, seed=0):
+    """Write a synthetic policy as .txt, .pdf (one section per page) or .docx."""
+    import os
+    sections = generate_sections(n_sections, sentences_per_section, keyword_density, seed)
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.txt':
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(render_policy(sections))
+    elif extension == '.pdf':
+        with open(path, 'wb') as f:
+            f.write(render_pdf([f"{title}:\n{body}" for title, body in sections]))
+    elif extension == '.docx':
+        with open(path, 'wb') as f:
+            f.write(render_docx(sections))
+    else:
+        raise ValueError(f"Unsupported file format: {extension}")
+    return path
+
+
+def main():
+    """Command line entry point.
+
+    Usage: python benchmarks/synthetic.py policy OUTPUT [--sections 10] [--sentences 20] [--keyword-density 0.05]
+           python benchmarks/synthetic.py complaints OUTPUT [--rows 1000000]
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description='Write synthetic benchmark data.')
+    parser.add_argument('--seed', type=int, default=0)
+    commands = parser.add_subparsers(dest='command', required=True)
+    policy = commands.add_parser('policy', help='a policy document (.txt, .pdf or .docx)')
+    policy.add_argument('output')
+    policy.add_argument('--sections', type=int, default=10)
+    policy.add_argument('--sentences', type=int, default=20, help='sentences per section')
+    policy.add_argument('--keyword-density', type=float, default=0.05)
+    complaints = commands.add_parser('complaints', help='a complaints CSV')
+    complaints.add_argument('output')
+    complaints.add_argument('--rows', type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == 'policy':
+        write_policy(args.output, args.sections, args.sentences, args.keyword_density, args.seed)
+    else:
+        write_complaints_csv(args.output, args.rows, args.seed)
+    print(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""gunicorn settings: load the app and its models once, then fork workers.
+
+With ``preload_app`` the master imports app.py and runs ``warm_up`` before
+forking, so every worker shares the fitted models, vectorizers and
+imported libraries copy-on-write instead of building its own copy.
+``gc.freeze`` moves everything allocated so far out of the collector's
+reach; otherwise a collection in a worker would touch every object's
+header and un-share the pages.
+
+Set ``GUNICORN_PRELOAD=0`` to get the previous behaviour, where each
+worker loads everything itself. Compare the two with
+``python benchmarks/bench_worker_memory.py``.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '120'))
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+# More than one thread makes these gthread workers, so a worker keeps serving
+# policy requests while some of its threads wait on the chat upstream (at most
+# chat.max_concurrent of them). GUNICORN_THREADS=1 restores sync workers;
+# GUNICORN_WORKER_CLASS=gevent needs gevent installed and GUNICORN_PRELOAD=0,
+# so the monkey-patching happens before the app is imported.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+
+if preload_app:
+    # Tells app.py to leave the job queue threads to post_fork
+    os.environ['PRELOAD_APP'] = '1'
+
+
+def on_starting(server):
+    if not preload_app:
+        return
+    import app
+    loaded = app.warm_up()
+    gc.freeze()
+    server.log.info("Warmed up %s before forking; %d objects frozen", ', '.join(loaded), gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    if preload_app:
+        import app
+        app.job_queue.start()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        import app
+        app.warm_up()
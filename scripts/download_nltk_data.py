@@ -0,0 +1,39 @@
+"""Download the NLTK corpora TextProcessor needs into a local directory.
+
+Usage: python scripts/download_nltk_data.py [--config config.yaml] [--output DIR]
+
+Run once at build or deploy time; the app only reads the data from
+processing.nltk_data_dir and never downloads on startup.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import yaml
+
+from src.utils.nltk_data import NLTK_RESOURCES, verify_nltk_data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    output = args.output or config.get('processing', {}).get('nltk_data_dir', './data/nltk_data')
+
+    import nltk
+    os.makedirs(output, exist_ok=True)
+    for name in NLTK_RESOURCES:
+        if not nltk.download(name, download_dir=output, quiet=True):
+            raise SystemExit(f"Failed to download NLTK resource {name}")
+    verify_nltk_data(output)
+    print(f"NLTK data for {', '.join(NLTK_RESOURCES)} -> {output}")
+
+
+if __name__ == '__main__':
+    main()
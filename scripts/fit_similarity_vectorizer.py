@@ -0,0 +1,37 @@
+"""Fit the SimilarityModel TF-IDF vocabulary offline from a policies CSV.
+
+Usage: python scripts/fit_similarity_vectorizer.py policies.csv [--output PATH]
+
+The CSV is read with DataLoader.load_policies_database. The artifact is
+written to ml_models.similarity_vectorizer.path from config.yaml unless
+--output is given, and is loaded once at startup by app.py.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_loader import DataLoader
+from src.models.similarity_model import SimilarityModel
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('csv_path')
+    parser.add_argument('--config', default='config.yaml')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    data_loader = DataLoader(args.config)
+    vectorizer_config = data_loader.config.get('ml_models', {}).get('similarity_vectorizer', {})
+    output = args.output or vectorizer_config.get('path', './data/trained_models/similarity_tfidf.pkl')
+
+    model = SimilarityModel()
+    vectors = model.fit_vectorizer_from_csv(args.csv_path, data_loader)
+    model.save_vectorizer(output)
+    print(f"Fitted {len(model.tfidf.vocabulary_)} terms on {vectors.shape[0]} policies -> {output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -4,6 +4,7 @@ from .feature_engineer import FeatureEngineer
 from .policy_checker import PolicyChecker
 from .complaint_analyzer import ComplaintAnalyzer
 from .update_tracker import UpdateTracker
+from .rule_matcher import RuleMatcher
 
 __all__ = [
     'DataLoader',
@@ -11,5 +12,6 @@ __all__ = [
     'FeatureEngineer',
     'PolicyChecker',
     'ComplaintAnalyzer',
-    'UpdateTracker'
+    'UpdateTracker',
+    'RuleMatcher'
 ]
\ No newline at end of file
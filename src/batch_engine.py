@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from .policy_checker import PolicyChecker
+
+_worker_checker = None
+
+
+class ItemTimeout(Exception):
+    pass
+
+
+def _raise_timeout(signum, frame):
+    raise ItemTimeout()
+
+
+def _run_with_timeout(func, arg, timeout):
+    # SIGALRM is only usable from the main thread on POSIX; elsewhere the
+    # item runs unbounded and the batch-level deadline still applies.
+    use_alarm = (
+        timeout
+        and hasattr(signal, 'setitimer')
+        and threading.current_thread() is threading.main_thread()
+    )
+    if not use_alarm:
+        return func(arg)
+
+    previous = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return func(arg)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _check_items(checker, items, item_timeout):
+    outcomes = []
+    for index, text in items:
+        try:
+            result = _run_with_timeout(checker.check_policy_compliance, text, item_timeout)
+            outcomes.append((index, 'ok', result))
+        except ItemTimeout:
+            outcomes.append((index, 'timeout', f"Timed out after {item_timeout}s"))
+        except Exception as e:
+            outcomes.append((index, 'error', str(e)))
+    return outcomes
+
+
+def _pool_context():
+    # Forking the serving process would copy the locks held by its other
+    # threads (job queue, metrics flusher, micro-batcher) into every worker
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        # Warm the fork server with this module only, never the app's __main__
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context('spawn')
+
+
+def _init_worker(checker_factory, worker_pids):
+    global _worker_checker
+    worker_pids.put(os.getpid())
+    _worker_checker = checker_factory()
+    if hasattr(_worker_checker, 'get_rule_matcher'):
+        _worker_checker.get_rule_matcher()
+
+
+def _check_chunk(items, item_timeout):
+    return _check_items(_worker_checker, items, item_timeout)
+
+
+class BatchEngine:
+    """Checks lists of policies on a pool of warm PolicyChecker processes.
+
+    Every input item gets exactly one entry in the output, in input order.
+    Items that fail or exceed ``item_timeout`` seconds are reported with an
+    ``error`` instead of being dropped.
+
+    Workers are started from a fork server (spawned where that is not
+    available) rather than forked from the calling process, so
+    ``checker_factory`` must be picklable by reference, e.g. a class or a
+    partial of one defined in an importable module.
+    """
+
+    def __init__(self, max_workers=None, chunk_size=16, item_timeout=30,
+                 inline_threshold=None, checker_factory=PolicyChecker):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.item_timeout = item_timeout
+        self.inline_threshold = self.chunk_size if inline_threshold is None else inline_threshold
+        self.checker_factory = checker_factory
+        self._executor = None
+        self._worker_pids = None
+        self._inline_checker = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                context = _pool_context()
+                # Workers report their pids, so hung ones can be killed on a timeout
+                self._worker_pids = context.SimpleQueue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.checker_factory, self._worker_pids)
+                )
+            return self._executor
+
+    def _reset_executor(self, terminate=False):
+        with self._lock:
+            if self._executor is not None:
+                if terminate:
+                    # Hung workers never pick up a shutdown request
+                    while not self._worker_pids.empty():
+                        try:
+                            os.kill(self._worker_pids.get(), signal.SIGTERM)
+                        except ProcessLookupError:
+                            pass
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._worker_pids.close()
+                self._executor = None
+                self._worker_pids = None
+
+    def shutdown(self):
+        self._reset_executor()
+
+    def check_policies(self, policies, checker=None):
+        """Return one result per entry of ``policies`` (dicts with ``text``/``id``)."""
+        outcomes = [None] * len(policies)
+        items = []
+        for index, policy_data in enumerate(policies):
+            if not isinstance(policy_data, dict) or not isinstance(policy_data.get('text'), str):
+                outcomes[index] = ('error', 'No policy text provided')
+            else:
+                items.append((index, policy_data['text']))
+
+        if len(items) <= self.inline_threshold or self.max_workers == 1:
+            if checker is None:
+                if self._inline_checker is None:
+                    self._inline_checker = self.checker_factory()
+                checker = self._inline_checker
+            for index, status, value in _check_items(checker, items, self.item_timeout):
+                outcomes[index] = (status, value)
+        else:
+            self._run_pool(items, outcomes)
+
+        results = []
+        for policy_data, (status, value) in zip(policies, outcomes):
+            policy_id = policy_data.get('id', 'unknown') if isinstance(policy_data, dict) else 'unknown'
+            if status == 'ok':
+                value['policy_id'] = policy_id
+                value['status'] = 'ok'
+                results.append(value)
+            else:
+                results.append({'policy_id': policy_id, 'status': status, 'error': value})
+        return results
+
+    def _run_pool(self, items, outcomes):
+        chunks = [items[i:i + self.chunk_size] for i in range(0, len(items), self.chunk_size)]
+        executor = self._get_executor()
+        futures = {executor.submit(_check_chunk, chunk, self.item_timeout): chunk for chunk in chunks}
+
+        # Worst case every item runs into its own timeout
+        deadline = None
+        if self.item_timeout:
+            rounds = -(-len(items) // self.max_workers)
+            deadline = self.item_timeout * rounds + 5
+
+        done, not_done = wait(futures, timeout=deadline)
+        broken = False
+        for future in done:
+            try:
+                for index, status, value in future.result():
+                    outcomes[index] = (status, value)
+            except BrokenProcessPool:
+                broken = True
+                for index, _ in futures[future]:
+                    outcomes[index] = ('error', 'Worker process terminated')
+            except Exception as e:
+                for index, _ in futures[future]:
+                    outcomes[index] = ('error', str(e))
+
+        for future in not_done:
+            future.cancel()
+            for index, _ in futures[future]:
+                outcomes[index] = ('timeout', f"Timed out after {self.item_timeout}s")
+
+        if broken or not_done:
+            self._reset_executor(terminate=bool(not_done))
@@ -1,7 +1,21 @@
+import io
+import os
+from itertools import chain
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
 from .text_processor import TextProcessor
+from .complaint_report import COMPLAINT_DTYPES, ComplaintReportBuilder, monthly_counts, value_counts
+from .utils.metrics import stage, timed
+
+URGENT_WORDS = frozenset(['immediately', 'urgent', 'emergency', 'asap'])
+EMOTIONAL_WORDS = frozenset(['angry', 'frustrated', 'disappointed', 'violated'])
+POSITIVE_WORDS = frozenset(['good', 'excellent', 'satisfied', 'happy', 'helpful', 'resolved'])
+NEGATIVE_WORDS = frozenset(['bad', 'poor', 'terrible', 'horrible', 'angry', 'frustrated', 'violated'])
+
+FEATURE_COLUMNS = ['word_count', 'unique_words', 'avg_word_length', 'has_urgent_words', 'has_emotional_words']
 
 class ComplaintAnalyzer:
     def __init__(self):
@@ -12,16 +26,19 @@ class ComplaintAnalyzer:
         self.complaint_data = complaints_df
         return self
     
+    @timed('complaint_analyzer.analyze')
     def analyze_complaint(self, complaint_text):
-        cleaned_text = self.text_processor.clean_text(complaint_text)
-        tokens = self.text_processor.tokenize_text(cleaned_text)
+        with stage('complaint_analyzer.clean'):
+            cleaned_text = self.text_processor.clean_text(complaint_text)
+        with stage('complaint_analyzer.tokenize'):
+            tokens = self.text_processor.tokenize_text(cleaned_text)
         
         features = {
             'word_count': len(tokens),
             'unique_words': len(set(tokens)),
             'avg_word_length': np.mean([len(word) for word in tokens]) if tokens else 0,
-            'has_urgent_words': any(word in ['immediately', 'urgent', 'emergency', 'asap'] for word in tokens),
-            'has_emotional_words': any(word in ['angry', 'frustrated', 'disappointed', 'violated'] for word in tokens)
+            'has_urgent_words': any(word in URGENT_WORDS for word in tokens),
+            'has_emotional_words': any(word in EMOTIONAL_WORDS for word in tokens)
         }
         
         sentiment_score = self._calculate_sentiment_score(tokens)
@@ -35,12 +52,78 @@ class ComplaintAnalyzer:
         
         return analysis_result
     
+    @timed('complaint_analyzer.analyze_batch')
+    def analyze_complaints(self, complaint_texts, batch_size=50000):
+        """Batch form of analyze_complaint over a Series of complaint texts.
+        
+        Returns a DataFrame indexed like ``complaint_texts`` with the feature
+        columns of analyze_complaint plus ``sentiment_score``; each row equals
+        the per-item result. Missing texts are treated as empty strings.
+        """
+        complaint_texts = pd.Series(complaint_texts).fillna('').astype(str)
+        batches = [self._analyze_batch(complaint_texts.iloc[start:start + batch_size])
+                   for start in range(0, len(complaint_texts), batch_size)]
+        if not batches:
+            return pd.DataFrame(columns=FEATURE_COLUMNS + ['sentiment_score'])
+        return pd.concat(batches)
+    
+    def token_counts(self, complaint_texts):
+        """Sparse per-complaint counts of the tokens analyze_complaint would see.
+        
+        Returns ``(counts, vocabulary)`` with one row per text and
+        ``vocabulary`` mapping each token to its column. Columns, and the
+        order of ``vocabulary``, follow the first appearance of each token
+        in the texts, as a pass over the joined text would meet them.
+        """
+        cleaned = self.text_processor.clean_series(complaint_texts)
+        
+        words = list(dict.fromkeys(chain.from_iterable(map(str.split, cleaned))))
+        if words:
+            word_counts = CountVectorizer(analyzer=str.split, vocabulary=words).transform(cleaned)
+        else:
+            # No complaint has a single word
+            word_counts = sparse.csr_matrix((len(cleaned), 0))
+        word_tokens, vocabulary = self.text_processor.tokenize_cleaned_words(words)
+        counts = sparse.csr_matrix(word_counts @ word_tokens)
+        counts.sum_duplicates()
+        return counts, vocabulary
+    
+    def _analyze_batch(self, complaint_texts):
+        # Every lexicon lookup is a product of the counts with a 0/1 vector
+        counts, vocabulary = self.token_counts(complaint_texts)
+        
+        def lexicon_counts(words):
+            weights = np.zeros(len(vocabulary))
+            weights[[vocabulary[word] for word in words if word in vocabulary]] = 1
+            return np.asarray(counts @ weights).ravel()
+        
+        word_lengths = np.zeros(len(vocabulary))
+        for word, column in vocabulary.items():
+            word_lengths[column] = len(word)
+        
+        word_count = np.asarray(counts.sum(axis=1)).ravel().astype(np.int64)
+        unique_words = np.diff(counts.indptr).astype(np.int64)
+        total_length = np.asarray(counts @ word_lengths).ravel()
+        positive_count = lexicon_counts(POSITIVE_WORDS)
+        negative_count = lexicon_counts(NEGATIVE_WORDS)
+        sentiment_total = positive_count + negative_count
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            avg_word_length = np.where(word_count > 0, total_length / word_count, 0)
+            sentiment_score = np.where(sentiment_total > 0, negative_count / sentiment_total, 0.5)
+        
+        return pd.DataFrame({
+            'word_count': word_count,
+            'unique_words': unique_words,
+            'avg_word_length': avg_word_length,
+            'has_urgent_words': lexicon_counts(URGENT_WORDS) > 0,
+            'has_emotional_words': lexicon_counts(EMOTIONAL_WORDS) > 0,
+            'sentiment_score': sentiment_score
+        }, index=complaint_texts.index)
+    
     def _calculate_sentiment_score(self, tokens):
-        positive_words = ['good', 'excellent', 'satisfied', 'happy', 'helpful', 'resolved']
-        negative_words = ['bad', 'poor', 'terrible', 'horrible', 'angry', 'frustrated', 'violated']
-        
-        positive_count = sum(1 for word in tokens if word in positive_words)
-        negative_count = sum(1 for word in tokens if word in negative_words)
+        positive_count = sum(1 for word in tokens if word in POSITIVE_WORDS)
+        negative_count = sum(1 for word in tokens if word in NEGATIVE_WORDS)
         
         total_sentiment_words = positive_count + negative_count
         
@@ -49,7 +132,12 @@ class ComplaintAnalyzer:
         
         return negative_count / total_sentiment_words
     
+    @timed('complaint_analyzer.report')
     def generate_complaint_report(self, complaints_df=None):
+        """Summary report of ``complaints_df`` (or the frame given to load_complaints).
+        
+        The frame is only read, so concurrent reports may share it.
+        """
         if complaints_df is None:
             complaints_df = self.complaint_data
         
@@ -70,16 +158,15 @@ class ComplaintAnalyzer:
                 report['date_range'] = {'start': 'N/A', 'end': 'N/A'}
         
         if 'category' in complaints_df.columns:
-            report['category_distribution'] = complaints_df['category'].value_counts().to_dict()
+            report['category_distribution'] = value_counts(complaints_df['category'])
         
         if 'severity' in complaints_df.columns:
-            report['severity_distribution'] = complaints_df['severity'].value_counts().to_dict()
+            report['severity_distribution'] = value_counts(complaints_df['severity'])
         
         if 'date_received' in complaints_df.columns:
             try:
-                complaints_df['month'] = pd.to_datetime(complaints_df['date_received']).dt.to_period('M')
-                monthly_counts = complaints_df.groupby('month').size()
-                report['trends']['monthly_counts'] = monthly_counts.astype(str).to_dict()
+                counts = monthly_counts(complaints_df['date_received'])
+                report['trends']['monthly_counts'] = {month: str(counts[month]) for month in sorted(counts)}
             except:
                 report['trends']['monthly_counts'] = {}
         
@@ -87,13 +174,45 @@ class ComplaintAnalyzer:
         
         return report
     
+    def new_report(self, top_n=10):
+        """A ComplaintReportBuilder owned by the caller, e.g. for one request."""
+        return ComplaintReportBuilder(self, top_n=top_n)
+    
+    @timed('complaint_analyzer.report_from_csv')
+    def generate_complaint_report_from_csv(self, csv_file, chunksize=10000, progress=None):
+        """generate_complaint_report over a CSV read ``chunksize`` rows at a time.
+        
+        Memory stays bounded however large the file is; ``common_issues`` is
+        then approximate (see SpaceSaving). Nothing is kept on the analyzer,
+        so one instance can serve concurrent requests. ``csv_file`` is a path or an open
+        binary file; ``progress(done, total)`` is called with byte offsets
+        after every chunk when the input is seekable.
+        """
+        if isinstance(csv_file, (str, os.PathLike)):
+            with open(csv_file, 'rb') as f:
+                return self.generate_complaint_report_from_csv(f, chunksize, progress)
+        
+        total = None
+        if getattr(csv_file, 'seekable', lambda: False)():
+            start = csv_file.tell()
+            total = csv_file.seek(0, io.SEEK_END)
+            csv_file.seek(start)
+        
+        builder = self.new_report()
+        for chunk in pd.read_csv(csv_file, chunksize=chunksize, dtype=COMPLAINT_DTYPES):
+            builder.add(chunk)
+            if progress is not None and total:
+                progress(min(csv_file.tell(), total), total)
+        return builder.report()
+    
     def _find_common_issues(self, complaints_df, top_n=10):
         if 'description' not in complaints_df.columns:
             return []
         
         all_text = ' '.join(complaints_df['description'].astype(str))
         cleaned = self.text_processor.clean_text(all_text)
-        tokens = self.text_processor.tokenize_text(cleaned)
+        with stage('complaint_analyzer.tokenize'):
+            tokens = self.text_processor.tokenize_text(cleaned)
         tokens_no_stopwords = self.text_processor.remove_stopwords(tokens)
         
         freq_dist = self.text_processor.get_word_frequency(tokens_no_stopwords)
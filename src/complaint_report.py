@@ -0,0 +1,172 @@
+import heapq
+import numpy as np
+import pandas as pd
+
+# Low-cardinality complaint columns; category dtype stores each distinct label once
+COMPLAINT_DTYPES = {'category': 'category', 'severity': 'category'}
+
+
+def value_counts(values):
+    """value_counts as a dict, without the unused categories a categorical column reports."""
+    counts = values.value_counts()
+    return {value: int(count) for value, count in counts.items() if count}
+
+
+def monthly_counts(dates):
+    """Complaints per ``YYYY-MM`` month, without adding a column to the caller's frame."""
+    months = pd.to_datetime(dates).dt.to_period('M')
+    return {str(month): int(count) for month, count in months.value_counts(sort=False).items()}
+
+
+class SpaceSaving:
+    """Bounded heavy-hitters counter (Space-Saving, merged a batch at a time).
+
+    At most ``capacity`` items are tracked. When a batch pushes the summary
+    past that, the lowest counts are evicted and the largest evicted count
+    becomes ``floor``: an upper bound on the true count of any untracked
+    item. Items entering later start from ``floor``, so every tracked count
+    overestimates the true count by at most its recorded error.
+    """
+
+    def __init__(self, capacity=10000):
+        self.capacity = capacity
+        self.floor = 0
+        self.counts = {}
+        self.errors = {}
+
+    def __len__(self):
+        return len(self.counts)
+
+    def update(self, counts):
+        """Add a mapping of item -> count."""
+        for item, count in counts.items():
+            if item in self.counts:
+                self.counts[item] += count
+            else:
+                self.counts[item] = self.floor + count
+                self.errors[item] = self.floor
+        if len(self.counts) > self.capacity:
+            self._prune()
+
+    def _prune(self):
+        evicted = len(self.counts) - self.capacity
+        for item in heapq.nsmallest(evicted, self.counts, key=self.counts.get):
+            self.floor = max(self.floor, self.counts.pop(item))
+            del self.errors[item]
+
+    def top(self, n):
+        """The ``n`` items with the highest counts, first-seen first among ties."""
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+
+class ComplaintReportBuilder:
+    """Builds ComplaintAnalyzer.generate_complaint_report output one chunk at a time.
+
+    Only running totals are kept: row count, category and severity counts,
+    the date range, monthly buckets and a SpaceSaving summary of description
+    words, so memory does not grow with the number of rows.
+    """
+
+    def __init__(self, analyzer, top_n=10, capacity=10000):
+        self.analyzer = analyzer
+        self.top_n = top_n
+        self.total_complaints = 0
+        self.columns = None
+        self.category_counts = {}
+        self.severity_counts = {}
+        self.date_start = None
+        self.date_end = None
+        self.date_error = False
+        self.monthly_counts = {}
+        self.monthly_error = False
+        self.issue_counter = SpaceSaving(capacity)
+
+    def add(self, chunk):
+        self.total_complaints += len(chunk)
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+
+        if 'category' in chunk.columns:
+            self._add_counts(self.category_counts, chunk['category'])
+        if 'severity' in chunk.columns:
+            self._add_counts(self.severity_counts, chunk['severity'])
+        if 'date_received' in chunk.columns:
+            self._add_dates(chunk['date_received'])
+        if 'description' in chunk.columns:
+            self._add_issues(chunk['description'])
+        return self
+
+    @staticmethod
+    def _add_counts(totals, values):
+        for value, count in value_counts(values).items():
+            totals[value] = totals.get(value, 0) + count
+
+    def _add_dates(self, dates):
+        if not self.date_error:
+            try:
+                start, end = dates.min(), dates.max()
+                if not pd.isna(start):
+                    self.date_start = start if self.date_start is None else min(self.date_start, start)
+                    self.date_end = end if self.date_end is None else max(self.date_end, end)
+            except Exception:
+                self.date_error = True
+
+        if not self.monthly_error:
+            try:
+                for month, count in monthly_counts(dates).items():
+                    self.monthly_counts[month] = self.monthly_counts.get(month, 0) + count
+            except Exception:
+                self.monthly_error = True
+
+    def _add_issues(self, descriptions):
+        # The vocabulary is in first-seen order, which top() keeps among ties
+        counts, vocabulary = self.analyzer.token_counts(descriptions.astype(str))
+        stop_words = self.analyzer.text_processor.stop_words
+        totals = np.asarray(counts.sum(axis=0)).ravel()
+        self.issue_counter.update({
+            word: int(totals[column]) for word, column in vocabulary.items()
+            if word not in stop_words and totals[column]
+        })
+
+    @staticmethod
+    def _sorted_counts(counts):
+        return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+    def report(self):
+        columns = self.columns or []
+        report = {
+            'total_complaints': self.total_complaints,
+            'category_distribution': {},
+            'severity_distribution': {},
+            'trends': {}
+        }
+
+        if 'date_received' in columns:
+            if self.date_error:
+                report['date_range'] = {'start': 'N/A', 'end': 'N/A'}
+            else:
+                report['date_range'] = {'start': self.date_start, 'end': self.date_end}
+
+        if 'category' in columns:
+            report['category_distribution'] = self._sorted_counts(self.category_counts)
+
+        if 'severity' in columns:
+            report['severity_distribution'] = self._sorted_counts(self.severity_counts)
+
+        if 'date_received' in columns:
+            if self.monthly_error:
+                report['trends']['monthly_counts'] = {}
+            else:
+                report['trends']['monthly_counts'] = {
+                    month: str(count) for month, count in sorted(self.monthly_counts.items())
+                }
+
+        if 'description' in columns:
+            report['common_issues'] = [
+                {'word': word, 'frequency': frequency}
+                for word, frequency in self.issue_counter.top(self.top_n)
+            ]
+        else:
+            report['common_issues'] = []
+
+        return report
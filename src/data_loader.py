@@ -1,14 +1,26 @@
+import codecs
+import hashlib
+import io
 import os
-import pandas as pd
-from PyPDF2 import PdfReader
-from docx import Document
 import yaml
+from .utils.metrics import stage, timed
+
+# pandas, PyPDF2 and docx are imported by the methods that need them, so
+# reading config.yaml at startup stays cheap
+
+class DocumentTooLarge(ValueError):
+    pass
 
 class DataLoader:
     def __init__(self, config_path='config.yaml'):
         with open(config_path, 'r', encoding='utf-8') as f:
             self.config = yaml.safe_load(f)
         
+        processing = self.config.get('processing', {})
+        self.max_document_bytes = processing.get('max_document_bytes')
+        self.max_document_pages = processing.get('max_document_pages')
+        
+    @timed('data_loader.load_policy_document')
     def load_policy_document(self, file_path):
         file_extension = os.path.splitext(file_path)[1].lower()
         
@@ -21,16 +33,88 @@ class DataLoader:
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
     
+    def iter_policy_text(self, stream, filename, max_bytes=None, max_pages=None):
+        """Yield the text of an uploaded document piece by piece.
+        
+        PDFs yield one page at a time, DOCX files one paragraph (newline
+        separated) and text files fixed-size chunks, so ''.join() of the
+        output equals load_policy_document on the same file. ``max_bytes``
+        caps the size of the input document and ``max_pages`` the number of
+        PDF pages; both default to the processing section of the config and
+        raise DocumentTooLarge when exceeded.
+        """
+        file_extension = os.path.splitext(filename)[1].lower()
+        max_bytes = max_bytes if max_bytes is not None else self.max_document_bytes
+        max_pages = max_pages if max_pages is not None else self.max_document_pages
+        
+        if file_extension == '.pdf':
+            self._check_stream_size(stream, max_bytes)
+            return self._iter_pdf(stream, max_pages)
+        elif file_extension == '.docx':
+            self._check_stream_size(stream, max_bytes)
+            return self._iter_docx(stream)
+        elif file_extension == '.txt':
+            return self._iter_txt(stream, max_bytes)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+    
+    @timed('data_loader.hash_stream')
+    def hash_stream(self, stream, chunk_size=65536):
+        position = stream.tell()
+        digest = hashlib.md5()
+        for data in iter(lambda: stream.read(chunk_size), b''):
+            digest.update(data)
+        stream.seek(position)
+        return digest.hexdigest()
+    
+    def _check_stream_size(self, stream, max_bytes):
+        if not max_bytes:
+            return
+        position = stream.tell()
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell() - position
+        stream.seek(position)
+        if size > max_bytes:
+            raise DocumentTooLarge(f"Document is {size} bytes, limit is {max_bytes}")
+    
+    def _iter_pdf(self, stream, max_pages=None):
+        from PyPDF2 import PdfReader
+        pdf_reader = PdfReader(stream)
+        if max_pages and len(pdf_reader.pages) > max_pages:
+            raise DocumentTooLarge(f"Document has {len(pdf_reader.pages)} pages, limit is {max_pages}")
+        for page_num in range(len(pdf_reader.pages)):
+            with stage('data_loader.pdf_page'):
+                text = pdf_reader.pages[page_num].extract_text()
+            # Drop decoded content streams so memory does not grow with page count
+            pdf_reader.resolved_objects.clear()
+            yield text
+    
+    def _iter_docx(self, stream):
+        from docx import Document
+        doc = Document(stream)
+        for index, paragraph in enumerate(doc.paragraphs):
+            yield paragraph.text if index == 0 else '\n' + paragraph.text
+    
+    def _iter_txt(self, stream, max_bytes=None, chunk_size=65536):
+        # Same universal-newline handling as open(file_path, 'r')
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+        bytes_read = 0
+        while True:
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            bytes_read += len(data)
+            if max_bytes and bytes_read > max_bytes:
+                raise DocumentTooLarge(f"Document exceeds {max_bytes} bytes")
+            yield decoder.decode(data)
+        yield decoder.decode(b'', final=True)
+    
     def _read_pdf(self, file_path):
-        text = ""
         with open(file_path, 'rb') as file:
-            pdf_reader = PdfReader(file)
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text += page.extract_text()
-        return text
+            return ''.join(self._iter_pdf(file))
     
     def _read_docx(self, file_path):
+        from docx import Document
         doc = Document(file_path)
         full_text = []
         for paragraph in doc.paragraphs:
@@ -41,15 +125,31 @@ class DataLoader:
         with open(file_path, 'r', encoding='utf-8') as file:
             return file.read()
     
+    @timed('data_loader.load_complaints_data')
     def load_complaints_data(self, csv_path):
-        df = pd.read_csv(csv_path)
+        import pandas as pd
+        from .complaint_report import COMPLAINT_DTYPES
+        df = pd.read_csv(csv_path, dtype=COMPLAINT_DTYPES)
+        self._check_complaint_columns(df)
+        return df
+    
+    def iter_complaints_data(self, csv_path, chunksize=10000):
+        """load_complaints_data as DataFrames of at most ``chunksize`` rows."""
+        import pandas as pd
+        from .complaint_report import COMPLAINT_DTYPES
+        for chunk in pd.read_csv(csv_path, dtype=COMPLAINT_DTYPES, chunksize=chunksize):
+            self._check_complaint_columns(chunk)
+            yield chunk
+    
+    def _check_complaint_columns(self, df):
         required_columns = ['complaint_id', 'description', 'category', 'date_received', 'severity']
         for col in required_columns:
             if col not in df.columns:
                 raise ValueError(f"Missing required column: {col}")
-        return df
     
+    @timed('data_loader.load_policies_database')
     def load_policies_database(self, csv_path):
+        import pandas as pd
         df = pd.read_csv(csv_path)
         required_columns = ['policy_id', 'policy_text', 'version', 'effective_date', 'company']
         for col in required_columns:
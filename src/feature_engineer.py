@@ -1,24 +1,212 @@
+import hashlib
 import numpy as np
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
-from sklearn.decomposition import TruncatedSVD
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from .parsed_policy import ParsedPolicy
+
+COMPLIANCE_KEYWORDS = {
+    'data_collection': ['collect', 'gather', 'obtain', 'acquire'],
+    'third_party': ['third party', 'partner', 'affiliate', 'share with'],
+    'user_rights': ['access', 'delete', 'modify', 'rectify', 'opt-out'],
+    'security': ['encrypt', 'secure', 'protect', 'firewall', 'authentication'],
+    'retention': ['retain', 'store', 'keep', 'period', 'duration']
+}
+
+BUNDLE_KIND = 'feature_engineer'
+
+RETENTION_PATTERN = re.compile(r'(\d+)\s*(day|month|year)s?')
+
+def _retention_days(retention_match):
+    if not retention_match:
+        return 0
+    num = int(retention_match.group(1))
+    unit = retention_match.group(2)
+    if unit == 'year':
+        return num * 365
+    elif unit == 'month':
+        return num * 30
+    return num
 
 class FeatureEngineer:
-    def __init__(self, max_features=1000):
-        self.tfidf_vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
-        self.count_vectorizer = CountVectorizer(max_features=500, stop_words='english')
-        self.scaler = StandardScaler()
-        self.label_encoder = LabelEncoder()
-        self.lsa = TruncatedSVD(n_components=50)
+    """Turns policy text into model features, with fitting separate from transforming.
+    
+    ``fit_text_features`` learns the vocabulary, IDF weights and LSA
+    projection once; ``transform_text_features`` then only applies them
+    and memoizes the LSA row of each document by content hash, keeping the
+    ``cache_size`` most recent. The TF-IDF and count features share one
+    tokenization pass over the text. The fitted state can be saved and
+    loaded as a model bundle (see models.artifact).
+    """
+    
+    def __init__(self, max_features=1000, max_count_features=500, n_components=50, cache_size=10000,
+                 random_state=None):
+        self.max_features = max_features
+        self.max_count_features = max_count_features
+        self.n_components = n_components
+        self.cache_size = cache_size
+        self.random_state = random_state
+        self.vectorizer_ = None
+        self._transform_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_cache_lock']
+        state['_transform_cache'] = OrderedDict()
+        return state
+    
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._cache_lock = threading.Lock()
+    
+    # The sklearn estimators are created on first use: PolicyChecker only needs
+    # extract_compliance_features and should not pay for importing sklearn
+    @cached_property
+    def tfidf_transformer(self):
+        from sklearn.feature_extraction.text import TfidfTransformer
+        return TfidfTransformer()
+    
+    @cached_property
+    def scaler(self):
+        from sklearn.preprocessing import StandardScaler
+        return StandardScaler()
+    
+    @cached_property
+    def label_encoder(self):
+        from sklearn.preprocessing import LabelEncoder
+        return LabelEncoder()
+    
+    @cached_property
+    def lsa(self):
+        from sklearn.decomposition import TruncatedSVD
+        return TruncatedSVD(n_components=self.n_components, random_state=self.random_state)
+    
+    @staticmethod
+    def _top_columns(term_frequency, limit):
+        # Same selection (and tie order) as a vectorizer's max_features
+        if limit is None or len(term_frequency) <= limit:
+            return np.arange(len(term_frequency))
+        return np.sort((-term_frequency).argsort()[:limit])
+    
+    def _fit_text(self, text_series):
+        from sklearn.feature_extraction.text import CountVectorizer
+        
+        # One tokenization gives the counts both feature sets are cut from, so
+        # a single vectorizer over the union of their terms serves transforms
+        counter = CountVectorizer(stop_words='english', dtype=np.float64)
+        counts = counter.fit_transform(text_series)
+        term_frequency = np.asarray(counts.sum(axis=0)).ravel()
+        tfidf_columns = self._top_columns(term_frequency, self.max_features)
+        count_columns = self._top_columns(term_frequency, self.max_count_features)
+        columns = np.union1d(tfidf_columns, count_columns)
         
-    def extract_text_features(self, text_series):
-        tfidf_features = self.tfidf_vectorizer.fit_transform(text_series)
-        count_features = self.count_vectorizer.fit_transform(text_series)
+        self.vectorizer_ = CountVectorizer(stop_words='english', dtype=np.float64,
+                                           vocabulary=counter.get_feature_names_out()[columns])
+        self.tfidf_columns_ = np.searchsorted(columns, tfidf_columns)
+        self.count_columns_ = np.searchsorted(columns, count_columns)
+        with self._cache_lock:
+            self._transform_cache.clear()
+        
+        tfidf_features = self.tfidf_transformer.fit_transform(counts[:, tfidf_columns])
+        self.lsa.set_params(n_components=min(self.n_components, tfidf_features.shape[1] - 1))
+        return self.lsa.fit_transform(tfidf_features), counts[:, count_columns].astype(np.int64)
+    
+    def fit_text_features(self, text_series):
+        self._fit_text(text_series)
+        return self
+    
+    def extract_text_features(self, text_series, return_counts=False):
+        """Fit on ``text_series`` and return its LSA features.
+        
+        With ``return_counts`` the count features of the same texts (as
+        transform_count_features would give) are returned too, taken from
+        the fitting pass rather than tokenizing again.
+        """
+        lsa_features, count_features = self._fit_text(text_series)
+        return (lsa_features, count_features) if return_counts else lsa_features
+    
+    def transform_text_features(self, text_series):
+        """LSA features of new text under the fitted state, one row per text."""
+        self._check_fitted()
+        texts = list(text_series)
+        keys = [hashlib.md5(text.encode('utf-8')).digest() for text in texts]
+        rows = [None] * len(texts)
+        missing = {}
+        with self._cache_lock:
+            for index, key in enumerate(keys):
+                row = self._transform_cache.get(key)
+                if row is not None:
+                    self._transform_cache.move_to_end(key)
+                    rows[index] = row
+                else:
+                    missing.setdefault(key, texts[index])
         
-        lsa_features = self.lsa.fit_transform(tfidf_features)
+        if missing:
+            counts = self.vectorizer_.transform(list(missing.values()))
+            features = self.lsa.transform(self.tfidf_transformer.transform(counts[:, self.tfidf_columns_]))
+            # Copies, so a cached row does not keep the whole batch matrix alive
+            computed = {key: row.copy() for key, row in zip(missing, features)}
+            with self._cache_lock:
+                for key, row in computed.items():
+                    self._transform_cache[key] = row
+                    self._transform_cache.move_to_end(key)
+                while len(self._transform_cache) > self.cache_size:
+                    self._transform_cache.popitem(last=False)
+            rows = [row if row is not None else computed[key] for row, key in zip(rows, keys)]
         
-        return lsa_features
+        if not rows:
+            return np.zeros((0, self.lsa.n_components))
+        return np.vstack(rows)
+    
+    def transform_count_features(self, text_series):
+        """Sparse term counts over the ``max_count_features`` most frequent fitted terms."""
+        self._check_fitted()
+        counts = self.vectorizer_.transform(text_series)
+        return counts[:, self.count_columns_].astype(np.int64)
+    
+    def _check_fitted(self):
+        if self.vectorizer_ is None:
+            raise ValueError("FeatureEngineer text features are not fitted; call fit_text_features first")
+    
+    def save_state(self, path):
+        """Save the fitted text, scaler and label state as a bundle directory."""
+        from .models.artifact import save_bundle
+        return save_bundle(path, self.get_fitted_state(), BUNDLE_KIND)
+    
+    def load_state(self, path, mmap=True):
+        from .models.artifact import load_bundle
+        return self.set_fitted_state(load_bundle(path, BUNDLE_KIND, mmap=mmap))
+    
+    def get_fitted_state(self):
+        """The parameters and fitted estimators, as stored by save_state."""
+        state = {'params': {'max_features': self.max_features, 'max_count_features': self.max_count_features,
+                            'n_components': self.n_components, 'random_state': self.random_state}}
+        if self.vectorizer_ is not None:
+            state.update(vectorizer=self.vectorizer_, tfidf_columns=self.tfidf_columns_,
+                         count_columns=self.count_columns_, tfidf_transformer=self.tfidf_transformer, lsa=self.lsa)
+        if hasattr(self.scaler, 'scale_'):
+            state['scaler'] = self.scaler
+        if hasattr(self.label_encoder, 'classes_'):
+            state['label_encoder'] = self.label_encoder
+        return state
+    
+    def set_fitted_state(self, state):
+        for name, value in state['params'].items():
+            setattr(self, name, value)
+        if 'vectorizer' in state:
+            self.vectorizer_ = state['vectorizer']
+            self.tfidf_columns_ = state['tfidf_columns']
+            self.count_columns_ = state['count_columns']
+            self.tfidf_transformer = state['tfidf_transformer']
+            self.lsa = state['lsa']
+        for name in ('scaler', 'label_encoder'):
+            if name in state:
+                setattr(self, name, state[name])
+        with self._cache_lock:
+            self._transform_cache.clear()
+        return self
     
     def extract_numeric_features(self, df):
         numeric_features = []
@@ -41,37 +229,63 @@ class FeatureEngineer:
     def extract_compliance_features(self, text):
         features = []
         
-        keywords_sets = {
-            'data_collection': ['collect', 'gather', 'obtain', 'acquire'],
-            'third_party': ['third party', 'partner', 'affiliate', 'share with'],
-            'user_rights': ['access', 'delete', 'modify', 'rectify', 'opt-out'],
-            'security': ['encrypt', 'secure', 'protect', 'firewall', 'authentication'],
-            'retention': ['retain', 'store', 'keep', 'period', 'duration']
-        }
-        
-        text_lower = text.lower()
+        text_lower = text.text_lower if isinstance(text, ParsedPolicy) else text.lower()
         
-        for key, keywords in keywords_sets.items():
+        for key, keywords in COMPLIANCE_KEYWORDS.items():
             present = any(keyword in text_lower for keyword in keywords)
             features.append(1 if present else 0)
         
-        retention_match = re.search(r'(\d+)\s*(day|month|year)s?', text_lower)
-        if retention_match:
-            num = int(retention_match.group(1))
-            unit = retention_match.group(2)
-            if unit == 'year':
-                features.append(num * 365)
-            elif unit == 'month':
-                features.append(num * 30)
-            else:
-                features.append(num)
-        else:
-            features.append(0)
+        retention_match = RETENTION_PATTERN.search(text_lower)
+        features.append(_retention_days(retention_match))
         
         return np.array(features)
     
-    def encode_categorical(self, labels):
-        return self.label_encoder.fit_transform(labels)
+    def encode_categorical(self, labels, fit=None):
+        """Integer codes for ``labels``; fits the encoder on the first call or when ``fit`` is True."""
+        if fit or (fit is None and not hasattr(self.label_encoder, 'classes_')):
+            return self.label_encoder.fit_transform(labels)
+        return self.label_encoder.transform(labels)
     
-    def scale_features(self, features):
-        return self.scaler.fit_transform(features)
\ No newline at end of file
+    def scale_features(self, features, fit=None):
+        """Standardized ``features``; fits the scaler on the first call or when ``fit`` is True."""
+        if fit or (fit is None and not hasattr(self.scaler, 'scale_')):
+            return self.scaler.fit_transform(features)
+        return self.scaler.transform(features)
+
+
+class ComplianceFeatureCounter:
+    """Incremental form of FeatureEngineer.extract_compliance_features.
+    
+    Expects whole lines (as yielded by TextProcessor.iter_lines): keywords
+    never contain a newline, so they cannot straddle two lines, and the only
+    cross-line retention match ("30\\n days") is handled with a small carry.
+    """
+    
+    _carry_pattern = re.compile(r'\d+\s*$')
+    
+    def __init__(self):
+        self.present = {key: False for key in COMPLIANCE_KEYWORDS}
+        self.retention_days = None
+        self._carry = ''
+    
+    def feed(self, line):
+        line_lower = line.lower()
+        
+        for key, keywords in COMPLIANCE_KEYWORDS.items():
+            if not self.present[key] and any(keyword in line_lower for keyword in keywords):
+                self.present[key] = True
+        
+        if self.retention_days is None:
+            text = self._carry + line_lower
+            retention_match = RETENTION_PATTERN.search(text)
+            if retention_match:
+                self.retention_days = _retention_days(retention_match)
+                self._carry = ''
+            else:
+                carry_match = self._carry_pattern.search(text)
+                self._carry = carry_match.group(0) if carry_match else ''
+    
+    def features(self):
+        features = [1 if self.present[key] else 0 for key in COMPLIANCE_KEYWORDS]
+        features.append(self.retention_days or 0)
+        return np.array(features)
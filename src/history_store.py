@@ -0,0 +1,203 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from .utils.helpers import json_default
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def record_timestamp(record):
+    return int(datetime.strptime(record['update_timestamp'], TIMESTAMP_FORMAT).timestamp())
+
+
+class InMemoryHistoryStore:
+    """Process-local history kept in insertion order, capped at ``max_records``."""
+
+    def __init__(self, max_records=10000, max_age_days=None):
+        self.max_records = max_records
+        self.max_age_days = max_age_days
+        self._records = deque(maxlen=max_records)
+        self._last_id = 0
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self._last_id += 1
+            record_id = self._last_id
+            self._records.append((record_id, record_timestamp(record), record))
+        if self.max_age_days:
+            self.compact()
+        return record_id
+
+    def query(self, policy_id=None, since=None):
+        """Records newest first, optionally for one policy and from ``since`` (epoch seconds)."""
+        with self._lock:
+            records = [(ts, r) for _, ts, r in self._records]
+        if since is not None:
+            records = [(ts, r) for ts, r in records if ts >= since]
+        if policy_id:
+            records = [(ts, r) for ts, r in records if r['policy_id'] == policy_id]
+        return [r for _, r in sorted(records, key=lambda item: item[0], reverse=True)]
+
+    def iter_records(self):
+        for _, record in self.iter_entries():
+            yield record
+
+    def iter_entries(self, after_id=0):
+        """Yield ``(record_id, record)`` in insertion order for ids above ``after_id``."""
+        with self._lock:
+            records = [(record_id, r) for record_id, _, r in self._records if record_id > after_id]
+        yield from records
+
+    def get_records(self, record_ids):
+        """Map each still-stored id in ``record_ids`` to its record."""
+        wanted = set(record_ids)
+        with self._lock:
+            return {record_id: r for record_id, _, r in self._records if record_id in wanted}
+
+    def count(self):
+        return len(self._records)
+
+    def compact(self):
+        if not self.max_age_days:
+            return 0
+        cutoff = time.time() - self.max_age_days * 86400
+        removed = 0
+        with self._lock:
+            while self._records and self._records[0][1] < cutoff:
+                self._records.popleft()
+                removed += 1
+        return removed
+
+
+class SQLiteHistoryStore:
+    """History persisted in SQLite and shared by every process using the file.
+
+    Rows are indexed on ``(policy_id, update_ts)`` and ``update_ts`` so history
+    queries are range scans. Every ``compact_every`` inserts, rows older than
+    ``max_age_days`` and all but the newest ``max_records`` rows are deleted.
+    """
+
+    def __init__(self, db_path=':memory:', max_records=100000, max_age_days=None, compact_every=1000):
+        self.db_path = db_path
+        self.max_records = max_records
+        self.max_age_days = max_age_days
+        self.compact_every = compact_every
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._inserts_since_compact = 0
+
+        if db_path != ':memory:':
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.compact()
+
+    def _connection(self):
+        # One connection per process; calls are serialised by self._lock
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+            if self.db_path != ':memory:':
+                conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS update_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    policy_id TEXT,
+                    update_ts INTEGER NOT NULL,
+                    record TEXT NOT NULL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_history_policy_ts ON update_history (policy_id, update_ts)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_history_ts ON update_history (update_ts)')
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def add(self, record):
+        with self._lock:
+            record_id = self._connection().execute(
+                'INSERT INTO update_history (policy_id, update_ts, record) VALUES (?, ?, ?)',
+                (record['policy_id'], record_timestamp(record), json.dumps(record, default=json_default))
+            ).lastrowid
+            self._inserts_since_compact += 1
+            due = self._inserts_since_compact >= self.compact_every
+        if due:
+            self.compact()
+        return record_id
+
+    def query(self, policy_id=None, since=None):
+        """Records newest first, optionally for one policy and from ``since`` (epoch seconds)."""
+        conditions = []
+        params = []
+        if policy_id:
+            conditions.append('policy_id = ?')
+            params.append(policy_id)
+        if since is not None:
+            conditions.append('update_ts >= ?')
+            params.append(since)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT record FROM update_history {where} ORDER BY update_ts DESC, id ASC", params
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def iter_records(self, batch_size=1000):
+        for _, record in self.iter_entries(batch_size=batch_size):
+            yield record
+
+    def iter_entries(self, after_id=0, batch_size=1000):
+        """Yield ``(record_id, record)`` in insertion order for ids above ``after_id``."""
+        last_id = after_id
+        while True:
+            with self._lock:
+                rows = self._connection().execute(
+                    'SELECT id, record FROM update_history WHERE id > ? ORDER BY id LIMIT ?',
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            for row_id, record in rows:
+                yield row_id, json.loads(record)
+            last_id = rows[-1][0]
+
+    def get_records(self, record_ids, batch_size=500):
+        """Map each still-stored id in ``record_ids`` to its record."""
+        record_ids = list(record_ids)
+        records = {}
+        for start in range(0, len(record_ids), batch_size):
+            batch = record_ids[start:start + batch_size]
+            placeholders = ', '.join('?' * len(batch))
+            with self._lock:
+                rows = self._connection().execute(
+                    f"SELECT id, record FROM update_history WHERE id IN ({placeholders})", batch
+                ).fetchall()
+            records.update((row_id, json.loads(record)) for row_id, record in rows)
+        return records
+
+    def count(self):
+        with self._lock:
+            return self._connection().execute('SELECT COUNT(*) FROM update_history').fetchone()[0]
+
+    def compact(self):
+        removed = 0
+        with self._lock:
+            conn = self._connection()
+            self._inserts_since_compact = 0
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += conn.execute('DELETE FROM update_history WHERE update_ts < ?', (cutoff,)).rowcount
+            if self.max_records:
+                removed += conn.execute(
+                    'DELETE FROM update_history WHERE id <= ('
+                    'SELECT id FROM update_history ORDER BY id DESC LIMIT 1 OFFSET ?)',
+                    (self.max_records,)
+                ).rowcount
+        return removed
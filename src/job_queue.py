@@ -0,0 +1,292 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from .utils.helpers import json_default
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobStore:
+    """SQLite-backed job table shared by every process using the same file."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    progress REAL NOT NULL DEFAULT 0,
+                    cancel_requested INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)')
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def create(self, kind, payload):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO jobs (id, kind, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (job_id, kind, QUEUED, json.dumps(payload, default=json_default), now, now)
+            )
+        return job_id
+
+    def get(self, job_id, include_result=False):
+        with self._connect() as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            'job_id': row['id'],
+            'type': row['kind'],
+            'status': row['status'],
+            'progress': row['progress'],
+            'error': row['error'],
+            'cancel_requested': bool(row['cancel_requested']),
+            'attempts': row['attempts'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at']
+        }
+        if include_result:
+            job['result'] = json.loads(row['result']) if row['result'] else None
+        return job
+
+    def get_payload(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute('SELECT payload FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return json.loads(row['payload']) if row else None
+
+    def claim_next(self):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT id, kind FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            conn.execute(
+                'UPDATE jobs SET status = ?, attempts = attempts + 1, started_at = ?, updated_at = ? WHERE id = ?',
+                (RUNNING, now, now, row['id'])
+            )
+            conn.execute('COMMIT')
+        return row['id'], row['kind']
+
+    def heartbeat(self, job_id, progress=None):
+        """Record progress; returns True when cancellation was requested."""
+        with self._connect() as conn:
+            if progress is None:
+                conn.execute('UPDATE jobs SET updated_at = ? WHERE id = ?', (time.time(), job_id))
+            else:
+                conn.execute(
+                    'UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ?',
+                    (progress, time.time(), job_id)
+                )
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def _finish(self, job_id, status, result=None, error=None):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, progress = COALESCE(?, progress), '
+                'updated_at = ?, finished_at = ? WHERE id = ? AND status = ?',
+                (status, result, error, 1.0 if status == COMPLETED else None, now, now, job_id, RUNNING)
+            )
+
+    def complete(self, job_id, result):
+        self._finish(job_id, COMPLETED, result=json.dumps(result, default=json_default))
+
+    def fail(self, job_id, error):
+        self._finish(job_id, FAILED, error=error)
+
+    def mark_cancelled(self, job_id):
+        self._finish(job_id, CANCELLED, error='Cancelled by request')
+
+    def request_cancel(self, job_id):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ?, finished_at = ? WHERE id = ? AND status = ?',
+                (CANCELLED, 'Cancelled by request', now, now, job_id, QUEUED)
+            )
+            conn.execute(
+                'UPDATE jobs SET cancel_requested = 1, updated_at = ? WHERE id = ? AND status = ?',
+                (now, job_id, RUNNING)
+            )
+            conn.execute('COMMIT')
+        return self.get(job_id)
+
+    def requeue_stale(self, stale_after, max_attempts=3):
+        """Return running jobs whose worker stopped heartbeating to the queue."""
+        cutoff = time.time() - stale_after
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ? '
+                'WHERE status = ? AND updated_at < ? AND attempts >= ?',
+                (FAILED, 'Worker stopped while running job', time.time(), RUNNING, cutoff, max_attempts)
+            )
+            requeued = conn.execute(
+                'UPDATE jobs SET status = ?, progress = 0 WHERE status = ? AND updated_at < ?',
+                (QUEUED, RUNNING, cutoff)
+            ).rowcount
+            conn.execute('COMMIT')
+        return requeued
+
+
+class JobContext:
+    def __init__(self, store, job_id):
+        self.store = store
+        self.job_id = job_id
+
+    def progress(self, done, total):
+        fraction = done / total if total else 1.0
+        if self.store.heartbeat(self.job_id, fraction):
+            raise JobCancelled()
+
+
+class JobQueue:
+    """Background worker threads executing jobs from a JobStore.
+
+    ``handlers`` maps a job type to ``handler(payload, context)``; the return
+    value is stored as the job result. Handlers call ``context.progress`` to
+    report progress, which also raises ``JobCancelled`` once a cancel is
+    requested. While a handler runs, the job is also kept alive every
+    ``heartbeat_interval`` seconds (a quarter of ``stale_after`` by default),
+    so a long step without progress reports is not mistaken for a dead
+    worker and run a second time.
+
+    ``cleanup`` maps a job type to ``cleanup(payload)``, called when a job
+    is cancelled before it started (handlers clean up after themselves
+    otherwise); it may run more than once for the same job.
+    """
+
+    def __init__(self, store, handlers, num_workers=2, poll_interval=0.5, stale_after=300,
+                 heartbeat_interval=None, cleanup=None):
+        self.store = store
+        self.handlers = handlers
+        self.num_workers = num_workers
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.heartbeat_interval = heartbeat_interval or max(stale_after / 4, 1.0)
+        self.cleanup = cleanup or {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def submit(self, kind, payload):
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job type: {kind}")
+        job_id = self.store.create(kind, payload)
+        self._wakeup.set()
+        return job_id
+
+    def cancel(self, job_id):
+        """Cancel a job as ``JobStore.request_cancel`` does; returns the job or None."""
+        job = self.store.request_cancel(job_id)
+        if job is not None and job['status'] == CANCELLED and job['started_at'] is None and job['type'] in self.cleanup:
+            self.cleanup[job['type']](self.store.get_payload(job_id))
+        return job
+
+    def start(self):
+        if self._threads:
+            return self
+        self._stop.clear()
+        self.store.requeue_stale(self.stale_after)
+        for index in range(self.num_workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self):
+        last_sweep = time.time()
+        while not self._stop.is_set():
+            claimed = self.store.claim_next()
+            if claimed is None:
+                if time.time() - last_sweep > self.stale_after:
+                    self.store.requeue_stale(self.stale_after)
+                    last_sweep = time.time()
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self.run_job(*claimed)
+
+    def run_job(self, job_id, kind):
+        context = JobContext(self.store, job_id)
+        done = threading.Event()
+        keep_alive = threading.Thread(
+            target=self._keep_alive, args=(job_id, done), name=f"job-heartbeat-{job_id[:8]}", daemon=True
+        )
+        keep_alive.start()
+        try:
+            payload = self.store.get_payload(job_id)
+            result = self.handlers[kind](payload, context)
+            if self.store.heartbeat(job_id):
+                raise JobCancelled()
+            self.store.complete(job_id, result)
+        except JobCancelled:
+            self.store.mark_cancelled(job_id)
+        except Exception as e:
+            self.store.fail(job_id, str(e))
+        finally:
+            done.set()
+            keep_alive.join()
+
+    def _keep_alive(self, job_id, done):
+        while not done.wait(self.heartbeat_interval):
+            try:
+                self.store.heartbeat(job_id)
+            except sqlite3.Error:
+                # A busy database only delays this beat; the next one retries
+                pass
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+
+from .result_cache import ResultCache
+from .utils.metrics import LLM_REQUESTS, metrics, stage
+
+# requests is imported when the first session is built
+
+DEFAULT_BASE_URL = 'https://generativelanguage.googleapis.com'
+
+GENERATION_CONFIG = {
+    'temperature': 0.7,
+    'topK': 40,
+    'topP': 0.95,
+    'maxOutputTokens': 1024,
+}
+
+SAFETY_SETTINGS = [
+    {'category': category, 'threshold': 'BLOCK_MEDIUM_AND_ABOVE'}
+    for category in ('HARM_CATEGORY_HARASSMENT', 'HARM_CATEGORY_HATE_SPEECH',
+                     'HARM_CATEGORY_SEXUALLY_EXPLICIT', 'HARM_CATEGORY_DANGEROUS_CONTENT')
+]
+
+RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+
+
+class LLMError(Exception):
+    pass
+
+
+class CircuitOpen(LLMError):
+    pass
+
+
+class ClientBusy(LLMError):
+    pass
+
+
+class EmptyResponse(LLMError):
+    pass
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after ``failure_threshold`` consecutive failures.
+
+    While open, ``allow`` refuses every call for ``reset_timeout`` seconds;
+    then a single trial call is let through (half-open) and its outcome
+    closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if self.clock() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = self.clock()
+            self._trial_running = False
+
+
+def normalize_text(text):
+    return re.sub(r'\s+', ' ', str(text)).strip().lower()
+
+
+def chat_cache_key(message, history=None):
+    """Cache key of a conversation, ignoring case and whitespace."""
+    normalized = [[entry.get('role') == 'user', normalize_text(entry.get('content', ''))] for entry in history or []]
+    normalized.append([True, normalize_text(message)])
+    return 'chat:' + hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+def build_contents(message, history=None):
+    contents = []
+    for entry in history or []:
+        contents.append({
+            'role': 'user' if entry.get('role') == 'user' else 'model',
+            'parts': [{'text': entry.get('content', '')}]
+        })
+    contents.append({'role': 'user', 'parts': [{'text': message}]})
+    return contents
+
+
+class GeminiClient:
+    """Outbound client for the Gemini generateContent API.
+
+    Calls share a keep-alive connection pool (one per process, rebuilt
+    after fork) and have separate connect and read timeouts. Connection
+    errors, timeouts and 429/5xx answers are retried up to ``retries``
+    times with full-jitter exponential backoff, within ``total_timeout``
+    seconds overall. After ``failure_threshold`` failed calls in a row the
+    circuit breaker fails every call at once for ``reset_timeout`` seconds,
+    and at most ``max_concurrent`` calls per process wait on the upstream;
+    the rest fail at once with ClientBusy, so a slow upstream holds only
+    that many worker threads (or greenlets, under gevent) and never all of
+    them. Answers are cached on the normalized message and history.
+
+    ``generate`` raises LLMError (or one of its subclasses) whenever no
+    answer is available; callers pick their own fallback.
+    """
+
+    def __init__(self, api_key=None, base_url=DEFAULT_BASE_URL, model='gemini-pro', connect_timeout=3.05,
+                 read_timeout=20.0, total_timeout=30.0, retries=2, backoff=0.5, max_backoff=4.0, pool_size=10,
+                 max_concurrent=8, failure_threshold=5, reset_timeout=30.0, cache_entries=512):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.max_concurrent = max_concurrent
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.cache = ResultCache(max_entries=cache_entries) if cache_entries else None
+        self._slots = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"{self.base_url}/v1beta/models/{self.model}:generateContent"
+
+    def session(self):
+        # Pooled sockets must not be shared with a forked child
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def generate(self, message, history=None):
+        """The model's answer to ``message`` after ``history`` (dicts with role/content)."""
+        key = chat_cache_key(message, history)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                metrics.increment(LLM_REQUESTS, outcome='cache')
+                return cached
+
+        if not self.api_key:
+            metrics.increment(LLM_REQUESTS, outcome='error')
+            raise LLMError('GEMINI_API_KEY is not set')
+        # The slot is taken first so a half-open trial call is never refused for being busy
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            metrics.increment(LLM_REQUESTS, outcome='busy')
+            raise ClientBusy(f"{self.max_concurrent} upstream calls already in flight")
+        try:
+            if not self.breaker.allow():
+                metrics.increment(LLM_REQUESTS, outcome='circuit_open')
+                raise CircuitOpen('Upstream circuit is open')
+            with stage('llm_client.generate'):
+                text = self._call(build_contents(message, history))
+        except CircuitOpen:
+            raise
+        except EmptyResponse:
+            # The upstream answered, so the circuit stays closed
+            self.breaker.record_success()
+            metrics.increment(LLM_REQUESTS, outcome='empty')
+            raise
+        except LLMError:
+            self.breaker.record_failure()
+            metrics.increment(LLM_REQUESTS, outcome='error')
+            raise
+        except Exception as e:
+            # Anything else must still settle a half-open trial, or the circuit never closes again
+            self.breaker.record_failure()
+            metrics.increment(LLM_REQUESTS, outcome='error')
+            raise LLMError(f"Upstream call failed: {type(e).__name__}: {e}") from e
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+        self.breaker.record_success()
+        metrics.increment(LLM_REQUESTS, outcome='ok')
+        if self.cache is not None:
+            self.cache.set(key, text)
+        return text
+
+    def _call(self, contents):
+        import requests
+
+        payload = {'contents': contents, 'generationConfig': GENERATION_CONFIG, 'safetySettings': SAFETY_SETTINGS}
+        deadline = time.monotonic() + self.total_timeout
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                response = self.session().post(
+                    self.url, params={'key': self.api_key}, json=payload,
+                    timeout=(self.connect_timeout, max(0.001, min(self.read_timeout, remaining)))
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error, retryable = LLMError(f"Upstream request failed: {type(e).__name__}"), True
+            except requests.RequestException as e:
+                # e.g. ChunkedEncodingError from a truncated body
+                error, retryable = LLMError(f"Upstream request failed: {type(e).__name__}"), False
+            else:
+                if response.status_code == 200:
+                    return self._parse(response)
+                error = LLMError(f"Upstream returned HTTP {response.status_code}")
+                retryable = response.status_code in RETRY_STATUSES
+
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+            if not retryable or attempt >= self.retries or time.monotonic() + delay >= deadline:
+                raise error
+            time.sleep(delay)
+            attempt += 1
+
+    def _parse(self, response):
+        try:
+            result = response.json()
+            return result['candidates'][0]['content']['parts'][0]['text']
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise EmptyResponse('Upstream returned no candidates')
@@ -0,0 +1,92 @@
+import os
+import queue
+import threading
+import time
+
+
+class _Pending:
+    __slots__ = ('item', 'done', 'result', 'error')
+
+    def __init__(self, item):
+        self.item = item
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item calls into one batched call.
+
+    ``batcher(item)`` blocks until ``batch_func`` has run on a batch that
+    includes ``item`` and returns that item's result. A batch is dispatched
+    once it holds ``max_batch_size`` items or ``max_wait`` seconds after its
+    first item arrived, whichever comes first, so a lone request waits at
+    most ``max_wait``. ``batch_func`` takes a list and returns a list of the
+    same length; if it raises, every caller in the batch gets the exception.
+
+    Batches run on a daemon thread started on first use in each process,
+    so an instance created before a fork keeps working in the children.
+    """
+
+    def __init__(self, batch_func, max_batch_size=64, max_wait=0.005):
+        self.batch_func = batch_func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self._queue,), name='micro-batcher', daemon=True).start()
+            return self._queue
+
+    def __call__(self, item):
+        pending = _Pending(item)
+        self._ensure_worker().put(pending)
+        pending.done.wait()
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _run(self, pending_queue):
+        while True:
+            batch = [pending_queue.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(pending_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        try:
+            results = self.batch_func([pending.item for pending in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"batch function returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for pending in batch:
+                pending.error = e
+                pending.done.set()
+            return
+        self.batches += 1
+        self.items += len(batch)
+        for pending, result in zip(batch, results):
+            pending.result = result
+            pending.done.set()
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'items': self.items,
+            'mean_batch_size': self.items / self.batches if self.batches else 0.0
+        }
@@ -1,9 +1,15 @@
 from .compliance_model import ComplianceModel
 from .complaint_classifier import ComplaintClassifier
 from .similarity_model import SimilarityModel
+from .vector_index import VectorIndex
+from .online_vectorizer import OnlineTfidfVectorizer
+from .model_search import ModelSearch
 
 __all__ = [
     'ComplianceModel',
     'ComplaintClassifier',
-    'SimilarityModel'
+    'SimilarityModel',
+    'VectorIndex',
+    'OnlineTfidfVectorizer',
+    'ModelSearch'
 ]
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""Versioned single-directory model bundles.
+
+A bundle is a directory holding:
+
+* ``manifest.json``: format version, model kind, library versions and the
+  SHA-256 of every other file;
+* ``model.pkl``: the model object graph, pickled without its arrays;
+* ``arrays.npys``: every numeric array of at least ``ARRAY_MIN_BYTES``
+  found while pickling, including those inside sparse matrices and tree
+  nodes, written back to back as 64-byte aligned .npy records. The pickle
+  refers to them by offset, so loading maps the file once and builds each
+  array as a view on it instead of opening hundreds of files.
+
+Unpickling only resolves the (module, name) pairs in ``ALLOWED_CLASSES``:
+the estimators, transformers and numpy helpers the models of this package
+are made of. No other callable, builtins included, can be reached, so a
+bundle cannot run arbitrary code; a model using another class must be
+added there. The checksums in the manifest only detect corruption (a
+truncated copy, a bad disk): they sit next to the files they cover, so
+anyone able to rewrite a bundle can rewrite them too. They are not a
+defence against tampering.
+"""
+import bisect
+import hashlib
+import io
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from collections.abc import Mapping
+import numpy as np
+
+ARTIFACT_FORMAT_VERSION = 1
+ARRAY_MIN_BYTES = 1024
+MANIFEST_NAME = 'manifest.json'
+MODEL_NAME = 'model.pkl'
+ARRAYS_NAME = 'arrays.npys'
+_ALIGNMENT = 64
+
+_NUMPY_CORE_MODULES = ('numpy.core', 'numpy._core')
+
+ALLOWED_CLASSES = frozenset(
+    # numpy array, dtype, scalar and RandomState reconstruction (numpy 1.x and 2.x module names)
+    [(f"{core}.multiarray", name) for core in _NUMPY_CORE_MODULES for name in ('_reconstruct', 'scalar')]
+    + [(f"{core}.numeric", '_frombuffer') for core in _NUMPY_CORE_MODULES]
+    + [('numpy', name) for name in ('ndarray', 'dtype', 'bool_', 'int8', 'int16', 'int32', 'int64', 'uint8',
+                                    'uint16', 'uint32', 'uint64', 'float32', 'float64', 'str_')]
+    + [('numpy.random._pickle', '__randomstate_ctor'), ('numpy.random._pickle', '__bit_generator_ctor'),
+       ('scipy.sparse._csr', 'csr_matrix'), ('scipy.sparse._csc', 'csc_matrix')]
+    # Estimators of ComplianceModel and ComplaintClassifier and their fitted parts
+    + [
+        ('sklearn.ensemble._forest', 'RandomForestClassifier'),
+        ('sklearn.ensemble._gb', 'GradientBoostingClassifier'),
+        ('sklearn.tree._classes', 'DecisionTreeClassifier'),
+        ('sklearn.tree._classes', 'DecisionTreeRegressor'),
+        ('sklearn.tree._tree', 'Tree'),
+        ('sklearn.dummy', 'DummyClassifier'),
+        ('sklearn.svm._classes', 'SVC'),
+        ('sklearn.naive_bayes', 'MultinomialNB'),
+        ('sklearn.linear_model._stochastic_gradient', 'SGDClassifier'),
+        ('sklearn.linear_model._logistic', 'LogisticRegression'),
+        ('sklearn.multiclass', 'OneVsRestClassifier'),
+        ('sklearn.multioutput', 'MultiOutputClassifier'),
+        ('sklearn._loss.loss', 'HalfBinomialLoss'),
+        ('sklearn._loss.loss', 'HalfMultinomialLoss'),
+        ('sklearn._loss.link', 'Interval'),
+        ('sklearn._loss.link', 'LogitLink'),
+        ('sklearn._loss.link', 'MultinomialLogit'),
+    ]
+    # Cython extension types; those holding state pickle through a __pyx_unpickle_<Name> reconstructor
+    + [('sklearn._loss._loss', f"{prefix}{name}") for name in ('CyHalfBinomialLoss', 'CyHalfMultinomialLoss')
+       for prefix in ('', '__pyx_unpickle_')]
+    # FeatureEngineer and vectorizer state
+    + [
+        ('sklearn.feature_extraction.text', 'CountVectorizer'),
+        ('sklearn.feature_extraction.text', 'HashingVectorizer'),
+        ('sklearn.feature_extraction.text', 'TfidfTransformer'),
+        ('sklearn.feature_extraction.text', 'TfidfVectorizer'),
+        ('sklearn.decomposition._truncated_svd', 'TruncatedSVD'),
+        ('sklearn.preprocessing._data', 'StandardScaler'),
+        ('sklearn.preprocessing._label', 'LabelBinarizer'),
+        ('sklearn.preprocessing._label', 'LabelEncoder'),
+        ('sklearn.preprocessing._label', 'MultiLabelBinarizer'),
+        ('src.models.artifact', 'SortedVocabulary'),
+    ]
+)
+
+# Compiled sklearn modules that pickle their classes under a short name
+_MODULE_ALIASES = {'_loss': 'sklearn._loss._loss'}
+
+
+class ArtifactError(ValueError):
+    pass
+
+
+class SortedVocabulary(Mapping):
+    """Read-only term -> column mapping backed by a sorted array of terms.
+
+    A drop-in for a fitted vectorizer's ``vocabulary_`` dict: the terms and
+    columns live in two numpy arrays that can be memory-mapped, and lookups
+    are binary searches instead of hashing into a large dict.
+    """
+
+    def __init__(self, vocabulary):
+        terms = sorted(vocabulary)
+        self.terms = np.array(terms, dtype=str) if terms else np.array([], dtype='<U1')
+        self.columns = np.array([vocabulary[term] for term in terms], dtype=np.int64)
+        self._search = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_search'] = None
+        return state
+
+    def __getitem__(self, term):
+        # Comparing numpy string scalars is slow, so the binary search runs
+        # over plain lists built on first lookup (still no hash table)
+        if self._search is None:
+            self._search = (self.terms.tolist(), self.columns.tolist())
+        terms, columns = self._search
+        index = bisect.bisect_left(terms, term)
+        if index < len(terms) and terms[index] == term:
+            return columns[index]
+        raise KeyError(term)
+
+    def __iter__(self):
+        return (str(term) for term in self.terms)
+
+    def __len__(self):
+        return len(self.terms)
+
+
+class _BundlePickler(pickle.Pickler):
+    def __init__(self, file, arrays_file):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays_file = arrays_file
+
+    def persistent_id(self, obj):
+        # np.memmap too, so a loaded bundle can be saved again
+        if type(obj) not in (np.ndarray, np.memmap) or obj.dtype.hasobject or obj.nbytes < ARRAY_MIN_BYTES:
+            return None
+        offset = self.arrays_file.tell()
+        np.lib.format.write_array(self.arrays_file, np.asarray(obj), allow_pickle=False)
+        padding = -self.arrays_file.tell() % _ALIGNMENT
+        self.arrays_file.write(b'\0' * padding)
+        return ('array', offset)
+
+
+class _BundleUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays_path, mmap):
+        super().__init__(file)
+        self.arrays_path = arrays_path
+        self.mmap = mmap
+        self._arrays_file = None
+        self._buffer = None
+
+    def persistent_load(self, pid):
+        if not (isinstance(pid, tuple) and len(pid) == 2 and pid[0] == 'array' and isinstance(pid[1], int)):
+            raise ArtifactError(f"Invalid array reference {pid!r}")
+        if self._buffer is None:
+            self._arrays_file = open(self.arrays_path, 'rb')
+            if self.mmap:
+                self._buffer = np.memmap(self.arrays_path, dtype=np.uint8, mode='r')
+            else:
+                self._buffer = np.frombuffer(self._arrays_file.read(), dtype=np.uint8)
+
+        f = self._arrays_file
+        f.seek(pid[1])
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        if dtype.hasobject:
+            raise ArtifactError("Bundle arrays may not hold Python objects")
+        array = np.ndarray(shape, dtype=dtype, buffer=self._buffer, offset=f.tell(),
+                           order='F' if fortran_order else 'C')
+        if not self.mmap:
+            array = array.copy()
+        return array
+
+    def close(self):
+        if self._arrays_file is not None:
+            self._arrays_file.close()
+
+    def find_class(self, module, name):
+        module = _MODULE_ALIASES.get(module, module)
+        if (module, name) not in ALLOWED_CLASSES:
+            raise ArtifactError(f"Bundle references disallowed class {module}.{name}")
+        return super().find_class(module, name)
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_bundle(path):
+    return bool(path) and os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def save_bundle(path, state, kind):
+    """Write ``state`` (any picklable object) as a bundle directory at ``path``.
+
+    The bundle is assembled next to ``path`` and swapped in at the end, so
+    a reader never sees a half-written one.
+    """
+    import sklearn
+    import scipy
+
+    path = os.path.abspath(path)
+    parent = os.path.dirname(path)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix='.bundle-', dir=parent)
+    try:
+        with open(os.path.join(staging, MODEL_NAME), 'wb') as f, \
+                open(os.path.join(staging, ARRAYS_NAME), 'wb') as arrays_file:
+            _BundlePickler(f, arrays_file).dump(state)
+
+        files = [MODEL_NAME, ARRAYS_NAME]
+        manifest = {
+            'format_version': ARTIFACT_FORMAT_VERSION,
+            'kind': kind,
+            'versions': {'numpy': np.__version__, 'scipy': scipy.__version__, 'sklearn': sklearn.__version__},
+            'files': {name: _sha256(os.path.join(staging, name)) for name in files}
+        }
+        with open(os.path.join(staging, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+
+        if os.path.exists(path):
+            retired = tempfile.mkdtemp(prefix='.retired-', dir=parent)
+            os.replace(path, os.path.join(retired, 'bundle'))
+            os.replace(staging, path)
+            shutil.rmtree(retired)
+        else:
+            os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_manifest(path):
+    try:
+        with open(os.path.join(path, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ArtifactError(f"Cannot read bundle manifest in {path}: {e}")
+    if manifest.get('format_version') != ARTIFACT_FORMAT_VERSION:
+        raise ArtifactError(f"Unsupported bundle format {manifest.get('format_version')!r} in {path}")
+    return manifest
+
+
+def load_bundle(path, kind, mmap=True, verify=True):
+    """Load the object saved by ``save_bundle``; arrays are memory-mapped read-only unless ``mmap`` is False."""
+    manifest = read_manifest(path)
+    if manifest.get('kind') != kind:
+        raise ArtifactError(f"Bundle in {path} holds a {manifest.get('kind')!r}, expected {kind!r}")
+    if verify:
+        for name, expected in manifest['files'].items():
+            file_path = os.path.join(path, name)
+            if not os.path.isfile(file_path) or _sha256(file_path) != expected:
+                raise ArtifactError(f"Checksum mismatch for {name} in {path}")
+
+    with open(os.path.join(path, MODEL_NAME), 'rb') as f:
+        data = f.read()
+    unpickler = _BundleUnpickler(io.BytesIO(data), os.path.join(path, ARRAYS_NAME), mmap)
+    try:
+        return unpickler.load()
+    finally:
+        unpickler.close()
@@ -1,15 +1,49 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+import copy
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.multiclass import OneVsRestClassifier
+from sklearn.multioutput import MultiOutputClassifier
 from sklearn.preprocessing import MultiLabelBinarizer
 import joblib
+from .artifact import SortedVocabulary, save_bundle, load_bundle
+
+BUNDLE_KIND = 'complaint_classifier'
+HASHING_FEATURES = 2 ** 18
 
 class ComplaintClassifier:
-    def __init__(self):
+    """Multi-label category and single-label severity classifiers over shared TF-IDF features.
+    
+    ``model_type='linear'`` swaps both forests for logistic regressions: a
+    few KB of coefficients and a sparse dot product per prediction instead
+    of walking hundreds of trees, for the fast inference mode.
+    
+    ``model_type='online'`` trains incrementally: features come from a
+    stateless HashingVectorizer (no vocabulary to rebuild) and both
+    classifiers are SGD logistic regressions updated by ``partial_fit``,
+    so new complaints cost time in proportion to their number rather than
+    to the whole history.
+    """
+    
+    def __init__(self, model_type='random_forest'):
+        self.model_type = model_type
+        # Rows already trained on, per source, for resuming train_incremental
+        self.trained_rows = {}
+        if model_type == 'online':
+            self.tfidf = HashingVectorizer(n_features=HASHING_FEATURES, stop_words='english', alternate_sign=False)
+            self.classifier = MultiOutputClassifier(SGDClassifier(loss='log_loss', random_state=42))
+            self.severity_classifier = SGDClassifier(loss='log_loss', random_state=42)
+            self.label_binarizer = MultiLabelBinarizer()
+            return
         self.tfidf = TfidfVectorizer(max_features=1000, stop_words='english')
-        self.classifier = OneVsRestClassifier(RandomForestClassifier(n_estimators=100, random_state=42))
+        if model_type == 'linear':
+            self.classifier = OneVsRestClassifier(LogisticRegression(max_iter=1000))
+            self.severity_classifier = LogisticRegression(max_iter=1000)
+        else:
+            self.classifier = OneVsRestClassifier(RandomForestClassifier(n_estimators=100, random_state=42))
+            self.severity_classifier = RandomForestClassifier(n_estimators=50, random_state=42)
         self.label_binarizer = MultiLabelBinarizer()
-        self.severity_classifier = RandomForestClassifier(n_estimators=50, random_state=42)
         
     def prepare_complaint_features(self, complaints_text):
         tfidf_features = self.tfidf.fit_transform(complaints_text)
@@ -22,6 +56,72 @@ class ComplaintClassifier:
     def train_severity_classifier(self, X_train, severity_labels):
         self.severity_classifier.fit(X_train, severity_labels)
     
+    def partial_fit(self, complaints_text, categories, severities, category_classes=None, severity_classes=None):
+        """Update an ``'online'`` model with one batch of labelled complaints.
+        
+        The first call must name every category and severity the model
+        will ever see; later batches with other labels raise ValueError,
+        as adding a class needs a full retrain.
+        """
+        if self.model_type != 'online':
+            raise ValueError(f"partial_fit needs model_type='online', not {self.model_type!r}")
+        first_call = not hasattr(self.label_binarizer, 'classes_')
+        if first_call:
+            if category_classes is None or severity_classes is None:
+                raise ValueError("category_classes and severity_classes are required on the first partial_fit")
+            self.label_binarizer.fit([list(category_classes)])
+            severity_classes = np.asarray(sorted(severity_classes))
+        
+        categories = [[labels] if isinstance(labels, str) else list(labels) for labels in categories]
+        unknown = {label for labels in categories for label in labels} - set(self.label_binarizer.classes_)
+        if not first_call:
+            severity_classes = self.severity_classifier.classes_
+        unknown |= set(severities) - set(severity_classes)
+        if unknown:
+            raise ValueError(f"Labels not seen on the first partial_fit: {sorted(unknown)}")
+        
+        X = self.tfidf.transform(complaints_text)
+        Y = self.label_binarizer.transform(categories)
+        if first_call:
+            self.classifier.partial_fit(X, Y, classes=[np.array([0, 1])] * Y.shape[1])
+            self.severity_classifier.partial_fit(X, severities, classes=severity_classes)
+        else:
+            self.classifier.partial_fit(X, Y)
+            self.severity_classifier.partial_fit(X, severities)
+        return self
+    
+    def train_incremental(self, chunks, source=None, checkpoint_path=None, checkpoint_every=10,
+                          category_classes=None, severity_classes=None):
+        """partial_fit over complaint DataFrames, e.g. DataLoader.iter_complaints_data.
+        
+        Rows already trained from ``source`` (a key such as a file hash,
+        counted in ``trained_rows``)
+        are skipped, so rerunning after an interruption resumes from the
+        last checkpoint and rerunning a finished source is a no-op. A bundle
+        is saved to ``checkpoint_path`` every ``checkpoint_every`` chunks and
+        at the end. Returns the number of rows trained by this call.
+        """
+        done = self.trained_rows.get(source, 0) if source is not None else 0
+        position = trained = pending = 0
+        for chunk in chunks:
+            skip = min(max(done - position, 0), len(chunk))
+            position += len(chunk)
+            chunk = chunk.iloc[skip:]
+            if chunk.empty:
+                continue
+            self.partial_fit(chunk['description'].fillna('').astype(str), chunk['category'].astype(str),
+                             chunk['severity'].astype(str), category_classes, severity_classes)
+            trained += len(chunk)
+            if source is not None:
+                self.trained_rows[source] = position
+            pending += 1
+            if checkpoint_path and pending >= checkpoint_every:
+                self.save_bundle(checkpoint_path)
+                pending = 0
+        if checkpoint_path and pending:
+            self.save_bundle(checkpoint_path)
+        return trained
+    
     def predict_categories(self, X):
         predictions = self.classifier.predict(X)
         return self.label_binarizer.inverse_transform(predictions)
@@ -30,13 +130,20 @@ class ComplaintClassifier:
         return self.severity_classifier.predict(X)
     
     def predict_all(self, complaint_text):
-        features = self.tfidf.transform([complaint_text])
+        return self.predict_batch([complaint_text])[0]
+    
+    def predict_batch(self, complaint_texts):
+        """predict_all for many texts with one vectorizer call and one pass per model.
+        
+        Returns a ``(categories, severity)`` pair per text, in order.
+        """
+        complaint_texts = list(complaint_texts)
+        if not complaint_texts:
+            return []
+        features = self.tfidf.transform(complaint_texts)
         categories = self.predict_categories(features)
         severity = self.predict_severity(features)
-        
-        if categories:
-            return categories[0], severity[0]
-        return [], 'medium'
+        return list(zip(categories, severity))
     
     def save_models(self, base_path):
         joblib.dump(self.tfidf, f"{base_path}_tfidf.pkl")
@@ -48,4 +155,29 @@ class ComplaintClassifier:
         self.tfidf = joblib.load(f"{base_path}_tfidf.pkl")
         self.classifier = joblib.load(f"{base_path}_classifier.pkl")
         self.label_binarizer = joblib.load(f"{base_path}_label_binarizer.pkl")
-        self.severity_classifier = joblib.load(f"{base_path}_severity_classifier.pkl")
\ No newline at end of file
+        self.severity_classifier = joblib.load(f"{base_path}_severity_classifier.pkl")
+    
+    def save_bundle(self, path):
+        """Save all four models as one versioned bundle directory (see models.artifact)."""
+        tfidf = self.tfidf
+        if hasattr(tfidf, 'vocabulary_'):
+            tfidf = copy.copy(tfidf)
+            tfidf.vocabulary_ = SortedVocabulary(tfidf.vocabulary_)
+        return save_bundle(path, {
+            'model_type': self.model_type,
+            'trained_rows': self.trained_rows,
+            'tfidf': tfidf,
+            'classifier': self.classifier,
+            'label_binarizer': self.label_binarizer,
+            'severity_classifier': self.severity_classifier
+        }, BUNDLE_KIND)
+    
+    def load_bundle(self, path, mmap=True):
+        state = load_bundle(path, BUNDLE_KIND, mmap=mmap)
+        self.model_type = state['model_type']
+        self.trained_rows = state.get('trained_rows', {})
+        self.tfidf = state['tfidf']
+        self.classifier = state['classifier']
+        self.label_binarizer = state['label_binarizer']
+        self.severity_classifier = state['severity_classifier']
+        return self
\ No newline at end of file
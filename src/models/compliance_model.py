@@ -1,9 +1,17 @@
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.linear_model import SGDClassifier
 from sklearn.svm import SVC
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.model_selection import cross_val_score, GridSearchCV
+from sklearn.base import clone
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 import joblib
+from .artifact import save_bundle, load_bundle
+from .model_search import ModelSearch, _is_text
+
+BUNDLE_KIND = 'compliance_model'
+
+# libsvm's predict routines take these as writable buffers, though they never write them
+_LIBSVM_WRITABLE_ARRAYS = ('dual_coef_', '_dual_coef_', 'intercept_', '_intercept_', '_probA', '_probB')
 
 class ComplianceModel:
     def __init__(self, model_type='random_forest'):
@@ -12,12 +20,27 @@ class ComplianceModel:
             'random_forest': RandomForestClassifier(n_estimators=100, random_state=42),
             'gradient_boosting': GradientBoostingClassifier(n_estimators=100, random_state=42),
             'svm': SVC(probability=True, random_state=42),
-            'naive_bayes': MultinomialNB()
+            'naive_bayes': MultinomialNB(),
+            # Both support partial_fit
+            'sgd': SGDClassifier(loss='log_loss', random_state=42)
         }
         self.model = self.models.get(model_type, RandomForestClassifier())
         self.feature_importance = None
+        # Fitted by train when it is given raw policy texts
+        self.feature_engineer = None
         
     def train(self, X_train, y_train):
+        """Fit on feature rows, or on raw policy texts through a FeatureEngineer.
+        
+        Texts get the TF-IDF + LSA features ModelSearch uses; the fitted
+        FeatureEngineer is kept so predict accepts texts as well.
+        """
+        if _is_text(X_train):
+            from ..feature_engineer import FeatureEngineer
+            self.feature_engineer = FeatureEngineer(max_features=1000, n_components=50, random_state=0)
+            X_train = self.feature_engineer.extract_text_features(X_train)
+        else:
+            self.feature_engineer = None
         self.model.fit(X_train, y_train)
         
         if hasattr(self.model, 'feature_importances_'):
@@ -25,11 +48,30 @@ class ComplianceModel:
         
         return self
     
+    def partial_fit(self, X_batch, y_batch, classes=None):
+        """Update the model with one more batch instead of refitting.
+        
+        Only 'sgd' and 'naive_bayes' support this; ``classes`` must list
+        every label on the first call.
+        """
+        if not hasattr(self.model, 'partial_fit'):
+            raise ValueError(f"{self.model_type} does not support incremental training")
+        if classes is not None and not hasattr(self.model, 'classes_'):
+            self.model.partial_fit(X_batch, y_batch, classes=classes)
+        else:
+            self.model.partial_fit(X_batch, y_batch)
+        return self
+    
+    def _features(self, X):
+        if self.feature_engineer is not None and _is_text(X):
+            return self.feature_engineer.transform_text_features(X)
+        return X
+    
     def predict(self, X):
-        return self.model.predict(X)
+        return self.model.predict(self._features(X))
     
     def predict_proba(self, X):
-        return self.model.predict_proba(X)
+        return self.model.predict_proba(self._features(X))
     
     def evaluate(self, X_test, y_test):
         y_pred = self.predict(X_test)
@@ -43,19 +85,57 @@ class ComplianceModel:
         
         return metrics
     
-    def cross_validate(self, X, y, cv=5):
-        scores = cross_val_score(self.model, X, y, cv=cv, scoring='accuracy')
-        return scores.mean(), scores.std()
+    def cross_validate(self, X, y, cv=5, n_jobs=1):
+        """Mean and std of the accuracy of the current parameters over ``cv`` folds."""
+        search = ModelSearch(self.model_type, cv=cv, n_jobs=n_jobs, estimator=clone(self.model))
+        return search.cross_validate(X, y)
     
-    def tune_hyperparameters(self, X_train, y_train, param_grid):
-        grid_search = GridSearchCV(self.model, param_grid, cv=5, scoring='accuracy')
-        grid_search.fit(X_train, y_train)
-        self.model = grid_search.best_estimator_
-        return grid_search.best_params_
+    def tune_hyperparameters(self, X_train, y_train, param_grid, strategy='grid', n_jobs=1, cache_dir=None, **search_options):
+        """Search ``param_grid`` with ModelSearch and refit the best candidate on all of ``X_train``.
+        
+        Returns the best parameters. ``strategy`` may be 'grid', 'random' or
+        'halving'; with ``cache_dir`` an interrupted search resumes. The
+        full result, with per-trial wall times, is kept in ``search_results``.
+        Raw policy texts are refitted through ``train``, on the same
+        features the search scored.
+        """
+        search = ModelSearch(self.model_type, cv=5, scoring='accuracy', n_jobs=n_jobs, cache_dir=cache_dir,
+                             estimator=clone(self.model))
+        self.search_results = search.search(X_train, y_train, param_grid, strategy=strategy, **search_options)
+        if self.search_results['best_params'] is None:
+            raise ValueError("Every hyperparameter candidate failed")
+        self.model = clone(self.model).set_params(**self.search_results['best_params'])
+        self.train(X_train, y_train)
+        return self.search_results['best_params']
     
     def save_model(self, filepath):
         joblib.dump(self.model, filepath)
     
     def load_model(self, filepath):
         self.model = joblib.load(filepath)
+        return self
+    
+    def save_bundle(self, path):
+        """Save the fitted model as a versioned bundle directory (see models.artifact)."""
+        return save_bundle(path, {
+            'model_type': self.model_type,
+            'model': self.model,
+            'feature_importance': self.feature_importance,
+            'feature_engineer': self.feature_engineer.get_fitted_state() if self.feature_engineer is not None else None
+        }, BUNDLE_KIND)
+    
+    def load_bundle(self, path, mmap=True):
+        state = load_bundle(path, BUNDLE_KIND, mmap=mmap)
+        self.model_type = state['model_type']
+        self.model = state['model']
+        if isinstance(self.model, SVC):
+            for name in _LIBSVM_WRITABLE_ARRAYS:
+                value = vars(self.model).get(name)
+                if value is not None and not value.flags.writeable:
+                    setattr(self.model, name, value.copy())
+        self.feature_importance = state['feature_importance']
+        self.feature_engineer = None
+        if state.get('feature_engineer') is not None:
+            from ..feature_engineer import FeatureEngineer
+            self.feature_engineer = FeatureEngineer().set_fitted_state(state['feature_engineer'])
         return self
\ No newline at end of file
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+STRATEGIES = ('grid', 'random', 'halving')
+
+
+def _fingerprint(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            digest.update(str((part.dtype.str, part.shape)).encode())
+            digest.update(np.ascontiguousarray(part).tobytes())
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=repr).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+def _score(trial):
+    return trial['mean_score'] if trial['status'] == 'ok' else -math.inf
+
+
+def _is_text(X):
+    if len(X) == 0:
+        return False
+    # By position: pandas labels need not start at 0, and a DataFrame's [0] is a column
+    first = X.iloc[0] if hasattr(X, 'iloc') else X[0]
+    return isinstance(first, str)
+
+
+def _build_fold(fold_dir, fold, X, y, train_index, test_index, max_features, n_components):
+    # Text is turned into TF-IDF + LSA features fitted on the training part
+    # only, exactly once per fold; every candidate then reads the result
+    if _is_text(X):
+        from ..feature_engineer import FeatureEngineer
+        engineer = FeatureEngineer(max_features=max_features, n_components=n_components, cache_size=0, random_state=0)
+        texts = np.asarray(X, dtype=object)
+        X_train = engineer.extract_text_features(texts[train_index])
+        X_test = engineer.transform_text_features(texts[test_index])
+    else:
+        X_train, X_test = X[train_index], X[test_index]
+    arrays = {'X_train': X_train, 'X_test': X_test, 'y_train': y[train_index], 'y_test': y[test_index]}
+    for name, array in arrays.items():
+        # Written under a temporary name so an interrupted run never leaves a partial fold
+        path = os.path.join(fold_dir, f"{name}_{fold}.npy")
+        np.save(path + '.tmp.npy', np.asarray(array))
+        os.replace(path + '.tmp.npy', path)
+    return fold
+
+
+def _load_fold(fold_dir, fold):
+    return [np.load(os.path.join(fold_dir, f"{name}_{fold}.npy"), mmap_mode='r', allow_pickle=False)
+            for name in ('X_train', 'y_train', 'X_test', 'y_test')]
+
+
+def _run_trial(fold_dir, n_folds, estimator, params, resource, scoring, random_state):
+    from sklearn.base import clone
+    from sklearn.metrics import get_scorer
+
+    start = time.perf_counter()
+    scorer = get_scorer(scoring)
+    scores = []
+    fit_time = 0.0
+    for fold in range(n_folds):
+        X_train, y_train, X_test, y_test = _load_fold(fold_dir, fold)
+        if resource is not None and resource < len(y_train):
+            subset = np.sort(np.random.RandomState(random_state + fold).permutation(len(y_train))[:resource])
+            X_train, y_train = X_train[subset], y_train[subset]
+        candidate = clone(estimator).set_params(**params)
+        fit_start = time.perf_counter()
+        candidate.fit(np.asarray(X_train), np.asarray(y_train))
+        fit_time += time.perf_counter() - fit_start
+        scores.append(float(scorer(candidate, np.asarray(X_test), np.asarray(y_test))))
+    return {
+        'mean_score': float(np.mean(scores)),
+        'std_score': float(np.std(scores)),
+        'scores': scores,
+        'fit_time': fit_time,
+        'wall_time': time.perf_counter() - start
+    }
+
+
+class ModelSearch:
+    """Cross-validated hyperparameter search for a ComplianceModel type.
+
+    Candidates run in ``n_jobs`` worker processes, one trial (a candidate
+    on every fold) per task. ``X`` may be feature rows or raw policy texts;
+    texts get FeatureEngineer TF-IDF + LSA features fitted per training fold,
+    computed once and cached as .npy files under ``cache_dir`` for every
+    candidate to memory-map. Finished trials are recorded in
+    ``cache_dir/trials.db``, so rerunning an interrupted search with the
+    same data and cache_dir only runs the missing trials. Without a
+    ``cache_dir`` a temporary directory is used and nothing is resumable.
+    Candidates are clones of ``estimator`` with their params set; it
+    defaults to the unfitted ComplianceModel estimator of ``model_type``.
+    """
+
+    def __init__(self, model_type='random_forest', cv=5, scoring='accuracy', n_jobs=1, cache_dir=None,
+                 max_features=1000, n_components=50, random_state=42, estimator=None):
+        if estimator is None:
+            from .compliance_model import ComplianceModel
+            estimator = ComplianceModel(model_type).model
+        self.model_type = model_type
+        self.estimator = estimator
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.cache_dir = cache_dir
+        self.max_features = max_features
+        self.n_components = n_components
+        self.random_state = random_state
+
+    def search(self, X, y, param_grid, strategy='grid', n_iter=10, factor=3, min_resources=None):
+        """Evaluate candidates and return the best one with every trial.
+
+        ``strategy`` is 'grid' (every combination of ``param_grid``),
+        'random' (``n_iter`` samples, ``param_grid`` values may be scipy
+        distributions) or 'halving' (successive halving: all candidates on
+        ``min_resources`` training rows per fold, the best 1/``factor`` kept
+        and re-run on ``factor`` times more rows until the full folds). The
+        result holds ``best_params``, ``best_score`` and ``trials``, each
+        trial with its params, resource, scores, fit and wall time in seconds.
+        Ties go to the earlier candidate, as in GridSearchCV.
+        """
+        from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown search strategy {strategy!r}, expected one of {STRATEGIES}")
+        if strategy == 'random':
+            candidates = list(ParameterSampler(param_grid, n_iter, random_state=self.random_state))
+        else:
+            candidates = list(ParameterGrid(param_grid))
+
+        with self._workspace(X, y) as workspace:
+            if strategy != 'halving':
+                trials = workspace.run([(params, None) for params in candidates])
+            else:
+                trials = []
+                n_train = workspace.min_train_size
+                n_rungs = max(1, math.ceil(math.log(len(candidates), factor)) + 1) if len(candidates) > 1 else 1
+                resource = min_resources or max(n_train // factor ** (n_rungs - 1), 2 * self.cv)
+                remaining = candidates
+                for rung in range(n_rungs):
+                    last = rung == n_rungs - 1 or len(remaining) == 1
+                    rung_trials = workspace.run([(params, None if last else min(resource, n_train))
+                                                 for params in remaining])
+                    trials.extend(rung_trials)
+                    if last:
+                        break
+                    ranked = sorted(range(len(remaining)), key=lambda i: -_score(rung_trials[i]))
+                    remaining = [remaining[i] for i in sorted(ranked[:max(1, math.ceil(len(remaining) / factor))])]
+                    resource *= factor
+
+        final = [trial for trial in trials if trial['resource'] is None and trial['status'] == 'ok']
+        best = max(final, key=lambda trial: trial['mean_score'], default=None)
+        return {
+            'best_params': best['params'] if best else None,
+            'best_score': best['mean_score'] if best else None,
+            'trials': trials
+        }
+
+    def cross_validate(self, X, y, params=None):
+        """Mean and standard deviation of the score of one candidate."""
+        trial = self.search(X, y, {key: [value] for key, value in (params or {}).items()})['trials'][0]
+        if trial['status'] != 'ok':
+            raise ValueError(f"Cross-validation failed: {trial['error']}")
+        return trial['mean_score'], trial['std_score']
+
+    def _workspace(self, X, y):
+        return _SearchWorkspace(self, X, y)
+
+
+class _SearchWorkspace:
+    """The folds, trial store and process pool of one search call."""
+
+    def __init__(self, search, X, y):
+        self.search = search
+        self.X = list(X) if _is_text(X) else np.asarray(X)
+        self.y = np.asarray(y)
+        self.key = _fingerprint(self.X, self.y, search.model_type, search.cv, search.scoring,
+                                search.max_features, search.n_components)
+        self._temporary = None
+        self._executor = None
+        self._conn = None
+
+    def __enter__(self):
+        from sklearn.model_selection import StratifiedKFold
+
+        root = self.search.cache_dir
+        if root is None:
+            self._temporary = tempfile.TemporaryDirectory(prefix='model-search-')
+            root = self._temporary.name
+        self.fold_dir = os.path.join(root, f"folds-{self.key}")
+        os.makedirs(self.fold_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, 'trials.db'), timeout=30, isolation_level=None)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS trials (key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)'
+        )
+        if self.search.n_jobs > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self.search.n_jobs)
+
+        splits = list(StratifiedKFold(n_splits=self.search.cv).split(np.zeros(len(self.y)), self.y))
+        self.min_train_size = min(len(train_index) for train_index, _ in splits)
+        missing = [fold for fold in range(len(splits))
+                   if not os.path.exists(os.path.join(self.fold_dir, f"y_test_{fold}.npy"))]
+        args = [(self.fold_dir, fold, self.X, self.y, *splits[fold], self.search.max_features, self.search.n_components)
+                for fold in missing]
+        if self._executor is not None and len(args) > 1:
+            for future in as_completed([self._executor.submit(_build_fold, *arg) for arg in args]):
+                future.result()
+        else:
+            for arg in args:
+                _build_fold(*arg)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+        self._conn.close()
+        if self._temporary is not None:
+            self._temporary.cleanup()
+
+    def _trial_key(self, params, resource):
+        estimator = self.search.estimator
+        return _fingerprint(self.key, type(estimator).__name__, estimator.get_params(deep=False), params, resource,
+                            self.search.random_state)
+
+    def run(self, candidates):
+        """Trials for ``(params, resource)`` pairs in order, reusing recorded ones."""
+        trials = [None] * len(candidates)
+        pending = []
+        for index, (params, resource) in enumerate(candidates):
+            key = self._trial_key(params, resource)
+            row = self._conn.execute('SELECT result FROM trials WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                trials[index] = dict(json.loads(row[0]), params=params, resource=resource, resumed=True)
+            else:
+                pending.append((index, key, params, resource))
+
+        search = self.search
+        args = {index: (self.fold_dir, search.cv, search.estimator, params, resource, search.scoring, search.random_state)
+                for index, _, params, resource in pending}
+        if self._executor is not None and len(pending) > 1:
+            futures = {self._executor.submit(_run_trial, *args[index]): (index, key) for index, key, _, _ in pending}
+            outcomes = ((futures[future], future) for future in as_completed(futures))
+            for (index, key), future in outcomes:
+                self._record(trials, candidates, index, key, future.result)
+        else:
+            for index, key, _, _ in pending:
+                self._record(trials, candidates, index, key, lambda: _run_trial(*args[index]))
+        return trials
+
+    def _record(self, trials, candidates, index, key, compute):
+        params, resource = candidates[index]
+        try:
+            result = dict(compute(), status='ok', error=None)
+        except Exception as e:
+            # Reported in the results but not recorded, so a resumed search retries it
+            result = {'mean_score': None, 'std_score': None, 'scores': [], 'fit_time': 0.0, 'wall_time': 0.0,
+                      'status': 'error', 'error': str(e)}
+        else:
+            self._conn.execute('INSERT OR REPLACE INTO trials (key, result, created_at) VALUES (?, ?, ?)',
+                               (key, json.dumps(result), time.time()))
+        trials[index] = dict(result, params=params, resource=resource, resumed=False)
@@ -0,0 +1,65 @@
+import threading
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class OnlineTfidfVectorizer:
+    """TF-IDF over hashed features, with document frequencies learned online.
+
+    Needs no fit: terms are hashed into ``n_features`` columns and IDF is
+    computed from the documents seen so far via ``partial_fit`` (or
+    ``transform(..., update=True)``). Weights follow TfidfVectorizer's
+    defaults (raw counts, smoothed IDF, L2-normalised rows) and stay sparse.
+    """
+
+    def __init__(self, n_features=2 ** 18, stop_words='english'):
+        self.n_features = n_features
+        self.stop_words = stop_words
+        self.n_documents = 0
+        self.document_frequency = np.zeros(n_features, dtype=np.int64)
+        self._lock = threading.Lock()
+        self._init_hasher()
+
+    def _init_hasher(self):
+        self.hasher = HashingVectorizer(n_features=self.n_features, stop_words=self.stop_words,
+                                        alternate_sign=False, norm=None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_lock']
+        del state['hasher']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._init_hasher()
+
+    def partial_fit_counts(self, counts):
+        """Update document frequencies from the output of ``count``."""
+        # Each stored index in a CSR row is a distinct term of that document
+        with self._lock:
+            np.add.at(self.document_frequency, counts.indices, 1)
+            self.n_documents += counts.shape[0]
+
+    def partial_fit(self, texts):
+        self.partial_fit_counts(self.hasher.transform(texts))
+        return self
+
+    def count(self, texts):
+        """Hashed term counts; pass them to ``weight`` to get TF-IDF rows."""
+        return self.hasher.transform(texts).astype(np.float64)
+
+    def transform(self, texts, update=False):
+        return self.weight(self.count(texts), update=update)
+
+    def weight(self, counts, update=False):
+        counts = counts.copy()
+        if update:
+            self.partial_fit_counts(counts)
+        with self._lock:
+            n_documents = self.n_documents
+            document_frequency = self.document_frequency[counts.indices]
+        counts.data *= np.log((1 + n_documents) / (1 + document_frequency)) + 1
+        return normalize(counts, copy=False)
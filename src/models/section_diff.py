@@ -0,0 +1,135 @@
+import hashlib
+import zlib
+from difflib import SequenceMatcher
+import numpy as np
+from ..utils.metrics import stage
+
+# Section similarity bands used by UpdateTracker notifications
+MAJOR_REWRITE_THRESHOLD = 0.3
+SIGNIFICANT_CHANGE_THRESHOLD = 0.7
+
+_MIX_A = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_B = np.uint64(0x94D049BB133111EB)
+
+
+class SectionText:
+    """One section's content with its hash, tokens and MinHash signature computed lazily."""
+
+    def __init__(self, text, differ, tokens=None):
+        self.text = text
+        self._differ = differ
+        self._digest = None
+        self._tokens = tokens
+        self._signature = None
+
+    @property
+    def digest(self):
+        if self._digest is None:
+            self._digest = hashlib.md5(self.text.encode('utf-8')).digest()
+        return self._digest
+
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            self._tokens = self.text.split()
+        return self._tokens
+
+    @property
+    def signature(self):
+        if self._signature is None:
+            self._signature = self._differ.minhash(self.tokens)
+        return self._signature
+
+
+class SectionDiffer:
+    """Tiered similarity between two versions of a section.
+
+    Each tier is cheaper than the next and the first one that settles the
+    result wins:
+
+    1. identical content hashes;
+    2. the ``real_quick_ratio``/``quick_ratio`` upper bounds of a token-level
+       SequenceMatcher, accepted when they are already below ``low``;
+    3. the full token-level ``SequenceMatcher.ratio()``.
+
+    MinHash estimates of word-shingle Jaccard are used by ``match_sections``
+    to pair renamed or moved sections. They are not used to settle a band:
+    shingle overlap ignores section order, so reordered text would pass.
+    ``compare`` returns ``(similarity, method)``.
+    """
+
+    def __init__(self, low=MAJOR_REWRITE_THRESHOLD, num_perm=64, shingle_size=3, rename_threshold=0.5, seed=1):
+        self.low = low
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.rename_threshold = rename_threshold
+        self._seeds = np.random.default_rng(seed).integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def section(self, text, tokens=None):
+        return SectionText(text, self, tokens)
+
+    def minhash(self, tokens):
+        size = self.shingle_size
+        if len(tokens) <= size:
+            shingles = [' '.join(tokens)]
+        else:
+            shingles = [' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in set(shingles)), dtype=np.uint64)
+
+        with np.errstate(over='ignore'):
+            x = hashes[:, None] ^ self._seeds[None, :]
+            x = x ^ (x >> np.uint64(30))
+            x = x * _MIX_A
+            x = x ^ (x >> np.uint64(27))
+            x = x * _MIX_B
+            x = x ^ (x >> np.uint64(31))
+        return x.min(axis=0)
+
+    @staticmethod
+    def estimate_jaccard(signature_a, signature_b):
+        return float(np.mean(signature_a == signature_b))
+
+    def compare(self, old, new):
+        if old.digest == new.digest:
+            return 1.0, 'hash'
+        if not old.tokens or not new.tokens:
+            return 0.0, 'empty'
+
+        # Both quick ratios are upper bounds on ratio(), so below ``low`` the band is settled
+        with stage('section_diff.sequence_matcher'):
+            matcher = SequenceMatcher(None, old.tokens, new.tokens)
+            upper = matcher.real_quick_ratio()
+            if upper < self.low:
+                return upper, 'real_quick_ratio'
+            upper = matcher.quick_ratio()
+            if upper < self.low:
+                return upper, 'quick_ratio'
+            return matcher.ratio(), 'ratio'
+
+    def match_sections(self, removed, added):
+        """Pair removed with added sections whose content matches.
+
+        ``removed`` and ``added`` map section names to SectionText. Returns
+        ``[(old_name, new_name, estimated_jaccard)]``, best matches first.
+        """
+        candidates = []
+        for old_name, old in removed.items():
+            for new_name, new in added.items():
+                if old.digest == new.digest:
+                    score = 1.0
+                elif not old.tokens or not new.tokens:
+                    continue
+                else:
+                    score = self.estimate_jaccard(old.signature, new.signature)
+                if score >= self.rename_threshold:
+                    candidates.append((score, old_name, new_name))
+
+        pairs = []
+        used_old = set()
+        used_new = set()
+        for score, old_name, new_name in sorted(candidates, key=lambda item: item[0], reverse=True):
+            if old_name not in used_old and new_name not in used_new:
+                used_old.add(old_name)
+                used_new.add(new_name)
+                pairs.append((old_name, new_name, score))
+        return pairs
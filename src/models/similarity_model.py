@@ -1,90 +1,208 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import json
+import os
 import numpy as np
-from difflib import SequenceMatcher
+import joblib
+from .vector_index import VectorIndex
+from .section_diff import SectionDiffer
+from .online_vectorizer import OnlineTfidfVectorizer
+from ..parsed_policy import parse_policy
+
+# Change detection reads long lines that merely contain a colon as prose, not headings
+SECTION_HEADING_MAX_LENGTH = 100
 
 class SimilarityModel:
-    def __init__(self):
-        self.tfidf = TfidfVectorizer(stop_words='english')
+    """TF-IDF similarity between policies.
+    
+    The vectorizer is loaded from ``vectorizer_path`` when that artifact
+    exists (see fit_vectorizer_from_csv). Without one it falls back to an
+    OnlineTfidfVectorizer, so similarity works without any fit.
+    """
+    
+    def __init__(self, approximate=False, vectorizer_path=None, hashing_features=2 ** 18):
+        self.tfidf = None
         self.policy_vectors = None
         self.policy_texts = []
+        self.approximate = approximate
+        self.policy_index = None
+        # Incremented on every refit so callers holding vectors know to rebuild them
+        self.vectorizer_version = 0
+        self._vectorizer_key = object()
+        self.section_differ = SectionDiffer()
+        
+        if vectorizer_path and os.path.exists(vectorizer_path):
+            self.load_vectorizer(vectorizer_path)
+        else:
+            self.tfidf = OnlineTfidfVectorizer(n_features=hashing_features)
+    
+    @property
+    def is_online(self):
+        return isinstance(self.tfidf, OnlineTfidfVectorizer)
+        
+    def vectorize(self, texts, update_idf=False):
+        """Sparse L2-normalised rows; ``update_idf`` lets the online vectorizer learn from ``texts``."""
+        if self.is_online:
+            return self.tfidf.transform(texts, update=update_idf)
+        return self.tfidf.transform(texts)
+    
+    def _policy_counts(self, parsed):
+        # Hashed counts never change, so they are kept on the parse
+        return parsed.derived(('hashed_counts', self.tfidf.n_features),
+                              lambda: self.tfidf.count([parsed.text]))
+    
+    def observe_policies(self, *policies):
+        """Feed policies to the online IDF; a no-op for a fitted vectorizer."""
+        if self.is_online:
+            for policy in policies:
+                parsed = parse_policy(policy, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+                self.tfidf.partial_fit_counts(self._policy_counts(parsed))
+    
+    def vectorize_policy(self, policy):
+        """Vectorize a policy text or ParsedPolicy, reusing work cached on the parse."""
+        parsed = parse_policy(policy, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        if self.is_online:
+            return self.tfidf.weight(self._policy_counts(parsed))
+        return parsed.derived(('tfidf', self._vectorizer_key),
+                              lambda: self.tfidf.transform([parsed.text]))
+    
+    def fit_vectorizer(self, policy_texts):
+        self.tfidf = TfidfVectorizer(stop_words='english')
+        vectors = self.tfidf.fit_transform(policy_texts)
+        self._refitted()
+        return vectors
+    
+    def _refitted(self):
+        self.vectorizer_version += 1
+        # Identifies this fitted vocabulary in caches held outside the model
+        self._vectorizer_key = object()
+    
+    def fit_vectorizer_from_csv(self, csv_path, data_loader):
+        """Refit offline on the policy_text column of a policies database CSV."""
+        policies_df = data_loader.load_policies_database(csv_path)
+        return self.fit_vectorizer(policies_df['policy_text'].fillna('').astype(str).tolist())
+    
+    def save_vectorizer(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self.tfidf, path)
+    
+    def load_vectorizer(self, path):
+        self.tfidf = joblib.load(path)
+        self._refitted()
         
     def train(self, policy_texts):
-        self.policy_texts = policy_texts
-        self.policy_vectors = self.tfidf.fit_transform(policy_texts)
+        self.policy_texts = list(policy_texts)
+        self.policy_vectors = self.fit_vectorizer(self.policy_texts)
         
-    def find_similar_policies(self, new_policy, threshold=0.8, top_n=5):
-        new_vector = self.tfidf.transform([new_policy])
-        similarities = cosine_similarity(new_vector, self.policy_vectors)[0]
+        self.policy_index = VectorIndex(approximate=self.approximate)
+        self.policy_index.add(np.arange(len(self.policy_texts)), self.policy_vectors)
         
-        similar_indices = np.where(similarities >= threshold)[0]
-        similar_policies = []
+    def add_policy(self, policy_text):
+        """Index one more policy without refitting; returns its index."""
+        policy_index = len(self.policy_texts)
+        self.policy_texts.append(policy_text)
+        self.policy_index.add([policy_index], self.vectorize([policy_text]))
+        return policy_index
+    
+    def remove_policy(self, policy_index):
+        """Drop a policy from search results; other indices stay valid."""
+        return self.policy_index.remove([policy_index]) > 0
         
-        for idx in similar_indices[:top_n]:
-            similar_policies.append({
-                'index': idx,
-                'similarity': float(similarities[idx]),
-                'text': self.policy_texts[idx]
-            })
+    def find_similar_policies(self, new_policy, threshold=0.8, top_n=5):
+        matches = self.policy_index.search(self.vectorize([new_policy]), k=top_n, threshold=threshold)
         
-        return sorted(similar_policies, key=lambda x: x['similarity'], reverse=True)
+        return [{
+            'index': idx,
+            'similarity': similarity,
+            'text': self.policy_texts[idx]
+        } for idx, similarity in matches]
+    
+    def save_index(self, base_path):
+        joblib.dump(self.tfidf, f"{base_path}_tfidf.pkl")
+        self.policy_index.save(f"{base_path}_index")
+        with open(f"{base_path}_texts.json", 'w', encoding='utf-8') as f:
+            json.dump(self.policy_texts, f)
+    
+    def load_index(self, base_path, mmap=True):
+        self.tfidf = joblib.load(f"{base_path}_tfidf.pkl")
+        self.policy_index = VectorIndex.load(f"{base_path}_index", mmap=mmap)
+        self.approximate = self.policy_index.approximate
+        with open(f"{base_path}_texts.json", 'r', encoding='utf-8') as f:
+            self.policy_texts = json.load(f)
+        self.policy_vectors = None
+        self._refitted()
     
     def detect_changes(self, old_policy, new_policy):
-        old_sections = self._extract_sections(old_policy)
-        new_sections = self._extract_sections(new_policy)
+        old_parsed = parse_policy(old_policy, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        new_parsed = parse_policy(new_policy, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        old_sections = old_parsed.sections
+        new_sections = new_parsed.sections
+        differ = self.section_differ
         
-        changes = []
+        old_texts = {name: differ.section(content, old_parsed.section_tokens[name])
+                     for name, content in old_sections.items()}
+        new_texts = {name: differ.section(content, new_parsed.section_tokens[name])
+                     for name, content in new_sections.items()}
+        old_positions = {name: position for position, name in enumerate(old_sections)}
+        new_positions = {name: position for position, name in enumerate(new_sections)}
         
-        all_sections = set(list(old_sections.keys()) + list(new_sections.keys()))
+        removed = {name: text for name, text in old_texts.items() if name not in new_texts}
+        added = {name: text for name, text in new_texts.items() if name not in old_texts}
+        # A heading that changed but kept its content is a rename (same place) or a move
+        renamed = {}
+        for old_name, new_name, _ in differ.match_sections(removed, added):
+            renamed[old_name] = new_name
+        renamed_to = set(renamed.values())
         
-        for section_name in all_sections:
-            old_content = old_sections.get(section_name, "")
-            new_content = new_sections.get(section_name, "")
+        changes = []
+        
+        for section_name, old_text in old_texts.items():
+            new_name = renamed.get(section_name, section_name)
+            new_text = new_texts.get(new_name)
             
-            if old_content != new_content:
-                similarity = SequenceMatcher(None, old_content, new_content).ratio()
-                
-                if not old_content:
-                    change_type = "added"
-                elif not new_content:
-                    change_type = "removed"
-                else:
-                    change_type = "modified"
-                
+            if new_text is None:
+                change_type = "removed"
+                similarity = 0.0
+            elif new_name != section_name:
+                change_type = "renamed" if old_positions[section_name] == new_positions[new_name] else "moved"
+                similarity, _ = differ.compare(old_text, new_text)
+            elif old_text.text != new_text.text:
+                change_type = "modified"
+                similarity, _ = differ.compare(old_text, new_text)
+            else:
+                continue
+            
+            change = {
+                'section': new_name if new_text is not None else section_name,
+                'change_type': change_type,
+                'similarity': similarity,
+                'old_length': len(old_text.text),
+                'new_length': len(new_text.text) if new_text is not None else 0
+            }
+            if new_name != section_name:
+                change['old_section'] = section_name
+            changes.append(change)
+        
+        for section_name, new_text in new_texts.items():
+            if section_name not in old_texts and section_name not in renamed_to:
                 changes.append({
                     'section': section_name,
-                    'change_type': change_type,
-                    'similarity': similarity,
-                    'old_length': len(old_content),
-                    'new_length': len(new_content)
+                    'change_type': "added",
+                    'similarity': 0.0,
+                    'old_length': 0,
+                    'new_length': len(new_text.text)
                 })
         
         return changes
     
     def _extract_sections(self, text):
-        sections = {}
-        lines = text.split('\n')
-        current_section = "general"
-        section_content = []
-        
-        for line in lines:
-            line = line.strip()
-            if len(line) > 0:
-                if line.isupper() or (':' in line and len(line) < 100):
-                    if section_content:
-                        sections[current_section] = ' '.join(section_content)
-                    current_section = line.lower().replace(':', '').strip()
-                    section_content = []
-                else:
-                    section_content.append(line)
-        
-        if section_content:
-            sections[current_section] = ' '.join(section_content)
-        
-        return sections
+        return parse_policy(text, max_heading_length=SECTION_HEADING_MAX_LENGTH).sections
     
-    def calculate_overall_similarity(self, text1, text2):
-        vector1 = self.tfidf.transform([text1])
-        vector2 = self.tfidf.transform([text2])
-        similarity_matrix = cosine_similarity(vector1, vector2)
-        return similarity_matrix[0][0] if similarity_matrix.size > 0 else 0.0
\ No newline at end of file
+    def calculate_overall_similarity(self, text1, text2, update_idf=False):
+        if update_idf:
+            self.observe_policies(text1, text2)
+        vector1 = self.vectorize_policy(text1)
+        vector2 = self.vectorize_policy(text2)
+        # Rows are L2-normalised, so the sparse dot product is the cosine
+        return float(vector1.multiply(vector2).sum())
\ No newline at end of file
@@ -0,0 +1,231 @@
+import json
+import os
+import numpy as np
+from scipy import sparse
+
+_MIX_A = np.uint64(0x9E3779B97F4A7C15)
+_MIX_B = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_C = np.uint64(0x94D049BB133111EB)
+
+
+def _hyperplane_signs(feature_indices, n_planes, seed):
+    """Pseudo-random +/-1 hyperplane entries for the given feature columns.
+
+    Hashing (feature, plane) instead of storing a projection matrix keeps the
+    LSH mode independent of the vocabulary size.
+    """
+    with np.errstate(over='ignore'):
+        x = feature_indices.astype(np.uint64)[:, None] * _MIX_A
+        x = x ^ (np.arange(n_planes, dtype=np.uint64)[None, :] * _MIX_B + np.uint64(seed))
+        x ^= x >> np.uint64(31)
+        x *= _MIX_C
+        x ^= x >> np.uint64(29)
+    return np.where(x >> np.uint64(63), 1.0, -1.0)
+
+
+class VectorIndex:
+    """Cosine nearest-neighbour index over sparse, L2-normalised row vectors.
+
+    Exact mode scores every live row with one sparse product and picks the
+    top k with argpartition. With ``approximate=True`` rows are also hashed
+    into ``n_tables`` random-projection LSH tables of ``n_bits`` each and only
+    rows sharing a bucket with the query are scored. Rows can be added and
+    removed without rebuilding; additions are buffered and merged into the
+    main matrix once they grow past ``merge_fraction`` of it.
+    """
+
+    def __init__(self, approximate=False, n_tables=8, n_bits=12, seed=42, merge_fraction=0.1):
+        self.approximate = approximate
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.seed = seed
+        self.merge_fraction = merge_fraction
+
+        self.dim = None
+        self._matrix = None
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._codes = np.zeros((0, n_tables), dtype=np.int64)
+        self._sorted_codes = None
+        self._orders = None
+        self._pending = []
+        self._id_rows = None
+
+    def __len__(self):
+        return int(self._alive.sum()) + sum(block[0].shape[0] for block in self._pending)
+
+    @staticmethod
+    def normalize(vectors):
+        vectors = sparse.csr_matrix(vectors, dtype=np.float64)
+        norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        return sparse.csr_matrix(sparse.diags(1.0 / norms) @ vectors)
+
+    def _hash_codes(self, vectors, batch_rows=8192):
+        n_planes = self.n_tables * self.n_bits
+        codes = np.zeros((vectors.shape[0], self.n_tables), dtype=np.int64)
+        weights = 1 << np.arange(self.n_bits, dtype=np.int64)
+        for start in range(0, vectors.shape[0], batch_rows):
+            block = vectors[start:start + batch_rows]
+            # Only hash the feature columns this block actually uses
+            columns, compact_indices = np.unique(block.indices, return_inverse=True)
+            compact = sparse.csr_matrix(
+                (block.data, compact_indices, block.indptr), shape=(block.shape[0], len(columns))
+            )
+            projections = compact @ _hyperplane_signs(columns, n_planes, self.seed)
+            bits = (projections > 0).reshape(block.shape[0], self.n_tables, self.n_bits)
+            codes[start:start + block.shape[0]] = bits.astype(np.int64) @ weights
+        return codes
+
+    def add(self, ids, vectors):
+        vectors = self.normalize(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+        if vectors.shape[0] != len(ids):
+            raise ValueError("ids and vectors must have the same length")
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors with {self.dim} features, got {vectors.shape[1]}")
+        self.dim = vectors.shape[1]
+        codes = self._hash_codes(vectors) if self.approximate else None
+        self._pending.append((vectors, ids, codes))
+        self._id_rows = None
+
+        pending_rows = sum(block[0].shape[0] for block in self._pending)
+        if self._matrix is None or pending_rows > self.merge_fraction * self._matrix.shape[0]:
+            self._merge()
+
+    def _merge(self):
+        if not self._pending:
+            return
+        matrices = [block[0] for block in self._pending]
+        if self._matrix is not None:
+            matrices.insert(0, self._matrix)
+
+        self._matrix = sparse.vstack(matrices, format='csr')
+        self._ids = np.concatenate([self._ids] + [block[1] for block in self._pending])
+        self._alive = np.concatenate([self._alive] + [np.ones(len(block[1]), dtype=bool) for block in self._pending])
+        if self.approximate:
+            self._codes = np.concatenate([self._codes] + [block[2] for block in self._pending])
+            self._build_tables()
+        self._pending = []
+        self._id_rows = None
+
+    def _build_tables(self):
+        self._orders = np.argsort(self._codes, axis=0, kind='stable').T.copy()
+        self._sorted_codes = np.take_along_axis(self._codes, self._orders.T, axis=0).T.copy()
+
+    def remove(self, ids):
+        self._merge()
+        if self._id_rows is None:
+            self._id_rows = {int(row_id): row for row, row_id in enumerate(self._ids)}
+        removed = 0
+        for row_id in np.atleast_1d(ids):
+            row = self._id_rows.get(int(row_id))
+            if row is not None and self._alive[row]:
+                if not self._alive.flags.writeable:
+                    self._alive = self._alive.copy()
+                self._alive[row] = False
+                removed += 1
+        return removed
+
+    def _candidate_rows(self, query_codes):
+        candidates = []
+        for table in range(self.n_tables):
+            code = query_codes[table]
+            left = np.searchsorted(self._sorted_codes[table], code, side='left')
+            right = np.searchsorted(self._sorted_codes[table], code, side='right')
+            candidates.append(self._orders[table][left:right])
+        return np.unique(np.concatenate(candidates)) if candidates else np.zeros(0, dtype=np.int64)
+
+    def search(self, vector, k=5, threshold=None):
+        """Return [(id, score)] sorted by descending cosine similarity.
+
+        ``k=None`` returns every match at or above ``threshold``.
+        """
+        query = self.normalize(vector)
+        if self.dim is not None and query.shape[1] != self.dim:
+            raise ValueError(f"Expected a vector with {self.dim} features, got {query.shape[1]}")
+        scored_ids = []
+        scored = []
+
+        if self._matrix is not None and self._matrix.shape[0]:
+            if self.approximate:
+                rows = self._candidate_rows(self._hash_codes(query)[0])
+                rows = rows[self._alive[rows]]
+                scores = (self._matrix[rows] @ query.T).toarray().ravel()
+            else:
+                rows = np.flatnonzero(self._alive)
+                scores = (self._matrix @ query.T).toarray().ravel()[rows]
+            scored_ids.append(self._ids[rows])
+            scored.append(scores)
+
+        for pending_vectors, pending_ids, _ in self._pending:
+            scored_ids.append(pending_ids)
+            scored.append((pending_vectors @ query.T).toarray().ravel())
+
+        if not scored:
+            return []
+        ids = np.concatenate(scored_ids)
+        scores = np.concatenate(scored)
+
+        if threshold is not None:
+            keep = scores >= threshold
+            ids, scores = ids[keep], scores[keep]
+        if k is not None and len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            ids, scores = ids[top], scores[top]
+
+        order = np.lexsort((np.arange(len(scores)), -scores))
+        return [(int(ids[i]), float(scores[i])) for i in order]
+
+    def save(self, path):
+        self._merge()
+        os.makedirs(path, exist_ok=True)
+        matrix = self._matrix if self._matrix is not None else sparse.csr_matrix((0, 0))
+        arrays = {
+            'data': matrix.data,
+            'indices': matrix.indices,
+            'indptr': matrix.indptr,
+            'ids': self._ids,
+            'alive': self._alive
+        }
+        if self.approximate:
+            arrays.update({'codes': self._codes, 'orders': self._orders, 'sorted_codes': self._sorted_codes})
+        for name, array in arrays.items():
+            np.save(os.path.join(path, f"{name}.npy"), array)
+
+        manifest = {
+            'dim': self.dim,
+            'approximate': self.approximate,
+            'n_tables': self.n_tables,
+            'n_bits': self.n_bits,
+            'seed': self.seed,
+            'shape': list(matrix.shape)
+        }
+        with open(os.path.join(path, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        mmap_mode = 'r' if mmap else None
+
+        def load_array(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        index = cls(approximate=manifest['approximate'], n_tables=manifest['n_tables'],
+                    n_bits=manifest['n_bits'], seed=manifest['seed'])
+        index.dim = manifest['dim']
+        if manifest['shape'][0]:
+            index._matrix = sparse.csr_matrix(
+                (load_array('data'), load_array('indices'), load_array('indptr')),
+                shape=tuple(manifest['shape']), copy=False
+            )
+        index._ids = load_array('ids')
+        index._alive = load_array('alive')
+        if index.approximate:
+            index._codes = load_array('codes')
+            index._orders = load_array('orders')
+            index._sorted_codes = load_array('sorted_codes')
+        return index
@@ -0,0 +1,129 @@
+import threading
+from collections import OrderedDict
+from .text_processor import SectionBuilder, ReadabilityCounter
+from .utils.helpers import normalize_policy_text, policy_content_hash
+
+
+class ParsedPolicy:
+    """A policy split into sections once and shared by every consumer.
+
+    Built by ``parse_policy``, which memoizes instances by content hash, so
+    the checker, the feature engineer and the update tracker all reuse the
+    same parse. Derived views (lowercased text, tokens, sentence offsets)
+    are computed on first use. ``derived`` memoizes anything else a consumer
+    computes from the text, such as vectorizer output.
+
+    ``max_heading_length`` is passed to SectionBuilder; policies parsed with
+    different values are cached separately.
+    """
+
+    def __init__(self, text, content_hash=None, max_heading_length=None):
+        self.text = normalize_policy_text(text)
+        self.content_hash = content_hash or policy_content_hash(text)
+        self.max_heading_length = max_heading_length
+        self.sections, self.section_spans = self._split_sections(self.text, max_heading_length)
+        self._lock = threading.Lock()
+        self._derived = {}
+
+    @staticmethod
+    def _split_sections(text, max_heading_length=None):
+        builder = SectionBuilder(max_heading_length=max_heading_length)
+        spans = {}
+        offset = 0
+        span = None
+
+        def add_span(completed):
+            if completed is not None:
+                spans[completed[0]] = tuple(span)
+
+        for line in text.split('\n'):
+            stripped = line.strip()
+            if stripped and builder.is_heading(stripped):
+                add_span(builder.feed(line))
+                span = None
+            elif stripped:
+                builder.feed(line)
+                start = offset + len(line) - len(line.lstrip())
+                end = offset + len(line.rstrip())
+                span = [start, end] if span is None else [span[0], end]
+            offset += len(line) + 1
+        add_span(builder.close())
+        return builder.sections, spans
+
+    def derived(self, key, compute):
+        """Return ``compute()`` the first time ``key`` is asked for, then the cached value."""
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        value = compute()
+        with self._lock:
+            return self._derived.setdefault(key, value)
+
+    @property
+    def text_lower(self):
+        return self.derived('text_lower', self.text.lower)
+
+    @property
+    def lower_sections(self):
+        return self.derived('lower_sections', lambda: {
+            name: content.lower() for name, content in self.sections.items()
+        })
+
+    @property
+    def tokens(self):
+        return self.derived('tokens', self.text.split)
+
+    @property
+    def section_tokens(self):
+        return self.derived('section_tokens', lambda: {
+            name: content.split() for name, content in self.sections.items()
+        })
+
+    @property
+    def sentence_offsets(self):
+        """``(start, end)`` of each sentence, split as textstat counts them."""
+        return self.derived('sentence_offsets', lambda: [
+            match.span() for match in ReadabilityCounter._sentence_re.finditer(self.text)
+        ])
+
+
+_parse_cache = OrderedDict()
+_parse_cache_lock = threading.Lock()
+_parse_cache_stats = {'hits': 0, 'misses': 0}
+PARSE_CACHE_SIZE = 256
+
+
+def parse_policy(policy_text, content_hash=None, max_heading_length=None):
+    """Return the shared ParsedPolicy for ``policy_text``, parsing it at most once per heading rule."""
+    if isinstance(policy_text, ParsedPolicy):
+        if policy_text.max_heading_length == max_heading_length:
+            return policy_text
+        policy_text, content_hash = policy_text.text, policy_text.content_hash
+
+    content_hash = content_hash or policy_content_hash(policy_text)
+    key = (content_hash, max_heading_length)
+    with _parse_cache_lock:
+        parsed = _parse_cache.get(key)
+        if parsed is not None:
+            _parse_cache.move_to_end(key)
+            _parse_cache_stats['hits'] += 1
+            return parsed
+        _parse_cache_stats['misses'] += 1
+
+    parsed = ParsedPolicy(policy_text, content_hash, max_heading_length)
+    with _parse_cache_lock:
+        _parse_cache[key] = parsed
+        while len(_parse_cache) > PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return parsed
+
+
+def parse_cache_info():
+    with _parse_cache_lock:
+        return dict(_parse_cache_stats, entries=len(_parse_cache))
+
+
+def clear_parse_cache():
+    with _parse_cache_lock:
+        _parse_cache.clear()
+        _parse_cache_stats.update(hits=0, misses=0)
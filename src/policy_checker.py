@@ -1,12 +1,23 @@
+import json
+import hashlib
 import numpy as np
-from .text_processor import TextProcessor
-from .feature_engineer import FeatureEngineer
+from .text_processor import TextProcessor, SectionBuilder, ReadabilityCounter
+from .feature_engineer import FeatureEngineer, ComplianceFeatureCounter
+from .rule_matcher import RuleMatcher
+from .parsed_policy import parse_policy
+from .utils.helpers import policy_content_hash
+from .utils.metrics import stage, timed
+
+# Bump when check_policy_compliance output changes so cached results are dropped
+RESULT_FORMAT_VERSION = 1
 
 class PolicyChecker:
-    def __init__(self):
+    def __init__(self, result_cache=None):
         self.text_processor = TextProcessor()
         self.feature_engineer = FeatureEngineer()
         self.policy_rules = self._load_default_rules()
+        self._rule_matcher = None
+        self.result_cache = result_cache
         
     def _load_default_rules(self):
         return {
@@ -37,7 +48,85 @@ class PolicyChecker:
             }
         }
     
+    def get_rule_matcher(self):
+        # policy_rules may be edited in place, so rebuild whenever it changes
+        signature = RuleMatcher.rules_signature(self.policy_rules)
+        if self._rule_matcher is None or self._rule_matcher.signature != signature:
+            self._rule_matcher = RuleMatcher(self.policy_rules)
+        return self._rule_matcher
+    
+    def get_rules_version(self):
+        rules_json = json.dumps(self.policy_rules, sort_keys=True, default=str)
+        return hashlib.md5(f"{RESULT_FORMAT_VERSION}:{rules_json}".encode()).hexdigest()
+    
+    @timed('policy_checker.check')
     def check_policy_compliance(self, policy_text):
+        content_hash = policy_content_hash(policy_text) if self.result_cache is not None else None
+        return self._cached(content_hash, self._check_policy_compliance, policy_text, content_hash)
+    
+    def _cached(self, content_hash, check, *args):
+        if self.result_cache is None or content_hash is None:
+            return check(*args)
+        
+        # Keyed on the rule set as well, so editing policy_rules invalidates entries
+        cache_key = f"{self.get_rules_version()}:{content_hash}"
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        results = check(*args)
+        self.result_cache.set(cache_key, results)
+        return results
+    
+    def _check_policy_compliance(self, policy_text, content_hash=None):
+        with stage('policy_checker.extract_sections'):
+            parsed = parse_policy(policy_text, content_hash)
+        with stage('policy_checker.rule_matching'):
+            rule_matches = self.get_rule_matcher().match(parsed.sections, parsed.lower_sections)
+        with stage('policy_checker.readability'):
+            readability_score = self.text_processor.calculate_readability(parsed.text)
+        with stage('policy_checker.compliance_features'):
+            features = self.feature_engineer.extract_compliance_features(parsed)
+        
+        return self._build_results(rule_matches, readability_score, features)
+    
+    @timed('policy_checker.check_stream')
+    def check_policy_stream(self, chunks, content_hash=None):
+        """Check a policy delivered as an iterable of text chunks.
+        
+        Produces the same result as check_policy_compliance(''.join(chunks))
+        while holding only the current section in memory. Pass a hash of the
+        source document as ``content_hash`` to use the result cache.
+        """
+        return self._cached(content_hash, self._check_policy_stream, chunks)
+    
+    def _check_policy_stream(self, chunks):
+        matcher = self.get_rule_matcher()
+        section_builder = SectionBuilder(keep_sections=False)
+        readability = ReadabilityCounter()
+        feature_counter = ComplianceFeatureCounter()
+        section_matches = {}
+        
+        def add_section(completed):
+            if completed is not None:
+                section_name, section_text = completed
+                # A repeated heading replaces the earlier section, as in extract_sections
+                section_matches[section_name] = matcher.match({section_name: section_text})
+        
+        for line in TextProcessor.iter_lines(chunks):
+            add_section(section_builder.feed(line))
+            readability.feed(line)
+            feature_counter.feed(line)
+        add_section(section_builder.close())
+        
+        rule_matches = {}
+        for matches in section_matches.values():
+            for rule_name, hits in matches.items():
+                rule_matches.setdefault(rule_name, []).extend(hits)
+        
+        return self._build_results(rule_matches, readability.score(), feature_counter.features())
+    
+    def _build_results(self, rule_matches, readability_score, features):
         results = {
             'overall_score': 0,
             'rule_violations': [],
@@ -46,25 +135,18 @@ class PolicyChecker:
             'section_analysis': {}
         }
         
-        sections = self.text_processor.extract_sections(policy_text)
-        
         total_weight = sum(rule['weight'] for rule in self.policy_rules.values())
         achieved_weight = 0
         
         for rule_name, rule in self.policy_rules.items():
             rule_found = False
-            for section_name, section_text in sections.items():
-                section_lower = section_text.lower()
-                
-                keyword_count = sum(1 for keyword in rule['keywords'] if keyword in section_lower)
-                
-                if keyword_count > 0:
-                    rule_found = True
-                    results['section_analysis'][f"{rule_name}_{section_name}"] = {
-                        'found': True,
-                        'keyword_count': keyword_count,
-                        'section': section_name
-                    }
+            for section_name, keyword_count, _ in rule_matches.get(rule_name, []):
+                rule_found = True
+                results['section_analysis'][f"{rule_name}_{section_name}"] = {
+                    'found': True,
+                    'keyword_count': keyword_count,
+                    'section': section_name
+                }
             
             if rule['required'] and not rule_found:
                 results['rule_violations'].append({
@@ -77,7 +159,6 @@ class PolicyChecker:
         
         results['compliance_percentage'] = (achieved_weight / total_weight) * 100 if total_weight > 0 else 0
         
-        readability_score = self.text_processor.calculate_readability(policy_text)
         results['readability'] = readability_score
         
         if readability_score < 30:
@@ -87,7 +168,6 @@ class PolicyChecker:
                 'severity': 'medium'
             })
         
-        features = self.feature_engineer.extract_compliance_features(policy_text)
         results['features'] = features.tolist()
         
         return results
\ No newline at end of file
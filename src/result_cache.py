@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from .utils.helpers import json_default
+
+
+class ResultCache:
+    """Two-tier cache for JSON-serialisable results.
+
+    Tier one is an in-process LRU bounded to ``max_entries``. When ``db_path``
+    is set, entries are also written to a SQLite file that every process
+    pointing at the same path shares; ``max_disk_entries`` bounds that file,
+    evicting the entries least recently written or read from disk. (Hits
+    served by a process's own memory tier do not count as disk reads.)
+    Values are stored as JSON, so callers always receive a fresh copy.
+    """
+
+    def __init__(self, max_entries=1024, db_path=None, max_disk_entries=100000):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._init_state()
+
+    def _init_state(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._pid = os.getpid()
+        self._writes_since_prune = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        if self.db_path:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = self._connection()
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL)'
+            )
+            if 'last_used' not in {row[1] for row in conn.execute('PRAGMA table_info(results)')}:
+                conn.execute('ALTER TABLE results ADD COLUMN last_used REAL')
+                conn.execute('UPDATE results SET last_used = created_at')
+            conn.execute('DROP INDEX IF EXISTS idx_results_created')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used)')
+
+    def __getstate__(self):
+        # Connections and counters are per process
+        return {
+            'max_entries': self.max_entries,
+            'db_path': self.db_path,
+            'max_disk_entries': self.max_disk_entries
+        }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._init_state()
+
+    def _connection(self):
+        if self._pid != os.getpid():
+            self._local = threading.local()
+            self._pid = os.getpid()
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(value)
+
+        if self.db_path:
+            conn = self._connection()
+            row = conn.execute('SELECT value FROM results WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                conn.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store_memory(key, row[0])
+                return json.loads(row[0])
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value):
+        serialized = json.dumps(value, default=json_default)
+        with self._lock:
+            self._store_memory(key, serialized)
+
+        if self.db_path:
+            conn = self._connection()
+            now = time.time()
+            conn.execute(
+                'INSERT OR REPLACE INTO results (key, value, created_at, last_used) VALUES (?, ?, ?, ?)',
+                (key, serialized, now, now)
+            )
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= 1000:
+                self._writes_since_prune = 0
+                self._prune_disk(conn)
+
+    def _store_memory(self, key, serialized):
+        self._entries[key] = serialized
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _prune_disk(self, conn):
+        removed = conn.execute(
+            'DELETE FROM results WHERE key IN ('
+            'SELECT key FROM results ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+            (self.max_disk_entries,)
+        ).rowcount
+        with self._lock:
+            self.disk_evictions += max(removed, 0)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            self._connection().execute('DELETE FROM results')
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_evictions': self.disk_evictions,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0
+            }
@@ -0,0 +1,115 @@
+import re
+from collections import Counter
+
+
+def _build_trie(keywords):
+    root = {}
+    for keyword in keywords:
+        node = root
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return root
+
+
+def _trie_to_regex(node):
+    # Factor common prefixes so each position only tries one branch per
+    # distinct next character, and prefer the longest keyword at a position.
+    branches = [re.escape(char) + _trie_to_regex(child)
+                for char, child in sorted(node.items()) if char]
+    if not branches:
+        return ''
+
+    if len(branches) == 1:
+        pattern = branches[0]
+        grouped = len(pattern) > 1
+    else:
+        pattern = '|'.join(branches)
+        grouped = True
+
+    if '' in node:
+        return f"(?:{pattern})?" if grouped else f"{pattern}?"
+    if len(branches) > 1:
+        return f"(?:{pattern})"
+    return pattern
+
+
+class RuleMatcher:
+    """Single-pass keyword matcher compiled from a policy rule set.
+
+    All rule keywords are folded into one prefix-factored regex which is run
+    over each section once. Overlapping hits are reported the same way
+    repeated ``keyword in text`` checks would see them.
+    """
+
+    def __init__(self, policy_rules):
+        self.rules = [(name, list(rule['keywords'])) for name, rule in policy_rules.items()]
+        self.signature = self.rules_signature(policy_rules)
+
+        keywords = {keyword for _, rule_keywords in self.rules for keyword in rule_keywords}
+        self.empty_keyword = '' in keywords
+        keywords.discard('')
+
+        trie = _build_trie(keywords)
+        self.pattern = re.compile(f"(?=({_trie_to_regex(trie)}))") if keywords else None
+
+        # Every keyword matching at a position is a prefix of the longest one.
+        self.prefix_keywords = {keyword: self._walk_prefixes(trie, keyword) for keyword in keywords}
+
+        self.keyword_rules = {}
+        for index, (_, rule_keywords) in enumerate(self.rules):
+            for keyword in rule_keywords:
+                self.keyword_rules.setdefault(keyword, set()).add(index)
+
+    @staticmethod
+    def rules_signature(policy_rules):
+        return tuple((name, tuple(rule['keywords'])) for name, rule in policy_rules.items())
+
+    @staticmethod
+    def _walk_prefixes(trie, keyword):
+        prefixes = []
+        node = trie
+        for position, char in enumerate(keyword, 1):
+            node = node[char]
+            if '' in node:
+                prefixes.append(keyword[:position])
+        return prefixes
+
+    def scan(self, text_lower):
+        """Return occurrence counts for every keyword found in ``text_lower``."""
+        hits = Counter()
+        if self.pattern is not None:
+            longest = Counter(match.group(1) for match in self.pattern.finditer(text_lower))
+            for keyword, count in longest.items():
+                for prefix in self.prefix_keywords[keyword]:
+                    hits[prefix] += count
+        if self.empty_keyword:
+            hits[''] = len(text_lower) + 1
+        return hits
+
+    def match(self, sections, lower_sections=None):
+        """Map rule name -> [(section_name, keyword_count, keyword_hits)].
+
+        ``keyword_count`` is the number of the rule's keywords present in the
+        section; ``keyword_hits`` holds the occurrence count of each of them.
+        Sections are listed in their original order. Pass ``lower_sections``
+        when the lowercased sections are already at hand.
+        """
+        matches = {}
+        for section_name, section_text in sections.items():
+            if lower_sections is not None:
+                hits = self.scan(lower_sections[section_name])
+            else:
+                hits = self.scan(section_text.lower())
+
+            candidate_rules = set()
+            for keyword in hits:
+                candidate_rules.update(self.keyword_rules.get(keyword, ()))
+
+            for index in sorted(candidate_rules):
+                rule_name, rule_keywords = self.rules[index]
+                keyword_hits = {keyword: hits[keyword] for keyword in rule_keywords if hits[keyword]}
+                keyword_count = sum(1 for keyword in rule_keywords if hits[keyword])
+                matches.setdefault(rule_name, []).append((section_name, keyword_count, keyword_hits))
+
+        return matches
@@ -1,15 +1,20 @@
+import math
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
-import textstat
+import numpy as np
 
-nltk.download('punkt', quiet=True)
-nltk.download('stopwords', quiet=True)
+# nltk (which pulls in scipy.stats) and textstat are imported on first use;
+# their corpora must already be on disk, see src/utils/nltk_data.py
 
 class TextProcessor:
     def __init__(self):
-        self.stop_words = set(stopwords.words('english'))
+        self._stop_words = None
+    
+    @property
+    def stop_words(self):
+        if self._stop_words is None:
+            from nltk.corpus import stopwords
+            self._stop_words = set(stopwords.words('english'))
+        return self._stop_words
         
     def clean_text(self, text):
         text = text.lower()
@@ -18,32 +23,68 @@ class TextProcessor:
         text = re.sub(r'\s+', ' ', text)
         return text.strip()
     
-    def extract_sections(self, text):
-        sections = {}
-        lines = text.split('\n')
-        current_section = "general"
-        section_content = []
+    def clean_series(self, texts):
+        """clean_text over a pandas Series of strings using vectorized str ops."""
+        # Both removals delete single characters, so they can share one pass
+        texts = texts.str.lower().str.replace(r'[^\w\s]|\d', '', regex=True)
+        texts = texts.str.replace(r'\s+', ' ', regex=True)
+        return texts.str.strip()
+    
+    def tokenize_cleaned_words(self, words):
+        """Map words of clean_text output onto the tokens word_tokenize gives for them.
         
-        for line in lines:
-            line = line.strip()
-            if len(line) > 0:
-                if line.isupper() or ':' in line or line.endswith(':'):
-                    if section_content:
-                        sections[current_section] = ' '.join(section_content)
-                    current_section = line.lower().replace(':', '').strip()
-                    section_content = []
-                else:
-                    section_content.append(line)
+        Cleaned text holds only word characters and single spaces, so of
+        NLTK's tokenizer rules only the contraction splits (e.g. "cannot")
+        can apply, and only within a word. Returns ``(matrix, vocabulary)``:
+        multiplying per-word counts by ``matrix`` gives counts over the
+        token ``vocabulary``.
+        """
+        from nltk.tokenize.destructive import NLTKWordTokenizer
+        from scipy import sparse
         
-        if section_content:
-            sections[current_section] = ' '.join(section_content)
+        vocabulary = {}
+        rows, columns = [], []
+        for row, word in enumerate(words):
+            padded = f" {word} "
+            for regexp in NLTKWordTokenizer.CONTRACTIONS2 + NLTKWordTokenizer.CONTRACTIONS3:
+                padded = regexp.sub(r" \1 \2 ", padded)
+            for token in padded.split():
+                rows.append(row)
+                columns.append(vocabulary.setdefault(token, len(vocabulary)))
+        matrix = sparse.csr_matrix((np.ones(len(rows)), (rows, columns)), shape=(len(words), len(vocabulary)))
+        return matrix, vocabulary
+    
+    def extract_sections(self, text):
+        builder = SectionBuilder()
+        for line in text.split('\n'):
+            builder.feed(line)
+        builder.close()
+        return builder.sections
+    
+    @staticmethod
+    def iter_lines(chunks):
+        """Re-split arbitrary text chunks into lines, keeping the newline.
         
-        return sections
+        Joining the yielded lines gives back exactly ''.join(chunks).
+        """
+        pending = ''
+        for chunk in chunks:
+            if not chunk:
+                continue
+            pending += chunk
+            lines = pending.split('\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line + '\n'
+        if pending:
+            yield pending
     
     def calculate_readability(self, text):
+        import textstat
         return textstat.flesch_reading_ease(text)
     
     def tokenize_text(self, text):
+        from nltk.tokenize import word_tokenize
         return word_tokenize(text)
     
     def remove_stopwords(self, tokens):
@@ -53,4 +94,106 @@ class TextProcessor:
         freq_dist = {}
         for token in tokens:
             freq_dist[token] = freq_dist.get(token, 0) + 1
-        return freq_dist
\ No newline at end of file
+        return freq_dist
+
+
+def _round_like_textstat(number, points):
+    # textstat rounds half away from zero rather than to even
+    p = 10 ** points
+    return float(math.floor((number * p) + math.copysign(0.5, number))) / p
+
+
+class SectionBuilder:
+    """Incremental form of TextProcessor.extract_sections.
+    
+    Lines are fed one at a time; ``feed``/``close`` return the section that
+    was completed by that call (or None). ``sections`` accumulates the same
+    dict extract_sections returns, unless ``keep_sections`` is False.
+    
+    A line is a heading when it is upper case or contains a colon; with
+    ``max_heading_length``, a line with a colon must also be shorter than
+    that to count, as change detection requires.
+    """
+    
+    def __init__(self, keep_sections=True, max_heading_length=None):
+        self.keep_sections = keep_sections
+        self.max_heading_length = max_heading_length
+        self.sections = {}
+        self.current_section = "general"
+        self.section_content = []
+    
+    def is_heading(self, line):
+        if line.isupper():
+            return True
+        return ':' in line and (self.max_heading_length is None or len(line) < self.max_heading_length)
+    
+    def feed(self, line):
+        line = line.strip()
+        if len(line) == 0:
+            return None
+        
+        if self.is_heading(line):
+            completed = self._flush()
+            self.current_section = line.lower().replace(':', '').strip()
+            return completed
+        
+        self.section_content.append(line)
+        return None
+    
+    def close(self):
+        return self._flush()
+    
+    def _flush(self):
+        if not self.section_content:
+            return None
+        completed = (self.current_section, ' '.join(self.section_content))
+        if self.keep_sections:
+            self.sections[completed[0]] = completed[1]
+        self.section_content = []
+        return completed
+
+
+class ReadabilityCounter:
+    """Accumulates textstat.flesch_reading_ease over text fed in pieces.
+    
+    Text is buffered only up to the last sentence terminator, so memory stays
+    bounded by sentence length while the score matches the whole-text value.
+    """
+    
+    _sentence_re = re.compile(r'\b[^.!?]+[.!?]*', re.UNICODE)
+    _boundary_re = re.compile(r'[.!?](?=\s)')
+    
+    def __init__(self):
+        self.words = 0
+        self.syllables = 0
+        self.sentences = 0
+        self.ignored_sentences = 0
+        self._buffer = ''
+    
+    def feed(self, text):
+        self._buffer += text
+        last_boundary = None
+        for last_boundary in self._boundary_re.finditer(self._buffer):
+            pass
+        if last_boundary is not None:
+            self._consume(self._buffer[:last_boundary.end()])
+            self._buffer = self._buffer[last_boundary.end():]
+    
+    def _consume(self, text):
+        import textstat
+        self.words += textstat.lexicon_count(text)
+        self.syllables += textstat.syllable_count(text)
+        for sentence in self._sentence_re.findall(text):
+            self.sentences += 1
+            if textstat.lexicon_count(sentence) <= 2:
+                self.ignored_sentences += 1
+    
+    def score(self):
+        if self._buffer:
+            self._consume(self._buffer)
+            self._buffer = ''
+        
+        sentence_count = max(1, self.sentences - self.ignored_sentences)
+        sentence_length = _round_like_textstat(self.words / sentence_count, 1)
+        syllables_per_word = _round_like_textstat(self.syllables / self.words, 1) if self.words else 0.0
+        return _round_like_textstat(206.835 - 1.015 * sentence_length - 84.6 * syllables_per_word, 2)
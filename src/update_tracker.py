@@ -1,14 +1,32 @@
 from datetime import datetime, timedelta
-from .models.similarity_model import SimilarityModel
+from .models.similarity_model import SECTION_HEADING_MAX_LENGTH, SimilarityModel
+from .models.vector_index import VectorIndex
+from .models.section_diff import MAJOR_REWRITE_THRESHOLD, SIGNIFICANT_CHANGE_THRESHOLD
+from .history_store import SQLiteHistoryStore
+from .parsed_policy import parse_policy
+from .utils.metrics import stage, timed
 
 class UpdateTracker:
-    def __init__(self):
-        self.similarity_model = SimilarityModel()
-        self.update_history = []
+    def __init__(self, history_store=None, similarity_model=None):
+        self.similarity_model = similarity_model if similarity_model is not None else SimilarityModel()
+        self.history_store = history_store if history_store is not None else SQLiteHistoryStore()
+        self._changes_index = None
+        self._changes_index_version = None
+        self._indexed_through = 0
+    
+    @property
+    def update_history(self):
+        return list(self.history_store.iter_records())
         
+    @timed('update_tracker.track')
     def track_policy_update(self, old_policy, new_policy, policy_id=None, version=None):
-        changes = self.similarity_model.detect_changes(old_policy, new_policy)
-        similarity_score = self.similarity_model.calculate_overall_similarity(old_policy, new_policy)
+        with stage('update_tracker.extract_sections'):
+            old_policy = parse_policy(old_policy, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+            new_policy = parse_policy(new_policy, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        with stage('update_tracker.detect_changes'):
+            changes = self.similarity_model.detect_changes(old_policy, new_policy)
+        with stage('update_tracker.similarity'):
+            similarity_score = self.similarity_model.calculate_overall_similarity(old_policy, new_policy, update_idf=True)
         
         update_record = {
             'policy_id': policy_id,
@@ -17,11 +35,12 @@ class UpdateTracker:
             'update_timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
             'similarity_score': float(similarity_score),
             'total_changes': len(changes),
-            'significant_changes': len([c for c in changes if c['similarity'] < 0.7]),
+            'significant_changes': len([c for c in changes if c['similarity'] < SIGNIFICANT_CHANGE_THRESHOLD]),
             'changes_detail': changes
         }
         
-        self.update_history.append(update_record)
+        with stage('update_tracker.history_store'):
+            self.history_store.add(update_record)
         
         notifications = self._generate_notifications(update_record)
         
@@ -50,7 +69,7 @@ class UpdateTracker:
                     'recipients': ['compliance_officer', 'legal_team']
                 })
             
-            if change['change_type'] == 'modified' and change['similarity'] < 0.3:
+            if change['change_type'] == 'modified' and change['similarity'] < MAJOR_REWRITE_THRESHOLD:
                 notifications.append({
                     'type': 'significant_modification',
                     'message': f"Section '{change['section']}' was significantly modified",
@@ -69,37 +88,55 @@ class UpdateTracker:
         return notifications
     
     def get_update_history(self, policy_id=None, days_back=30):
-        filtered_history = self.update_history
-        
-        if policy_id:
-            filtered_history = [h for h in filtered_history if h['policy_id'] == policy_id]
-        
         cutoff_date = datetime.now() - timedelta(days=days_back)
+        return self.history_store.query(policy_id=policy_id, since=cutoff_date.timestamp())
+    
+    def _sync_changes_index(self, batch_size=1000):
+        # Vectors of each record's changes_detail, keyed by history record id.
+        # Only records added since the last call are vectorized; a refit of the
+        # similarity model invalidates everything. Online IDF updates are not a
+        # refit: indexed rows keep the weights they were vectorized with.
+        if self._changes_index is None or self._changes_index_version != self.similarity_model.vectorizer_version:
+            self._changes_index = VectorIndex()
+            self._changes_index_version = self.similarity_model.vectorizer_version
+            self._indexed_through = 0
         
-        recent_history = []
-        for record in filtered_history:
-            record_date = datetime.strptime(record['update_timestamp'], '%Y-%m-%d %H:%M:%S')
-            if record_date >= cutoff_date:
-                recent_history.append(record)
-        
-        return sorted(recent_history, key=lambda x: x['update_timestamp'], reverse=True)
+        batch_ids = []
+        batch_texts = []
+        for record_id, record in self.history_store.iter_entries(after_id=self._indexed_through):
+            batch_ids.append(record_id)
+            batch_texts.append(str(record['changes_detail']))
+            if len(batch_ids) >= batch_size:
+                self._index_changes(batch_ids, batch_texts)
+                batch_ids, batch_texts = [], []
+        if batch_ids:
+            self._index_changes(batch_ids, batch_texts)
+        return self._changes_index
+    
+    def _index_changes(self, record_ids, texts):
+        self._changes_index.add(record_ids, self.similarity_model.vectorize(texts))
+        self._indexed_through = record_ids[-1]
     
+    @timed('update_tracker.find_similar')
     def find_similar_updates(self, current_update, similarity_threshold=0.8):
-        similar_updates = []
+        index = self._sync_changes_index()
+        query = self.similarity_model.vectorize([str(current_update['changes_detail'])])
+        matches = index.search(query, k=None, threshold=similarity_threshold)
         
-        for historical_update in self.update_history:
-            if historical_update['policy_id'] == current_update['policy_id']:
+        records = self.history_store.get_records(record_id for record_id, _ in matches)
+        # Anything the store has compacted away is dropped from the index too
+        expired = [record_id for record_id, _ in matches if record_id not in records]
+        if expired:
+            index.remove(expired)
+        
+        similar_updates = []
+        for record_id, sim_score in matches:
+            historical_update = records.get(record_id)
+            if historical_update is None or historical_update['policy_id'] == current_update['policy_id']:
                 continue
-            
-            sim_score = self.similarity_model.calculate_overall_similarity(
-                str(historical_update['changes_detail']),
-                str(current_update['changes_detail'])
-            )
-            
-            if sim_score >= similarity_threshold:
-                similar_updates.append({
-                    'historical_update': historical_update,
-                    'similarity_score': float(sim_score)
-                })
+            similar_updates.append({
+                'historical_update': historical_update,
+                'similarity_score': float(sim_score)
+            })
         
-        return sorted(similar_updates, key=lambda x: x['similarity_score'], reverse=True)
\ No newline at end of file
+        return similar_updates
\ No newline at end of file
@@ -1,13 +1,19 @@
 from .helpers import (
+    normalize_policy_text,
+    policy_content_hash,
     generate_policy_id,
     validate_policy_structure,
     format_compliance_score,
-    save_analysis_results
+    save_analysis_results,
+    json_default
 )
 
 __all__ = [
+    'normalize_policy_text',
+    'policy_content_hash',
     'generate_policy_id',
     'validate_policy_structure',
     'format_compliance_score',
-    'save_analysis_results'
+    'save_analysis_results',
+    'json_default'
 ]
\ No newline at end of file
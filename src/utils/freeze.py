@@ -0,0 +1,39 @@
+import numpy as np
+
+# Arrays smaller than this share a page with other objects anyway
+FREEZE_MIN_BYTES = 1 << 16
+
+
+def freeze_arrays(obj, min_bytes=FREEZE_MIN_BYTES):
+    """Mark the large numpy arrays reachable from ``obj`` read-only.
+
+    Meant for fitted models loaded before gunicorn forks: a read-only buffer
+    cannot be written by accident, so its pages stay shared copy-on-write
+    between workers. Walks instance attributes, dicts, lists, tuples and
+    scipy sparse matrices. Returns ``(arrays, bytes)`` frozen.
+    """
+    seen = set()
+    frozen = [0, 0]
+
+    def visit(value):
+        if id(value) in seen:
+            return
+        seen.add(id(value))
+        if isinstance(value, np.ndarray):
+            if value.dtype != object and value.nbytes >= min_bytes and value.flags.writeable:
+                value.flags.writeable = False
+                frozen[0] += 1
+                frozen[1] += value.nbytes
+            return
+        if isinstance(value, dict):
+            for item in value.values():
+                visit(item)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for item in value:
+                visit(item)
+        elif hasattr(value, '__dict__') and not isinstance(value, type):
+            for item in vars(value).values():
+                visit(item)
+
+    visit(obj)
+    return tuple(frozen)
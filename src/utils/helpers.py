@@ -2,6 +2,12 @@ import json
 import hashlib
 from datetime import datetime
 
+def normalize_policy_text(policy_text):
+    return policy_text.replace('\r\n', '\n').replace('\r', '\n').strip()
+
+def policy_content_hash(policy_text):
+    return hashlib.md5(normalize_policy_text(policy_text).encode()).hexdigest()
+
 def generate_policy_id(policy_text, company_name):
     content_hash = hashlib.md5(policy_text.encode()).hexdigest()[:8]
     timestamp = datetime.now().strftime("%Y%m%d")
@@ -31,6 +37,12 @@ def format_compliance_score(score):
     else:
         return "Non-compliant"
 
+def json_default(value):
+    # numpy scalars expose item(); anything else falls back to its string form
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
 def save_analysis_results(results, filename):
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2, default=str)
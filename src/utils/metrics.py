@@ -0,0 +1,297 @@
+"""In-process metrics with Prometheus text output, summed across worker processes.
+
+Code marks its stages with ``timed(name)`` (a decorator) or ``stage(name)``
+(a context manager); both record into the ``app_stage_duration_seconds``
+histogram and cost one attribute check while metrics are disabled. The
+Flask app adds per-endpoint request counters, latency and payload size
+histograms.
+
+Each process keeps its own counts. With a ``multiprocess_dir`` every
+process also publishes them to ``metrics-<pid>.json`` there from a
+background thread, at most every ``flush_interval`` seconds, and ``render`` sums the files of the processes
+still alive, so a scrape served by any gunicorn worker covers all of them.
+Counts of a worker that exited are dropped, which Prometheus reads as a
+counter reset.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from functools import wraps
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+STAGE_SECONDS = 'app_stage_duration_seconds'
+HTTP_REQUESTS = 'app_http_requests_total'
+HTTP_SECONDS = 'app_http_request_duration_seconds'
+HTTP_REQUEST_BYTES = 'app_http_request_size_bytes'
+HTTP_RESPONSE_BYTES = 'app_http_response_size_bytes'
+LLM_REQUESTS = 'app_llm_requests_total'
+
+# name -> (type, help, buckets)
+METRICS = {
+    STAGE_SECONDS: ('histogram', 'Time spent in an instrumented processing stage.', LATENCY_BUCKETS),
+    HTTP_REQUESTS: ('counter', 'HTTP requests by endpoint, method and status.', None),
+    HTTP_SECONDS: ('histogram', 'HTTP request latency by endpoint.', LATENCY_BUCKETS),
+    HTTP_REQUEST_BYTES: ('histogram', 'HTTP request body size by endpoint.', SIZE_BUCKETS),
+    HTTP_RESPONSE_BYTES: ('histogram', 'HTTP response body size by endpoint.', SIZE_BUCKETS),
+    LLM_REQUESTS: ('counter', 'Outbound LLM calls by outcome (ok, cache, empty, error, circuit_open, busy).', None)
+}
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ('registry', 'key', 'start')
+
+    def __init__(self, registry, key):
+        self.registry = registry
+        self.key = key
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry._observe(self.key, LATENCY_BUCKETS, time.perf_counter() - self.start)
+        return False
+
+
+def _stage_key(name):
+    return (STAGE_SECONDS, (('stage', name),))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by metric name and label set."""
+
+    def __init__(self, enabled=False, multiprocess_dir=None, flush_interval=5.0):
+        self.enabled = enabled
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            # A forked worker starts from zero; the parent publishes its own counts
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._pid = os.getpid()
+        self._dirty = False
+        self._flusher = None
+
+    def configure(self, enabled=True, multiprocess_dir=None, flush_interval=5.0):
+        self.multiprocess_dir = multiprocess_dir
+        self.flush_interval = flush_interval
+        if multiprocess_dir:
+            os.makedirs(multiprocess_dir, exist_ok=True)
+        self.enabled = enabled
+        return self
+
+    def stage(self, name):
+        """Context manager timing the enclosed block as stage ``name``."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, _stage_key(name))
+
+    def timed(self, name):
+        """Decorator timing every call of the function as stage ``name``."""
+        key = _stage_key(name)
+        def decorate(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self._observe(key, LATENCY_BUCKETS, time.perf_counter() - start)
+            return wrapper
+        return decorate
+
+    def increment(self, name, amount=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+        self._maybe_flush()
+
+    def observe(self, name, value, **labels):
+        if not self.enabled:
+            return
+        self._observe((name, tuple(sorted(labels.items()))), METRICS[name][2], value)
+
+    def _observe(self, key, buckets, value):
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                # Per-bucket counts (last one is +Inf), then sum and count
+                histogram = self._values[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            histogram[bisect.bisect_left(buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+        self._maybe_flush()
+
+    def record_request(self, endpoint, method, status, seconds, request_bytes=None, response_bytes=None):
+        if not self.enabled:
+            return
+        self.increment(HTTP_REQUESTS, endpoint=endpoint, method=method, status=str(status))
+        self.observe(HTTP_SECONDS, seconds, endpoint=endpoint)
+        if request_bytes is not None:
+            self.observe(HTTP_REQUEST_BYTES, request_bytes, endpoint=endpoint)
+        if response_bytes is not None:
+            self.observe(HTTP_RESPONSE_BYTES, response_bytes, endpoint=endpoint)
+
+    def snapshot(self):
+        """This process's values as ``[[name, labels, value], ...]``."""
+        with self._lock:
+            return [[name, [list(pair) for pair in labels], value if isinstance(value, (int, float)) else list(value)]
+                    for (name, labels), value in self._values.items()]
+
+    def _maybe_flush(self):
+        # A daemon thread publishes at most every flush_interval, so an idle
+        # worker's last requests still reach the other workers' scrapes
+        if not self.multiprocess_dir:
+            return
+        self._dirty = True
+        if self._flusher is None:
+            with self._lock:
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                try:
+                    self.flush()
+                except OSError:
+                    pass
+
+    def flush(self):
+        """Publish this process's values to ``multiprocess_dir``."""
+        if not self.multiprocess_dir:
+            return
+        import tempfile
+        self._dirty = False
+        data = json.dumps({'pid': self._pid, 'values': self.snapshot()})
+        fd, tmp_path = tempfile.mkstemp(prefix='.metrics-', dir=self.multiprocess_dir)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(self.multiprocess_dir, f"metrics-{self._pid}.json"))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def _collect(self):
+        if not self.multiprocess_dir:
+            return [self.snapshot()]
+        import glob
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.multiprocess_dir, 'metrics-*.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if data.get('pid') != self._pid and not _process_alive(data.get('pid', 0)):
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+                continue
+            snapshots.append(data['values'])
+        return snapshots
+
+    def collect(self):
+        """Values summed over every live process: ``{(name, labels): value}``."""
+        merged = {}
+        for snapshot in self._collect():
+            for name, labels, value in snapshot:
+                if name not in METRICS:
+                    continue
+                key = (name, tuple(tuple(pair) for pair in labels))
+                if isinstance(value, list):
+                    current = merged.setdefault(key, [0] * len(value))
+                    for index, item in enumerate(value):
+                        current[index] += item
+                else:
+                    merged[key] = merged.get(key, 0) + value
+        return merged
+
+    def render(self):
+        """Prometheus text exposition format (version 0.0.4)."""
+        merged = self.collect()
+        lines = []
+        for name, (metric_type, help_text, buckets) in METRICS.items():
+            series = sorted((labels, value) for (metric, labels), value in merged.items() if metric == name)
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in series:
+                if metric_type == 'counter':
+                    lines.append(f"{name}{_format_labels(labels)} {_format_number(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip([_format_number(bound) for bound in buckets] + ['+Inf'], value[:-2]):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(value[-2])}")
+                lines.append(f"{name}_count{_format_labels(labels)} {value[-1]}")
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+metrics = MetricsRegistry()
+stage = metrics.stage
+timed = metrics.timed
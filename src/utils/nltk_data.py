@@ -0,0 +1,50 @@
+import os
+import sys
+
+# NLTK resources TextProcessor loads, by download name
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords'
+}
+
+DOWNLOAD_HINT = "run: python scripts/download_nltk_data.py"
+
+
+def _has_resource(data_dir, resource_path):
+    location = os.path.join(data_dir, *resource_path.split('/'))
+    return os.path.isdir(location) or os.path.isfile(location + '.zip')
+
+
+def use_nltk_data(data_dir):
+    """Search ``data_dir`` first for NLTK resources, whether or not nltk is imported yet."""
+    data_dir = os.path.abspath(data_dir)
+    entries = [entry for entry in os.environ.get('NLTK_DATA', '').split(os.pathsep) if entry]
+    if data_dir not in entries:
+        os.environ['NLTK_DATA'] = os.pathsep.join([data_dir] + entries)
+    nltk = sys.modules.get('nltk')
+    if nltk is not None and data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+
+
+def verify_nltk_data(data_dir=None):
+    """Check that every resource in NLTK_RESOURCES is available offline.
+
+    With ``data_dir`` only that directory is checked, on the filesystem, so
+    nltk is not imported; the directory is also put first on NLTK's search
+    path. Without it NLTK's own search path is used. Raises LookupError
+    naming whatever is missing; nothing is ever downloaded.
+    """
+    if data_dir:
+        use_nltk_data(data_dir)
+        missing = [name for name, path in NLTK_RESOURCES.items() if not _has_resource(data_dir, path)]
+    else:
+        import nltk.data
+        missing = []
+        for name, path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                missing.append(name)
+    if missing:
+        where = f" in {data_dir}" if data_dir else ''
+        raise LookupError(f"NLTK data not found{where}: {', '.join(missing)}; {DOWNLOAD_HINT}")
@@ -0,0 +1,252 @@
+"""Opt-in profiling of single Flask requests.
+
+A request is profiled when a trusted caller asks for it, by sending the
+configured token in the ``X-Profile`` header or the ``profile`` query
+argument, or when it is picked by 1-in-``sample_every`` sampling. Its
+profile is written to ``output_dir`` under the request id: a cProfile
+``.pstats`` file, or with ``mode='sampling'`` a ``.collapsed`` file of
+stack samples (one ``frame;frame;frame count`` line per stack, the input
+of flamegraph.pl and speedscope). ``profiles.db`` there indexes the files
+of every worker and keeps only the newest ``max_profiles``.
+
+While disabled, the request hooks cost one attribute check.
+"""
+import hmac
+import os
+import random
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+MODES = ('cprofile', 'sampling')
+EXTENSIONS = {'cprofile': '.pstats', 'sampling': '.collapsed'}
+
+_REQUEST_ID_RE = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples the stack of one thread every ``interval`` seconds.
+
+    Unlike cProfile it only reads ``sys._current_frames()`` from a
+    separate thread, so the profiled code runs unmodified and several
+    requests can be sampled at once.
+    """
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.counts = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            key = ';'.join(reversed(stack))
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class ProfileIndex:
+    """SQLite index of the profile files in one directory."""
+
+    def __init__(self, output_dir, max_profiles=200):
+        self.output_dir = output_dir
+        self.max_profiles = max_profiles
+        self.db_path = os.path.join(output_dir, 'profiles.db')
+        self._local = threading.local()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS profiles ('
+                'id TEXT PRIMARY KEY, filename TEXT NOT NULL, format TEXT NOT NULL, trigger TEXT NOT NULL, '
+                'method TEXT, endpoint TEXT, path TEXT, status INTEGER, duration REAL, '
+                'size INTEGER, pid INTEGER, created_at REAL NOT NULL, request_id TEXT)'
+            )
+            if 'request_id' not in {row['name'] for row in conn.execute('PRAGMA table_info(profiles)')}:
+                conn.execute('ALTER TABLE profiles ADD COLUMN request_id TEXT')
+            conn.execute('CREATE INDEX IF NOT EXISTS profiles_created_at ON profiles (created_at)')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def add(self, record):
+        conn = self._connect()
+        columns = ', '.join(record)
+        placeholders = ', '.join('?' for _ in record)
+        conn.execute(f'INSERT INTO profiles ({columns}) VALUES ({placeholders})', tuple(record.values()))
+        if self.max_profiles:
+            expired = conn.execute(
+                'SELECT id, filename FROM profiles ORDER BY created_at DESC LIMIT -1 OFFSET ?', (self.max_profiles,)
+            ).fetchall()
+            for row in expired:
+                try:
+                    os.unlink(os.path.join(self.output_dir, row['filename']))
+                except FileNotFoundError:
+                    pass
+                conn.execute('DELETE FROM profiles WHERE id = ?', (row['id'],))
+
+    def list(self, limit=100, endpoint=None):
+        query = 'SELECT * FROM profiles'
+        params = []
+        if endpoint:
+            query += ' WHERE endpoint = ?'
+            params.append(endpoint)
+        query += ' ORDER BY created_at DESC LIMIT ?'
+        params.append(limit)
+        return [dict(row) for row in self._connect().execute(query, params)]
+
+    def get(self, profile_id):
+        row = self._connect().execute('SELECT * FROM profiles WHERE id = ?', (profile_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+
+class RequestProfiler:
+    """Decides which requests to profile and stores their profiles."""
+
+    def __init__(self, enabled=False, output_dir=None, token=None, sample_every=0, endpoints=None,
+                 mode='cprofile', interval=0.005, max_profiles=200):
+        self.enabled = False
+        self.configure(enabled, output_dir, token, sample_every, endpoints, mode, interval, max_profiles)
+
+    def configure(self, enabled=True, output_dir=None, token=None, sample_every=0, endpoints=None,
+                  mode='cprofile', interval=0.005, max_profiles=200):
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}, expected one of {MODES}")
+        if enabled and not output_dir:
+            raise ValueError("Profiling needs an output_dir")
+        self.output_dir = output_dir
+        self.token = token or None
+        self.sample_every = sample_every or 0
+        self.endpoints = set(endpoints) if endpoints else None
+        self.mode = mode
+        self.interval = interval
+        self.index = None
+        if enabled:
+            os.makedirs(output_dir, exist_ok=True)
+            self.index = ProfileIndex(output_dir, max_profiles)
+        self.enabled = enabled
+        return self
+
+    def is_trusted(self, supplied):
+        """Whether ``supplied`` is the configured token; never without one."""
+        if not self.token or not supplied:
+            return False
+        return hmac.compare_digest(str(supplied).encode(), self.token.encode())
+
+    def trigger(self, supplied_token, endpoint):
+        """'requested', 'sampled' or None for a request to ``endpoint``."""
+        if self.is_trusted(supplied_token):
+            return 'requested'
+        if self.sample_every and (self.endpoints is None or endpoint in self.endpoints):
+            if random.random() * self.sample_every < 1:
+                return 'sampled'
+        return None
+
+    def start(self, request_id, trigger):
+        """Start profiling the current thread; returns the running profile.
+
+        The profile id is always generated here: ``request_id`` comes from the
+        client, so it is only recorded (when well-formed) to find the profile
+        of a given request, and can never overwrite another profile.
+        """
+        if request_id is not None and not _REQUEST_ID_RE.match(request_id):
+            request_id = None
+        profile = {'id': uuid.uuid4().hex, 'request_id': request_id, 'trigger': trigger, 'mode': self.mode,
+                   'created_at': time.time()}
+        if self.mode == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+ allows one cProfile per process; sample this request instead
+                profile['mode'] = 'sampling'
+            else:
+                profile['profiler'] = profiler
+        if profile['mode'] == 'sampling':
+            profile['profiler'] = StackSampler(interval=self.interval).start()
+        profile['start'] = time.perf_counter()
+        return profile
+
+    def finish(self, profile, method=None, endpoint=None, path=None, status=None):
+        """Stop ``profile``, write its file and index it; returns the index record."""
+        duration = time.perf_counter() - profile['start']
+        profiler = profile['profiler']
+        if profile['mode'] == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+
+        filename = f"{int(profile['created_at'])}-{profile['id']}{EXTENSIONS[profile['mode']]}"
+        path_on_disk = os.path.join(self.output_dir, filename)
+        tmp_path = path_on_disk + '.tmp'
+        if profile['mode'] == 'cprofile':
+            profiler.dump_stats(tmp_path)
+        else:
+            profiler.write(tmp_path)
+        os.replace(tmp_path, path_on_disk)
+
+        record = {
+            'id': profile['id'],
+            'request_id': profile['request_id'],
+            'filename': filename,
+            'format': EXTENSIONS[profile['mode']].lstrip('.'),
+            'trigger': profile['trigger'],
+            'method': method,
+            'endpoint': endpoint,
+            'path': path,
+            'status': status,
+            'duration': duration,
+            'size': os.path.getsize(path_on_disk),
+            'pid': os.getpid(),
+            'created_at': profile['created_at']
+        }
+        self.index.add(record)
+        return record
+
+    def list_profiles(self, limit=100, endpoint=None):
+        return self.index.list(limit, endpoint) if self.index is not None else []
+
+    def profile_path(self, profile_id):
+        record = self.index.get(profile_id) if self.index is not None else None
+        if record is None:
+            return None
+        path = os.path.join(self.output_dir, record['filename'])
+        return path if os.path.exists(path) else None
+
+
+profiler = RequestProfiler()
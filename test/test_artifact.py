@@ -0,0 +1,142 @@
+import unittest
+import json
+import os
+import pickle
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from src.models.artifact import ArtifactError, SortedVocabulary, is_bundle, load_bundle, save_bundle
+from src.models.complaint_classifier import ComplaintClassifier
+from src.models.compliance_model import ComplianceModel
+
+TEXTS = [
+    'my data was leaked in a breach, passwords stolen',
+    'they shared my information with advertisers without consent',
+    'I asked them to delete my data and nothing happened'
+] * 10
+CATEGORIES = [['security'], ['privacy', 'third_party'], ['access']] * 10
+SEVERITIES = ['high', 'medium', 'low'] * 10
+
+class TestArtifact(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'bundle')
+    
+    def tearDown(self):
+        self.tmp.cleanup()
+    
+    def test_classifier_roundtrip(self):
+        queries = ['the breach exposed my password', 'please delete my data', '']
+        for model_type in ('random_forest', 'linear'):
+            classifier = ComplaintClassifier(model_type=model_type)
+            X = classifier.prepare_complaint_features(TEXTS)
+            classifier.train_category_classifier(X, CATEGORIES)
+            classifier.train_severity_classifier(X, SEVERITIES)
+            
+            classifier.save_bundle(self.path)
+            for mmap in (True, False):
+                loaded = ComplaintClassifier().load_bundle(self.path, mmap=mmap)
+                self.assertEqual(loaded.model_type, model_type)
+                self.assertEqual(loaded.predict_batch(queries), classifier.predict_batch(queries))
+            # Saving does not touch the live vectorizer
+            self.assertIsInstance(classifier.tfidf.vocabulary_, dict)
+    
+    def test_compliance_model_roundtrip(self):
+        rng = np.random.RandomState(0)
+        X = rng.rand(60, 40)
+        y = (X[:, 0] > 0.5).astype(int)
+        model = ComplianceModel(model_type='logistic_regression')
+        model.model.fit(X, y)
+        
+        model.save_bundle(self.path)
+        loaded = ComplianceModel().load_bundle(self.path)
+        
+        self.assertTrue(is_bundle(self.path))
+        self.assertEqual(loaded.model_type, 'logistic_regression')
+        np.testing.assert_array_equal(loaded.model.predict_proba(X), model.model.predict_proba(X))
+    
+    def test_every_compliance_model_type_roundtrips(self):
+        rng = np.random.RandomState(0)
+        X = rng.rand(90, 8)
+        for n_classes in (2, 3):
+            y = np.minimum((X[:, 0] * n_classes).astype(int), n_classes - 1)
+            for model_type in ('random_forest', 'gradient_boosting', 'svm', 'naive_bayes', 'sgd'):
+                with self.subTest(model_type=model_type, n_classes=n_classes):
+                    model = ComplianceModel(model_type=model_type).train(X, y)
+                    model.save_bundle(self.path)
+                    loaded = ComplianceModel().load_bundle(self.path)
+                    
+                    self.assertEqual(loaded.model_type, model_type)
+                    np.testing.assert_array_equal(loaded.predict_proba(X), model.predict_proba(X))
+    
+    def test_large_arrays_are_memory_mapped_and_read_only(self):
+        save_bundle(self.path, {'weights': np.arange(10000, dtype=np.float64), 'small': np.arange(3)}, 'test')
+        
+        state = load_bundle(self.path, 'test')
+        
+        np.testing.assert_array_equal(state['weights'], np.arange(10000))
+        self.assertFalse(state['weights'].flags.writeable)
+        self.assertIsInstance(state['weights'].base, np.memmap)
+        self.assertTrue(state['small'].flags.writeable)
+    
+    def test_save_replaces_existing_bundle(self):
+        save_bundle(self.path, {'value': 1}, 'test')
+        save_bundle(self.path, {'value': 2}, 'test')
+        
+        self.assertEqual(load_bundle(self.path, 'test'), {'value': 2})
+        self.assertEqual(os.listdir(self.tmp.name), ['bundle'])
+    
+    def test_checksum_mismatch(self):
+        save_bundle(self.path, {'weights': np.ones(1000)}, 'test')
+        with open(os.path.join(self.path, 'arrays.npys'), 'r+b') as f:
+            f.seek(-8, os.SEEK_END)
+            f.write(b'\1' * 8)
+        
+        with self.assertRaises(ArtifactError):
+            load_bundle(self.path, 'test')
+    
+    def test_kind_and_version_mismatch(self):
+        save_bundle(self.path, {'value': 1}, 'test')
+        with self.assertRaises(ArtifactError):
+            load_bundle(self.path, 'other')
+        
+        manifest_path = os.path.join(self.path, 'manifest.json')
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        manifest['format_version'] = 99
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        with self.assertRaises(ArtifactError):
+            load_bundle(self.path, 'test')
+    
+    def test_disallowed_class(self):
+        save_bundle(self.path, {'value': 1}, 'test')
+        with open(os.path.join(self.path, 'model.pkl'), 'wb') as f:
+            pickle.dump(os.system, f)
+        
+        with self.assertRaises(ArtifactError):
+            load_bundle(self.path, 'test', verify=False)
+    
+    def test_only_listed_classes_resolve(self):
+        save_bundle(self.path, {'value': 1}, 'test')
+        # Callables inside allowed packages, and getattr, are refused too
+        for obj in (np.load, getattr, np.random.RandomState.seed):
+            with open(os.path.join(self.path, 'model.pkl'), 'wb') as f:
+                pickle.dump(obj, f)
+            with self.assertRaises(ArtifactError):
+                load_bundle(self.path, 'test', verify=False)
+    
+    def test_sorted_vocabulary(self):
+        vocabulary = SortedVocabulary({'privacy': 2, 'breach': 0, 'data': 1})
+        
+        self.assertEqual(vocabulary['data'], 1)
+        self.assertEqual(vocabulary.get('missing'), None)
+        self.assertNotIn('missing', vocabulary)
+        self.assertEqual(dict(vocabulary), {'breach': 0, 'data': 1, 'privacy': 2})
+        self.assertEqual(dict(pickle.loads(pickle.dumps(vocabulary))), dict(vocabulary))
+        self.assertEqual(len(SortedVocabulary({})), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+import signal
+import tempfile
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.batch_engine import BatchEngine
+
+class StubChecker:
+    def check_policy_compliance(self, policy_text):
+        if policy_text == 'fail':
+            raise ValueError('cannot parse policy')
+        if policy_text == 'slow':
+            time.sleep(5)
+        if policy_text.startswith('hang:'):
+            # Ignores the per-item alarm, like a C extension stuck without returning to Python
+            signal.pthread_sigmask(signal.SIG_BLOCK, [signal.SIGALRM])
+            with open(policy_text[5:], 'w') as f:
+                f.write(str(os.getpid()))
+            time.sleep(60)
+        return {'compliance_percentage': len(policy_text), 'rule_violations': [], 'warnings': []}
+
+class TestBatchEngine(unittest.TestCase):
+    def setUp(self):
+        self.policies = [
+            {'id': 'a', 'text': 'one'},
+            {'id': 'b', 'text': 'fail'},
+            {'id': 'c'},
+            {'id': 'd', 'text': 'three'},
+            'not a policy',
+            {'id': 'e', 'text': 'slow'}
+        ]
+    
+    def assert_results(self, results):
+        self.assertEqual([r['policy_id'] for r in results], ['a', 'b', 'c', 'd', 'unknown', 'e'])
+        self.assertEqual([r['status'] for r in results], ['ok', 'error', 'error', 'ok', 'error', 'timeout'])
+        self.assertEqual(results[0]['compliance_percentage'], 3)
+        self.assertEqual(results[1]['error'], 'cannot parse policy')
+        self.assertEqual(results[3]['compliance_percentage'], 5)
+    
+    def test_inline_preserves_order_and_reports_failures(self):
+        engine = BatchEngine(max_workers=1, item_timeout=0.2, checker_factory=StubChecker)
+        self.assert_results(engine.check_policies(self.policies))
+    
+    def test_process_pool_preserves_order_and_reports_failures(self):
+        engine = BatchEngine(max_workers=2, chunk_size=1, item_timeout=0.2,
+                             inline_threshold=0, checker_factory=StubChecker)
+        try:
+            policies = self.policies + [{'id': f"p{i}", 'text': 'x' * i} for i in range(20)]
+            results = engine.check_policies(policies)
+        finally:
+            engine.shutdown()
+        
+        self.assert_results(results[:6])
+        self.assertEqual([r['compliance_percentage'] for r in results[6:]], list(range(20)))
+
+    @unittest.skipUnless(hasattr(signal, 'pthread_sigmask'), 'needs POSIX signals')
+    def test_hung_workers_are_killed_at_the_deadline(self):
+        engine = BatchEngine(max_workers=2, chunk_size=1, item_timeout=0.1,
+                             inline_threshold=0, checker_factory=StubChecker)
+        with tempfile.TemporaryDirectory() as directory:
+            pid_path = os.path.join(directory, 'pid')
+            try:
+                results = engine.check_policies([{'id': 'h', 'text': f"hang:{pid_path}"}, {'id': 'a', 'text': 'one'}])
+                self.assertEqual([r['status'] for r in results], ['timeout', 'ok'])
+                # A fresh pool serves the next batch
+                self.assertEqual(engine.check_policies([{'text': 'one'}, {'text': 'two'}])[1]['status'], 'ok')
+            finally:
+                engine.shutdown()
+            
+            with open(pid_path) as f:
+                pid = int(f.read())
+        deadline = time.time() + 5
+        while time.time() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            self.fail(f"Hung worker {pid} is still running")
+
+if __name__ == '__main__':
+    unittest.main()
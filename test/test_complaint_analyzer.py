@@ -45,6 +45,42 @@ class TestComplaintAnalyzer(unittest.TestCase):
         
         self.assertEqual(report['total_complaints'], 3)
     
+    def test_generate_complaint_report_leaves_input_unchanged(self):
+        original = self.sample_df.copy()
+        
+        report = self.analyzer.generate_complaint_report(self.sample_df)
+        
+        pd.testing.assert_frame_equal(self.sample_df, original)
+        self.assertEqual(report['trends']['monthly_counts'], {'2024-01': '3'})
+    
+    def test_generate_complaint_report_categorical_columns(self):
+        categorical = self.sample_df.astype({'category': 'category', 'severity': 'category'})
+        categorical = categorical[categorical['severity'] != 'low']
+        
+        report = self.analyzer.generate_complaint_report(categorical)
+        
+        self.assertEqual(report['category_distribution'], {'security': 1, 'privacy': 1})
+        self.assertEqual(report['severity_distribution'], {'high': 1, 'medium': 1})
+    
+    def test_analyze_complaints_matches_per_item(self):
+        texts = pd.Series([
+            self.sample_complaint,
+            "I am very happy with the service, it was resolved quickly!",
+            "URGENT: I cannot access my account and I'm angry... fix it ASAP",
+            "",
+            "12345 !!!"
+        ], index=[10, 11, 12, 13, 14])
+        
+        batch = self.analyzer.analyze_complaints(texts, batch_size=2)
+        
+        self.assertEqual(list(batch.index), list(texts.index))
+        for index, text in texts.items():
+            result = self.analyzer.analyze_complaint(text)
+            row = batch.loc[index]
+            for name, value in result['features'].items():
+                self.assertEqual(row[name], value, f"{name} differs for {text!r}")
+            self.assertEqual(row['sentiment_score'], result['sentiment_score'])
+    
     def test_calculate_sentiment_score(self):
         result = self.analyzer.analyze_complaint("I am very happy with the service")
         self.assertIsInstance(result['sentiment_score'], float)
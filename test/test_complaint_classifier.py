@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import itertools
+import tempfile
+import pandas as pd
+from src.models.complaint_classifier import ComplaintClassifier
+
+TEXTS = [
+    'my data was leaked in a breach, passwords stolen',
+    'hackers got into the account, security breach',
+    'they shared my information with advertisers without consent',
+    'my details were sold to third parties',
+    'I asked them to delete my data and nothing happened',
+    'they keep my records years after I closed the account'
+] * 5
+CATEGORIES = [['security'], ['security'], ['privacy', 'third_party'], ['third_party'], ['access'], ['retention']] * 5
+SEVERITIES = ['high', 'high', 'medium', 'medium', 'low', 'low'] * 5
+
+class TestComplaintClassifier(unittest.TestCase):
+    def train(self, model_type):
+        classifier = ComplaintClassifier(model_type=model_type)
+        X = classifier.prepare_complaint_features(TEXTS)
+        classifier.train_category_classifier(X, CATEGORIES)
+        classifier.train_severity_classifier(X, SEVERITIES)
+        return classifier
+    
+    def test_predict_batch_matches_predict_all(self):
+        queries = ['the breach exposed my password', 'sold my details', 'please delete my data', '']
+        for model_type in ('random_forest', 'linear'):
+            classifier = self.train(model_type)
+            
+            batch = classifier.predict_batch(queries)
+            
+            self.assertEqual(len(batch), len(queries))
+            for query, prediction in zip(queries, batch):
+                categories, severity = classifier.predict_all(query)
+                self.assertEqual(prediction[0], categories)
+                self.assertEqual(prediction[1], severity)
+    
+    def test_linear_model(self):
+        classifier = self.train('linear')
+        
+        categories, severity = classifier.predict_all('security breach, hackers stole passwords')
+        
+        self.assertIn('security', categories)
+        self.assertEqual(severity, 'high')
+        self.assertEqual(classifier.predict_batch([]), [])
+    
+    def test_online_partial_fit(self):
+        classifier = ComplaintClassifier(model_type='online')
+        for epoch in range(5):
+            for start in range(0, len(TEXTS), 6):
+                classifier.partial_fit(TEXTS[start:start + 6], CATEGORIES[start:start + 6], SEVERITIES[start:start + 6],
+                                       category_classes=['security', 'privacy', 'third_party', 'access', 'retention'],
+                                       severity_classes=['low', 'medium', 'high'])
+        
+        categories, severity = classifier.predict_all('security breach, hackers stole passwords')
+        
+        self.assertIn('security', categories)
+        self.assertEqual(severity, 'high')
+        with self.assertRaises(ValueError):
+            classifier.partial_fit(TEXTS[:1], [['billing']], ['high'])
+    
+    def test_online_requires_classes_first(self):
+        with self.assertRaises(ValueError):
+            ComplaintClassifier(model_type='online').partial_fit(TEXTS, CATEGORIES, SEVERITIES)
+        with self.assertRaises(ValueError):
+            ComplaintClassifier(model_type='linear').partial_fit(TEXTS, CATEGORIES, SEVERITIES)
+    
+    def test_train_incremental_resumes_from_checkpoint(self):
+        frame = pd.DataFrame({
+            'description': TEXTS,
+            'category': [labels[0] for labels in CATEGORIES],
+            'severity': SEVERITIES
+        })
+        chunks = lambda: (frame.iloc[start:start + 4] for start in range(0, len(frame), 4))
+        classes = {'category_classes': set(frame['category']), 'severity_classes': set(frame['severity'])}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, 'online')
+            classifier = ComplaintClassifier(model_type='online')
+            self.assertEqual(classifier.train_incremental(itertools.islice(chunks(), 3), source='day-1',
+                                                          checkpoint_path=checkpoint, checkpoint_every=2, **classes), 12)
+            
+            resumed = ComplaintClassifier().load_bundle(checkpoint, mmap=False)
+            self.assertEqual(resumed.model_type, 'online')
+            self.assertEqual(resumed.trained_rows, {'day-1': 12})
+            self.assertEqual(resumed.train_incremental(chunks(), source='day-1', checkpoint_path=checkpoint), len(frame) - 12)
+            self.assertEqual(resumed.train_incremental(chunks(), source='day-1', checkpoint_path=checkpoint), 0)
+            self.assertEqual(ComplaintClassifier().load_bundle(checkpoint).trained_rows, {'day-1': len(frame)})
+
+if __name__ == '__main__':
+    unittest.main()
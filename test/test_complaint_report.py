@@ -0,0 +1,116 @@
+import unittest
+import sys
+import os
+import io
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.complaint_analyzer import ComplaintAnalyzer
+from src.complaint_report import SpaceSaving, ComplaintReportBuilder
+import pandas as pd
+
+class TestSpaceSaving(unittest.TestCase):
+    def test_exact_below_capacity(self):
+        counter = SpaceSaving(capacity=10)
+        counter.update({'a': 3, 'b': 1})
+        counter.update({'b': 4, 'c': 2})
+        
+        self.assertEqual(counter.top(2), [('b', 5), ('a', 3)])
+        self.assertEqual(counter.floor, 0)
+    
+    def test_bounded_with_heavy_hitters(self):
+        counter = SpaceSaving(capacity=20)
+        true_counts = Counter()
+        for batch in range(50):
+            counts = {f"rare{batch}_{i}": 1 for i in range(30)}
+            counts.update({'heavy': 10, 'frequent': 5})
+            counter.update(counts)
+            true_counts.update(counts)
+        
+        self.assertLessEqual(len(counter), 20)
+        self.assertEqual([word for word, _ in counter.top(2)], ['heavy', 'frequent'])
+        for word, count in counter.top(5):
+            self.assertGreaterEqual(count, true_counts[word])
+            self.assertLessEqual(count - counter.errors[word], true_counts[word])
+
+class TestComplaintReportBuilder(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = ComplaintAnalyzer()
+        self.sample_df = pd.DataFrame({
+            'complaint_id': [1, 2, 3, 4, 5],
+            'description': ['Data breach', 'Unauthorized sharing of data', 'Poor security', None, 'Data sold'],
+            'category': ['security', 'privacy', 'security', 'privacy', 'security'],
+            'date_received': ['2024-01-01', '2024-01-15', '2024-02-03', '2024-03-09', '2023-12-30'],
+            'severity': ['high', 'medium', 'low', 'low', 'high']
+        })
+    
+    def test_chunks_match_whole_frame(self):
+        expected = self.analyzer.generate_complaint_report(self.sample_df.copy())
+        
+        builder = ComplaintReportBuilder(self.analyzer)
+        for start in range(0, len(self.sample_df), 2):
+            builder.add(self.sample_df.iloc[start:start + 2])
+        report = builder.report()
+        
+        self.assertEqual(report['total_complaints'], 5)
+        self.assertEqual(report['category_distribution'], expected['category_distribution'])
+        self.assertEqual(report['severity_distribution'], expected['severity_distribution'])
+        self.assertEqual(report['date_range'], {'start': '2023-12-30', 'end': '2024-03-09'})
+        self.assertEqual(report['trends']['monthly_counts'], expected['trends']['monthly_counts'])
+        # Every word fits in the top 10 here, and ties keep first-seen order in both
+        self.assertEqual(report['common_issues'], expected['common_issues'])
+        self.assertEqual(report['common_issues'][0], {'word': 'data', 'frequency': 3})
+        self.assertEqual([issue['word'] for issue in report['common_issues'][1:4]], ['breach', 'unauthorized', 'sharing'])
+    
+    def test_report_from_csv(self):
+        csv_file = io.BytesIO(self.sample_df.to_csv(index=False).encode('utf-8'))
+        progress = []
+        
+        report = self.analyzer.generate_complaint_report_from_csv(
+            csv_file, chunksize=2, progress=lambda done, total: progress.append((done, total))
+        )
+        
+        self.assertEqual(report['total_complaints'], 5)
+        self.assertEqual(report['category_distribution'], {'security': 3, 'privacy': 2})
+        self.assertEqual(report['trends']['monthly_counts'], {'2023-12': '1', '2024-01': '2', '2024-02': '1', '2024-03': '1'})
+        self.assertEqual(len(progress), 3)
+        self.assertEqual(progress[-1][0], progress[-1][1])
+    
+    def test_concurrent_reports(self):
+        frames = []
+        for offset in range(8):
+            frame = self.sample_df.copy()
+            frame['category'] = [f"category{offset}"] * (offset % 3 + 1) + ['other'] * (len(frame) - offset % 3 - 1)
+            frames.append(frame)
+        uploads = [frame.to_csv(index=False).encode('utf-8') for frame in frames]
+        expected = [self.analyzer.generate_complaint_report_from_csv(io.BytesIO(upload), chunksize=2)
+                    for upload in uploads]
+        shared_df = self.sample_df.copy()
+        
+        def run(index):
+            streamed = self.analyzer.generate_complaint_report_from_csv(io.BytesIO(uploads[index % 8]), chunksize=2)
+            in_memory = self.analyzer.generate_complaint_report(shared_df)
+            return index, streamed, in_memory
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(run, range(64)))
+        
+        baseline = self.analyzer.generate_complaint_report(self.sample_df.copy())
+        for index, streamed, in_memory in results:
+            self.assertEqual(streamed, expected[index % 8])
+            self.assertEqual(in_memory, baseline)
+        self.assertEqual(list(shared_df.columns), list(self.sample_df.columns))
+    
+    def test_missing_columns(self):
+        builder = ComplaintReportBuilder(self.analyzer)
+        builder.add(pd.DataFrame({'complaint_id': [1, 2]}))
+        report = builder.report()
+        
+        self.assertEqual(report['total_complaints'], 2)
+        self.assertEqual(report['common_issues'], [])
+        self.assertNotIn('date_range', report)
+        self.assertEqual(report['trends'], {})
+
+if __name__ == '__main__':
+    unittest.main()
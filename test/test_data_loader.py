@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from docx import Document
+from src.data_loader import DataLoader, DocumentTooLarge
+from benchmarks.synthetic import render_pdf
+
+class TestDataLoader(unittest.TestCase):
+    def setUp(self):
+        self.loader = DataLoader(os.path.join(os.path.dirname(__file__), '..', 'config.yaml'))
+        self.tmpdir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def write_file(self, name, data):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+    
+    def assert_stream_matches_file(self, name, data, expected_pieces):
+        path = self.write_file(name, data)
+        pieces = list(self.loader.iter_policy_text(io.BytesIO(data), name))
+        
+        self.assertEqual(len(pieces), expected_pieces)
+        self.assertEqual(''.join(pieces), self.loader.load_policy_document(path))
+    
+    def test_iter_txt(self):
+        data = 'DATA COLLECTION:\r\nWe collect data.\n'.encode() * 10000
+        self.assert_stream_matches_file('policy.txt', data, 7)
+    
+    def test_iter_docx(self):
+        doc = Document()
+        for index in range(5):
+            doc.add_paragraph(f"Section {index}: we collect data.")
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        
+        self.assert_stream_matches_file('policy.docx', buffer.getvalue(), 5)
+    
+    def test_iter_pdf(self):
+        data = render_pdf(['SECURITY:\nWe encrypt data.', 'CONSENT:\nYou agree.', 'USER RIGHTS:\nAccess it.'])
+        self.assert_stream_matches_file('policy.pdf', data, 3)
+    
+    def test_load_complaints_data_categorical(self):
+        path = self.write_file('complaints.csv', (
+            'complaint_id,description,category,date_received,severity\n'
+            '1,Data breach,security,2024-01-01,high\n'
+            '2,Unauthorized sharing,privacy,2024-01-02,high\n'
+        ).encode())
+        
+        df = self.loader.load_complaints_data(path)
+        
+        self.assertEqual(df['category'].dtype, 'category')
+        self.assertEqual(df['severity'].dtype, 'category')
+        self.assertEqual(list(df['severity'].cat.categories), ['high'])
+    
+    def test_limits(self):
+        data = render_pdf(['page one', 'page two'])
+        
+        with self.assertRaises(DocumentTooLarge):
+            list(self.loader.iter_policy_text(io.BytesIO(data), 'policy.pdf', max_pages=1))
+        with self.assertRaises(DocumentTooLarge):
+            list(self.loader.iter_policy_text(io.BytesIO(data), 'policy.pdf', max_bytes=100))
+        with self.assertRaises(DocumentTooLarge):
+            list(self.loader.iter_policy_text(io.BytesIO(b'x' * 200000), 'policy.txt', max_bytes=100000))
+    
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            self.loader.iter_policy_text(io.BytesIO(b''), 'policy.rtf')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from benchmarks.synthetic import generate_policy
+from src.feature_engineer import FeatureEngineer
+
+class TestFeatureEngineer(unittest.TestCase):
+    def setUp(self):
+        self.texts = [generate_policy(n_sections=2, sentences_per_section=4, seed=seed) + f" term{seed % 7}"
+                      for seed in range(60)]
+    
+    def test_matches_separate_vectorizers(self):
+        engineer = FeatureEngineer(max_features=40, max_count_features=20, n_components=5, random_state=0)
+        
+        features, fitted_counts = engineer.extract_text_features(self.texts, return_counts=True)
+        
+        tfidf = TfidfVectorizer(max_features=40, stop_words='english').fit_transform(self.texts)
+        np.testing.assert_allclose(features, TruncatedSVD(n_components=5, random_state=0).fit_transform(tfidf))
+        counts = CountVectorizer(max_features=20, stop_words='english').fit(self.texts)
+        self.assertEqual((engineer.transform_count_features(self.texts) != counts.transform(self.texts)).nnz, 0)
+        self.assertEqual((fitted_counts != counts.transform(self.texts)).nnz, 0)
+    
+    def test_transform_is_cached_per_document(self):
+        engineer = FeatureEngineer(n_components=5, cache_size=3, random_state=0).fit_text_features(self.texts)
+        
+        first = engineer.transform_text_features(self.texts[:3])
+        again = engineer.transform_text_features([self.texts[2], self.texts[0], self.texts[2]])
+        
+        np.testing.assert_array_equal(again, first[[2, 0, 2]])
+        engineer.transform_text_features(self.texts[3:6])
+        self.assertEqual(len(engineer._transform_cache), 3)
+        self.assertTrue(all(row.base is None for row in engineer._transform_cache.values()))
+        self.assertEqual(engineer.transform_text_features([]).shape, (0, 5))
+    
+    def test_transform_requires_fit(self):
+        with self.assertRaises(ValueError):
+            FeatureEngineer().transform_text_features(self.texts)
+    
+    def test_scaler_and_encoder_fit_once(self):
+        engineer = FeatureEngineer()
+        
+        engineer.scale_features(np.array([[0.0], [2.0]]))
+        engineer.encode_categorical(['low', 'high'])
+        
+        np.testing.assert_array_equal(engineer.scale_features(np.array([[1.0]])), [[0.0]])
+        np.testing.assert_array_equal(engineer.scale_features(np.array([[1.0], [3.0]]), fit=True), [[-1.0], [1.0]])
+        np.testing.assert_array_equal(engineer.encode_categorical(['low']), [1])
+    
+    def test_save_and_load_state(self):
+        engineer = FeatureEngineer(n_components=5, random_state=0).fit_text_features(self.texts)
+        engineer.encode_categorical(['low', 'high'])
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            engineer.save_state(os.path.join(tmp, 'features'))
+            loaded = FeatureEngineer().load_state(os.path.join(tmp, 'features'))
+            
+            np.testing.assert_allclose(loaded.transform_text_features(self.texts[:5]),
+                                       engineer.transform_text_features(self.texts[:5]))
+            self.assertEqual(list(loaded.label_encoder.classes_), ['high', 'low'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+from scipy import sparse
+from src.utils.freeze import freeze_arrays
+
+class Model:
+    def __init__(self):
+        self.weights = np.ones(100000)
+        self.bias = np.zeros(4)
+        self.layers = [{'matrix': sparse.random(500, 500, density=0.2, format='csr', random_state=0)}]
+        self.shared = self.weights
+
+class TestFreezeArrays(unittest.TestCase):
+    def test_freezes_large_arrays_once(self):
+        model = Model()
+        matrix = model.layers[0]['matrix']
+        
+        count, nbytes = freeze_arrays(model)
+        
+        self.assertFalse(model.weights.flags.writeable)
+        self.assertFalse(matrix.data.flags.writeable)
+        self.assertTrue(model.bias.flags.writeable)
+        self.assertEqual(count, 3)
+        self.assertEqual(nbytes, model.weights.nbytes + matrix.data.nbytes + matrix.indices.nbytes)
+        with self.assertRaises(ValueError):
+            model.weights[0] = 2
+        self.assertEqual(freeze_arrays(model), (0, 0))
+    
+    def test_none(self):
+        self.assertEqual(freeze_arrays(None), (0, 0))
+
+if __name__ == '__main__':
+    unittest.main()
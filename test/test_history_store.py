@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.history_store import InMemoryHistoryStore, SQLiteHistoryStore
+
+def make_record(policy_id, days_ago, version=1):
+    timestamp = datetime.now() - timedelta(days=days_ago)
+    return {
+        'policy_id': policy_id,
+        'new_version': version,
+        'update_timestamp': timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        'similarity_score': 0.9,
+        'changes_detail': []
+    }
+
+class HistoryStoreTests:
+    def make_store(self, **kwargs):
+        raise NotImplementedError
+    
+    def test_query_filters_and_orders_newest_first(self):
+        store = self.make_store()
+        store.add(make_record('a', 40, 1))
+        store.add(make_record('a', 5, 2))
+        store.add(make_record('b', 3, 1))
+        store.add(make_record('a', 1, 3))
+        
+        since = (datetime.now() - timedelta(days=30)).timestamp()
+        self.assertEqual([r['new_version'] for r in store.query('a', since)], [3, 2])
+        self.assertEqual([(r['policy_id'], r['new_version']) for r in store.query(since=since)],
+                         [('a', 3), ('b', 1), ('a', 2)])
+        self.assertEqual(len(store.query()), 4)
+    
+    def test_max_records_bound(self):
+        store = self.make_store(max_records=3)
+        for version in range(10):
+            store.add(make_record('a', 0, version))
+        store.compact()
+        
+        self.assertEqual(store.count(), 3)
+        self.assertEqual([r['new_version'] for r in store.iter_records()], [7, 8, 9])
+    
+    def test_max_age_compaction(self):
+        store = self.make_store(max_age_days=10)
+        store.add(make_record('a', 20))
+        store.add(make_record('a', 2))
+        store.compact()
+        
+        self.assertEqual(store.count(), 1)
+    
+    def test_entries_by_id(self):
+        store = self.make_store(max_records=3)
+        ids = [store.add(make_record('a', 0, version)) for version in range(5)]
+        store.compact()
+        
+        self.assertEqual([r['new_version'] for _, r in store.iter_entries(after_id=ids[2])], [3, 4])
+        records = store.get_records([ids[0], ids[4]])
+        self.assertEqual(list(records), [ids[4]])
+        self.assertEqual(records[ids[4]]['new_version'], 4)
+
+class TestInMemoryHistoryStore(HistoryStoreTests, unittest.TestCase):
+    def make_store(self, **kwargs):
+        return InMemoryHistoryStore(**kwargs)
+
+class TestSQLiteHistoryStore(HistoryStoreTests, unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def make_store(self, **kwargs):
+        return SQLiteHistoryStore(os.path.join(self.tmpdir.name, 'history.db'), **kwargs)
+    
+    def test_history_persists_across_instances(self):
+        self.make_store().add(make_record('a', 1))
+        
+        self.assertEqual([r['policy_id'] for r in self.make_store().query('a')], ['a'])
+    
+    def test_compacts_automatically(self):
+        store = self.make_store(max_records=5, compact_every=10)
+        for version in range(25):
+            store.add(make_record('a', 0, version))
+        
+        self.assertLessEqual(store.count(), 15)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.job_queue import JobStore, JobQueue
+
+def wait_for_status(store, job_id, statuses, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job['status'] in statuses:
+            return job
+        time.sleep(0.02)
+    return store.get(job_id)
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmpdir.name, 'jobs.db'))
+        self.release = threading.Event()
+        
+        def count_words(payload, context):
+            texts = payload['texts']
+            counts = []
+            for text in texts:
+                counts.append(len(text.split()))
+                context.progress(len(counts), len(texts))
+            return {'counts': counts}
+        
+        def blocking(payload, context):
+            while not self.release.is_set():
+                context.progress(0, 1)
+                time.sleep(0.01)
+            return {'done': True}
+        
+        def broken(payload, context):
+            raise ValueError('bad payload')
+        
+        def silent(payload, context):
+            self.release.wait(5)
+            return {'done': True}
+        
+        self.handlers = {'count_words': count_words, 'blocking': blocking, 'broken': broken, 'silent': silent}
+        self.queue = JobQueue(self.store, self.handlers, num_workers=2, poll_interval=0.01)
+    
+    def tearDown(self):
+        self.release.set()
+        self.queue.stop(timeout=2)
+        self.tmpdir.cleanup()
+    
+    def test_job_completes_with_result(self):
+        self.queue.start()
+        job_id = self.queue.submit('count_words', {'texts': ['a b', 'c d e']})
+        
+        job = wait_for_status(self.store, job_id, ('completed',))
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['progress'], 1.0)
+        self.assertEqual(self.store.get(job_id, include_result=True)['result'], {'counts': [2, 3]})
+    
+    def test_failed_job_reports_error(self):
+        self.queue.start()
+        job_id = self.queue.submit('broken', {})
+        
+        job = wait_for_status(self.store, job_id, ('failed',))
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'bad payload')
+    
+    def test_unknown_job_type_rejected(self):
+        with self.assertRaises(ValueError):
+            self.queue.submit('missing', {})
+    
+    def test_cancel_queued_and_running_jobs(self):
+        queued_id = self.queue.submit('count_words', {'texts': ['a']})
+        self.assertEqual(self.store.request_cancel(queued_id)['status'], 'cancelled')
+        
+        self.queue.start()
+        running_id = self.queue.submit('blocking', {})
+        wait_for_status(self.store, running_id, ('running',))
+        self.store.request_cancel(running_id)
+        
+        job = wait_for_status(self.store, running_id, ('cancelled',))
+        self.assertEqual(job['status'], 'cancelled')
+        self.assertEqual(self.store.get(queued_id)['status'], 'cancelled')
+    
+    def test_stale_running_job_requeued_on_restart(self):
+        job_id = self.store.create('count_words', {'texts': ['a b c']})
+        self.assertEqual(self.store.claim_next(), (job_id, 'count_words'))
+        
+        # Simulate a worker that died mid-job: no heartbeat since claiming
+        restarted = JobQueue(self.store, self.handlers, num_workers=1, poll_interval=0.01, stale_after=0)
+        try:
+            time.sleep(0.01)
+            restarted.start()
+            job = wait_for_status(self.store, job_id, ('completed',))
+        finally:
+            restarted.stop(timeout=2)
+        
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['attempts'], 2)
+
+    def test_running_job_without_progress_is_not_stale(self):
+        queue = JobQueue(self.store, self.handlers, num_workers=1, poll_interval=0.01, stale_after=0.3,
+                         heartbeat_interval=0.05)
+        try:
+            queue.start()
+            job_id = queue.submit('silent', {})
+            wait_for_status(self.store, job_id, ('running',))
+            time.sleep(0.5)
+            self.assertEqual(self.store.requeue_stale(0.3), 0)
+            self.release.set()
+            job = wait_for_status(self.store, job_id, ('completed',))
+        finally:
+            queue.stop(timeout=2)
+        
+        self.assertEqual(job['attempts'], 1)
+    
+    def test_cleanup_runs_for_jobs_cancelled_before_start(self):
+        cleaned = []
+        queue = JobQueue(self.store, self.handlers, cleanup={'count_words': cleaned.append})
+        
+        queued_id = queue.submit('count_words', {'texts': ['a']})
+        self.assertEqual(queue.cancel(queued_id)['status'], 'cancelled')
+        self.assertEqual(cleaned, [{'texts': ['a']}])
+        self.assertIsNone(queue.cancel('missing'))
+        
+        running_id = queue.submit('count_words', {'texts': ['b']})
+        self.store.claim_next()
+        queue.cancel(running_id)
+        self.assertEqual(len(cleaned), 1)
+
+if __name__ == '__main__':
+    unittest.main()
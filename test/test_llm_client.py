@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from unittest import mock
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.gemini_stub import start_stub
+from src.llm_client import (
+    CircuitBreaker, CircuitOpen, ClientBusy, EmptyResponse, GeminiClient, LLMError, chat_cache_key
+)
+
+class TestGeminiClient(unittest.TestCase):
+    def setUp(self):
+        self.stub = start_stub(latency=0.0, jitter=0.0)
+        self.base_url = f"http://127.0.0.1:{self.stub.server_address[1]}"
+
+    def tearDown(self):
+        self.stub.shutdown()
+        self.stub.server_close()
+
+    def client(self, **options):
+        options = dict({'api_key': 'test', 'base_url': self.base_url, 'backoff': 0.01, 'max_backoff': 0.02}, **options)
+        return GeminiClient(**options)
+
+    def test_answers_and_caches_normalized_questions(self):
+        client = self.client()
+        history = [{'role': 'user', 'content': 'Hi'}, {'role': 'assistant', 'content': 'Hello'}]
+
+        answer = client.generate('What does GDPR require?', history)
+        self.assertIn('What does GDPR require?', answer)
+        self.assertEqual(client.generate('  what does   gdpr require? ', history), answer)
+        self.assertEqual(self.stub.calls, 1)
+
+        client.generate('What does GDPR require?')
+        self.assertEqual(self.stub.calls, 2)
+
+    def test_retries_then_opens_circuit(self):
+        self.stub.error_rate = 1.0
+        client = self.client(retries=2, failure_threshold=2, reset_timeout=60)
+
+        for _ in range(2):
+            with self.assertRaises(LLMError):
+                client.generate('question')
+        self.assertEqual(self.stub.calls, 6)
+
+        start = time.perf_counter()
+        with self.assertRaises(CircuitOpen):
+            client.generate('question')
+        self.assertLess(time.perf_counter() - start, 0.05)
+        self.assertEqual(self.stub.calls, 6)
+
+    def test_client_errors_are_not_retried(self):
+        client = self.client(base_url=self.base_url + '/missing', retries=3)
+        with self.assertRaises(LLMError):
+            client.generate('question')
+        self.assertEqual(self.stub.calls, 0)
+
+    def test_read_timeout(self):
+        self.stub.latency = 0.5
+        client = self.client(read_timeout=0.05, retries=1)
+        start = time.perf_counter()
+        with self.assertRaises(LLMError):
+            client.generate('slow question')
+        self.assertLess(time.perf_counter() - start, 0.4)
+
+    def test_concurrency_limit(self):
+        self.stub.latency = 0.3
+        client = self.client(max_concurrent=1)
+        slow = threading.Thread(target=client.generate, args=('first',))
+        slow.start()
+        time.sleep(0.1)
+        with self.assertRaises(ClientBusy):
+            client.generate('second')
+        slow.join()
+        self.assertEqual(client.generate('first'), client.cache.get(chat_cache_key('first')))
+
+    def test_missing_key_skips_upstream(self):
+        with self.assertRaises(LLMError):
+            self.client(api_key=None).generate('question')
+        self.assertEqual(self.stub.calls, 0)
+
+    def test_empty_response_keeps_circuit_closed(self):
+        client = self.client(failure_threshold=1)
+        with mock.patch.object(GeminiClient, '_parse', side_effect=EmptyResponse('no candidates')):
+            with self.assertRaises(EmptyResponse):
+                client.generate('question')
+        self.assertEqual(client.breaker.state, 'closed')
+
+    def test_unexpected_errors_settle_half_open_trial(self):
+        import requests
+        client = self.client(failure_threshold=1, reset_timeout=0)
+        client.breaker.record_failure()
+        self.assertEqual(client.breaker.state, 'half_open')
+
+        # Each trial is recorded as a failure, so the next one is let through instead of CircuitOpen
+        with mock.patch.object(requests.Session, 'post', side_effect=requests.exceptions.ChunkedEncodingError()):
+            with self.assertRaises(LLMError) as raised:
+                client.generate('question')
+        self.assertNotIsInstance(raised.exception, CircuitOpen)
+        with mock.patch.object(GeminiClient, '_call', side_effect=RuntimeError('bug')):
+            with self.assertRaises(LLMError) as raised:
+                client.generate('question')
+        self.assertNotIsInstance(raised.exception, CircuitOpen)
+
+        self.assertIn('You asked: question', client.generate('question'))
+        self.assertEqual(client.breaker.state, 'closed')
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_half_open_trial(self):
+        now = [0.0]
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker.allow())
+
+        now[0] = 10
+        self.assertTrue(breaker.allow())
+        # Only one trial call at a time
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+
+        now[0] = 20
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, 'closed')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import json
+import subprocess
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.metrics import HTTP_REQUESTS, STAGE_SECONDS, MetricsRegistry
+
+class TestMetrics(unittest.TestCase):
+    def test_disabled_records_nothing(self):
+        registry = MetricsRegistry()
+        
+        @registry.timed('work')
+        def work(value):
+            return value * 2
+        
+        with registry.stage('block'):
+            self.assertEqual(work(2), 4)
+        registry.record_request('/api/health', 'GET', 200, 0.01, 10, 20)
+        
+        self.assertEqual(registry.collect(), {})
+    
+    def test_stages_and_requests(self):
+        registry = MetricsRegistry().configure(enabled=True)
+        
+        @registry.timed('work')
+        def work():
+            return 'done'
+        
+        work()
+        work()
+        with self.assertRaises(ValueError):
+            with registry.stage('failing'):
+                raise ValueError()
+        registry.record_request('/api/jobs/<job_id>', 'GET', 404, 0.002, None, 300)
+        
+        values = registry.collect()
+        self.assertEqual(values[(STAGE_SECONDS, (('stage', 'work'),))][-1], 2)
+        self.assertEqual(values[(STAGE_SECONDS, (('stage', 'failing'),))][-1], 1)
+        self.assertEqual(values[(HTTP_REQUESTS, (('endpoint', '/api/jobs/<job_id>'), ('method', 'GET'), ('status', '404')))], 1)
+        
+        text = registry.render()
+        self.assertIn('# TYPE app_http_requests_total counter', text)
+        self.assertIn('app_http_requests_total{endpoint="/api/jobs/<job_id>",method="GET",status="404"} 1', text)
+        self.assertIn('app_http_response_size_bytes_bucket{endpoint="/api/jobs/<job_id>",le="256"} 0', text)
+        self.assertIn('app_http_response_size_bytes_bucket{endpoint="/api/jobs/<job_id>",le="1024"} 1', text)
+        self.assertIn('app_stage_duration_seconds_count{stage="work"} 2', text)
+        self.assertNotIn('app_http_request_size_bytes', text)
+    
+    def test_aggregates_live_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            worker = MetricsRegistry().configure(enabled=True, multiprocess_dir=directory)
+            worker._pid = os.getppid()
+            worker.increment(HTTP_REQUESTS, endpoint='/api/health', method='GET', status='200')
+            worker.flush()
+            
+            finished = subprocess.run([sys.executable, '-c', 'import os; print(os.getpid())'],
+                                      capture_output=True, text=True, check=True)
+            with open(os.path.join(directory, f"metrics-{finished.stdout.strip()}.json"), 'w') as f:
+                json.dump({'pid': int(finished.stdout), 'values': [[HTTP_REQUESTS, [['endpoint', '/x']], 5]]}, f)
+            
+            registry = MetricsRegistry().configure(enabled=True, multiprocess_dir=directory)
+            registry.increment(HTTP_REQUESTS, endpoint='/api/health', method='GET', status='200')
+            
+            self.assertIn('app_http_requests_total{endpoint="/api/health",method="GET",status="200"} 2',
+                          registry.render())
+            self.assertEqual(len(os.listdir(directory)), 2)
+
+if __name__ == '__main__':
+    unittest.main()
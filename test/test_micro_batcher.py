@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.micro_batcher import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_coalesces_concurrent_calls(self):
+        batches = []
+        release = threading.Event()
+        
+        def square_all(items):
+            batches.append(list(items))
+            release.wait(5)
+            return [item * item for item in items]
+        
+        batcher = MicroBatcher(square_all, max_batch_size=8, max_wait=0.05)
+        with ThreadPoolExecutor(max_workers=20) as executor:
+            futures = [executor.submit(batcher, item) for item in range(20)]
+            release.set()
+            results = [future.result(timeout=5) for future in futures]
+        
+        self.assertEqual(results, [item * item for item in range(20)])
+        self.assertEqual(sorted(item for batch in batches for item in batch), list(range(20)))
+        self.assertTrue(all(len(batch) <= 8 for batch in batches))
+        self.assertLess(len(batches), 20)
+        self.assertEqual(batcher.stats()['items'], 20)
+    
+    def test_single_call_waits_at_most_max_wait(self):
+        batcher = MicroBatcher(lambda items: [item.upper() for item in items], max_wait=0.001)
+        
+        self.assertEqual(batcher('a'), 'A')
+        self.assertEqual(batcher.stats()['batches'], 1)
+    
+    def test_errors_reach_every_caller(self):
+        def fail(items):
+            raise RuntimeError('model unavailable')
+        
+        batcher = MicroBatcher(fail, max_wait=0.01)
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(batcher, item) for item in range(4)]
+            for future in futures:
+                with self.assertRaises(RuntimeError):
+                    future.result(timeout=5)
+    
+    def test_wrong_result_count(self):
+        batcher = MicroBatcher(lambda items: items[:-1], max_wait=0.001)
+        
+        with self.assertRaises(ValueError):
+            batcher('a')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import GridSearchCV, train_test_split
+from src.models.compliance_model import ComplianceModel
+from src.models.model_search import ModelSearch
+
+GRID = {'n_estimators': [5, 20], 'max_depth': [1, None]}
+
+class TestModelSearch(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.X = rng.rand(200, 6)
+        self.y = (self.X[:, 0] + 0.3 * rng.rand(200) > 0.6).astype(int)
+    
+    def test_grid_matches_grid_search_cv(self):
+        expected = GridSearchCV(ComplianceModel().model, GRID, cv=5, scoring='accuracy').fit(self.X, self.y)
+        
+        result = ModelSearch(n_jobs=2).search(self.X, self.y, GRID)
+        
+        self.assertEqual(result['best_params'], expected.best_params_)
+        self.assertAlmostEqual(result['best_score'], expected.best_score_)
+        self.assertEqual(len(result['trials']), 4)
+        for trial in result['trials']:
+            self.assertEqual(trial['status'], 'ok')
+            self.assertGreater(trial['wall_time'], 0)
+    
+    def test_resume_skips_finished_trials(self):
+        texts = [f"we {'encrypt and protect' if label else 'share with partners'} data, policy {i}"
+                 for i, label in enumerate(self.y)]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = ModelSearch(cache_dir=cache_dir).search(texts, self.y, {'n_estimators': [5], 'max_depth': [None]})
+            second = ModelSearch(cache_dir=cache_dir).search(texts, self.y, GRID)
+            
+            self.assertEqual([trial['resumed'] for trial in first['trials']], [False])
+            resumed = [trial['params'] for trial in second['trials'] if trial['resumed']]
+            self.assertEqual(resumed, [{'max_depth': None, 'n_estimators': 5}])
+            self.assertEqual(len([name for name in os.listdir(cache_dir) if name.startswith('folds-')]), 1)
+    
+    def test_halving(self):
+        result = ModelSearch().search(self.X, self.y, GRID, strategy='halving', factor=2)
+        
+        resources = [trial['resource'] for trial in result['trials']]
+        self.assertEqual(resources.count(None), 1)
+        self.assertLess(len(result['trials']), 4 * 3)
+        final = [trial for trial in result['trials'] if trial['resource'] is None][0]
+        self.assertEqual(result['best_params'], final['params'])
+    
+    def test_failed_candidates_are_reported(self):
+        result = ModelSearch().search(self.X, self.y, {'n_estimators': [-1, 5]})
+        
+        self.assertEqual([trial['status'] for trial in result['trials']], ['error', 'ok'])
+        self.assertEqual(result['best_params'], {'n_estimators': 5})
+        with self.assertRaises(ValueError):
+            ModelSearch().search(self.X, self.y, GRID, strategy='bayes')
+    
+    def test_compliance_model_tuning(self):
+        model = ComplianceModel()
+        
+        best_params = model.tune_hyperparameters(self.X, self.y, GRID, strategy='random', n_iter=2)
+        
+        self.assertEqual(model.model.get_params()['n_estimators'], best_params['n_estimators'])
+        self.assertEqual(len(model.search_results['trials']), 2)
+        mean, std = model.cross_validate(self.X, self.y)
+        self.assertGreater(mean, 0.5)
+
+    def test_compliance_model_tuning_on_text(self):
+        texts = [f"we {'encrypt and protect' if label else 'share with partners'} your data, section {i}"
+                 for i, label in enumerate(self.y)]
+        model = ComplianceModel()
+        
+        best_params = model.tune_hyperparameters(texts, self.y, GRID)
+        
+        self.assertEqual(model.model.get_params()['max_depth'], best_params['max_depth'])
+        self.assertIsNotNone(model.feature_engineer)
+        self.assertEqual(list(model.predict(texts[:10])), list(self.y[:10]))
+        with tempfile.TemporaryDirectory() as directory:
+            model.save_bundle(os.path.join(directory, 'model'))
+            loaded = ComplianceModel().load_bundle(os.path.join(directory, 'model'))
+        self.assertEqual(list(loaded.predict(texts[:10])), list(self.y[:10]))
+    
+    def test_pandas_inputs(self):
+        frame = pd.DataFrame(self.X, columns=[f"feature_{i}" for i in range(6)])
+        model = ComplianceModel().train(frame, self.y)
+        self.assertEqual(len(model.predict(frame)), len(self.y))
+        self.assertIsNone(model.feature_engineer)
+        self.assertGreater(ModelSearch().cross_validate(frame, self.y)[0], 0.5)
+        
+        texts = pd.Series([f"we {'encrypt and protect' if label else 'share with partners'} your data, section {i}"
+                           for i, label in enumerate(self.y)])
+        X_train, X_test, y_train, y_test = train_test_split(texts, self.y, random_state=0)
+        self.assertNotEqual(X_train.index[0], 0)
+        model = ComplianceModel().train(X_train, y_train)
+        self.assertIsNotNone(model.feature_engineer)
+        self.assertGreater(model.evaluate(X_test, y_test)['accuracy'], 0.9)
+    
+    def test_cross_validate_scores_current_model(self):
+        model = ComplianceModel()
+        model.model.set_params(n_estimators=-1)
+        with self.assertRaises(ValueError):
+            model.cross_validate(self.X, self.y)
+
+if __name__ == '__main__':
+    unittest.main()
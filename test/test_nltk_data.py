@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.nltk_data import verify_nltk_data
+
+class TestNltkData(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.saved_env = os.environ.get('NLTK_DATA')
+        self.saved_path = list(sys.modules['nltk'].data.path) if 'nltk' in sys.modules else None
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        if self.saved_env is None:
+            os.environ.pop('NLTK_DATA', None)
+        else:
+            os.environ['NLTK_DATA'] = self.saved_env
+        if self.saved_path is not None:
+            sys.modules['nltk'].data.path[:] = self.saved_path
+    
+    def test_local_directory(self):
+        os.makedirs(os.path.join(self.tmpdir.name, 'tokenizers', 'punkt'))
+        os.makedirs(os.path.join(self.tmpdir.name, 'corpora'))
+        open(os.path.join(self.tmpdir.name, 'corpora', 'stopwords.zip'), 'wb').close()
+        
+        verify_nltk_data(self.tmpdir.name)
+        
+        self.assertEqual(os.environ['NLTK_DATA'].split(os.pathsep)[0], os.path.abspath(self.tmpdir.name))
+    
+    def test_missing_resources(self):
+        os.makedirs(os.path.join(self.tmpdir.name, 'tokenizers', 'punkt'))
+        
+        with self.assertRaises(LookupError) as context:
+            verify_nltk_data(self.tmpdir.name)
+        
+        self.assertIn(': stopwords;', str(context.exception))
+        self.assertIn('download_nltk_data.py', str(context.exception))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.parsed_policy import ParsedPolicy, parse_policy, parse_cache_info, clear_parse_cache
+from src.models.similarity_model import SECTION_HEADING_MAX_LENGTH, SimilarityModel
+from src.text_processor import TextProcessor
+
+SAMPLE_POLICY = """PRIVACY POLICY
+
+DATA COLLECTION:
+We collect personal information from users.
+It is stored for 30 days.
+
+This sentence has a colon: but it is long enough that it should be read as prose rather than a heading.
+
+SECURITY:
+We use encryption to protect user data.
+"""
+
+class TestParsedPolicy(unittest.TestCase):
+    def setUp(self):
+        clear_parse_cache()
+    
+    def test_sections_and_spans(self):
+        parsed = ParsedPolicy(SAMPLE_POLICY, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        
+        self.assertEqual(list(parsed.sections), ['data collection', 'security'])
+        self.assertTrue(parsed.sections['data collection'].endswith('rather than a heading.'))
+        start, end = parsed.section_spans['security']
+        self.assertEqual(parsed.text[start:end], 'We use encryption to protect user data.')
+        self.assertEqual(parsed.lower_sections['security'], 'we use encryption to protect user data.')
+        self.assertEqual(parsed.section_tokens['security'][:3], ['We', 'use', 'encryption'])
+        start, end = parsed.sentence_offsets[1]
+        self.assertEqual(parsed.text[start:end], 'It is stored for 30 days.')
+    
+    def test_default_heading_rule_matches_extract_sections(self):
+        parsed = ParsedPolicy(SAMPLE_POLICY)
+        
+        # Any line with a colon is a heading, however long, as the checker has always read it
+        self.assertEqual(parsed.sections['data collection'], 'We collect personal information from users. '
+                                                             'It is stored for 30 days.')
+        self.assertEqual(parsed.sections, TextProcessor().extract_sections(SAMPLE_POLICY))
+    
+    def test_parse_is_memoized_per_heading_rule(self):
+        default = parse_policy(SAMPLE_POLICY)
+        strict = parse_policy(SAMPLE_POLICY, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        
+        self.assertIsNot(default, strict)
+        self.assertIs(parse_policy(default, max_heading_length=SECTION_HEADING_MAX_LENGTH), strict)
+        self.assertIs(parse_policy(strict), default)
+        self.assertEqual(parse_cache_info(), {'hits': 2, 'misses': 2, 'entries': 2})
+    
+    def test_parse_is_memoized_by_content(self):
+        first = parse_policy(SAMPLE_POLICY)
+        second = parse_policy(SAMPLE_POLICY.replace('\n', '\r\n'))
+        
+        self.assertIs(first, second)
+        self.assertIs(parse_policy(first), first)
+        self.assertEqual(parse_cache_info(), {'hits': 1, 'misses': 1, 'entries': 1})
+    
+    def test_similarity_model_reuses_parse(self):
+        model = SimilarityModel()
+        new_policy = SAMPLE_POLICY.replace('30 days', '90 days')
+        
+        model.detect_changes(SAMPLE_POLICY, new_policy)
+        model.calculate_overall_similarity(SAMPLE_POLICY, new_policy, update_idf=True)
+        
+        self.assertEqual(parse_cache_info()['misses'], 2)
+        parsed = parse_policy(SAMPLE_POLICY, max_heading_length=SECTION_HEADING_MAX_LENGTH)
+        self.assertIn(('hashed_counts', model.tfidf.n_features), parsed._derived)
+
+if __name__ == '__main__':
+    unittest.main()
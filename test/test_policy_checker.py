@@ -4,6 +4,7 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from src.policy_checker import PolicyChecker
+from src.result_cache import ResultCache
 
 class TestPolicyChecker(unittest.TestCase):
     def setUp(self):
@@ -49,5 +50,27 @@ class TestPolicyChecker(unittest.TestCase):
         result = self.checker.check_policy_compliance("")
         self.assertEqual(result['compliance_percentage'], 0)
 
+    def test_check_policy_stream_matches_full_text(self):
+        chunks = [self.sample_policy[i:i + 37] for i in range(0, len(self.sample_policy), 37)]
+        
+        self.assertEqual(
+            self.checker.check_policy_stream(iter(chunks)),
+            self.checker.check_policy_compliance(self.sample_policy)
+        )
+    
+    def test_cached_results_invalidated_by_rule_change(self):
+        cache = ResultCache(max_entries=10)
+        checker = PolicyChecker(result_cache=cache)
+        
+        first = checker.check_policy_compliance(self.sample_policy)
+        second = checker.check_policy_compliance(self.sample_policy)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()['hits'], 1)
+        
+        checker.policy_rules['retention'] = {'required': True, 'keywords': ['retain'], 'weight': 1.0}
+        third = checker.check_policy_compliance(self.sample_policy)
+        self.assertEqual(cache.stats()['misses'], 2)
+        self.assertEqual(third['rule_violations'][-1]['rule'], 'retention')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
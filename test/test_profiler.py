@@ -0,0 +1,100 @@
+import unittest
+import sys
+import os
+import pstats
+import tempfile
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.profiler import RequestProfiler, StackSampler
+
+def busy_work(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+class TestRequestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.directory.name, 'profiles')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_disabled_by_default(self):
+        profiler = RequestProfiler()
+        self.assertFalse(profiler.enabled)
+        self.assertEqual(profiler.list_profiles(), [])
+        with self.assertRaises(ValueError):
+            RequestProfiler(enabled=True)
+
+    def test_triggers(self):
+        profiler = RequestProfiler(enabled=True, output_dir=self.output_dir, token='secret')
+        self.assertEqual(profiler.trigger('secret', '/api/health'), 'requested')
+        self.assertIsNone(profiler.trigger('wrong', '/api/check_policy'))
+        self.assertIsNone(profiler.trigger(None, '/api/check_policy'))
+
+        profiler.configure(output_dir=self.output_dir, sample_every=1, endpoints=['/api/check_policy'])
+        self.assertEqual(profiler.trigger(None, '/api/check_policy'), 'sampled')
+        self.assertIsNone(profiler.trigger(None, '/api/health'))
+        # Without a configured token no value is trusted
+        self.assertFalse(profiler.is_trusted(''))
+
+    def test_cprofile_profile_is_indexed(self):
+        profiler = RequestProfiler(enabled=True, output_dir=self.output_dir, token='secret')
+        profile = profiler.start('req-1', 'requested')
+        busy_work(0.01)
+        record = profiler.finish(profile, 'POST', '/api/check_policy', '/api/check_policy', 200)
+
+        self.assertEqual(record['format'], 'pstats')
+        self.assertEqual(record['request_id'], 'req-1')
+        path = profiler.profile_path(record['id'])
+        stats = pstats.Stats(path)
+        self.assertTrue(any(name == 'busy_work' for _, _, name in stats.stats))
+
+        listed = profiler.list_profiles()
+        self.assertEqual([p['id'] for p in listed], [record['id']])
+        self.assertEqual(listed[0]['request_id'], 'req-1')
+        self.assertEqual(listed[0]['endpoint'], '/api/check_policy')
+        self.assertEqual(listed[0]['status'], 200)
+        self.assertIsNone(profiler.profile_path('missing'))
+
+    def test_sampling_profile(self):
+        profiler = RequestProfiler(enabled=True, output_dir=self.output_dir, mode='sampling', interval=0.001)
+        profile = profiler.start('../etc/passwd', 'sampled')
+        busy_work(0.2)
+        record = profiler.finish(profile, 'POST', '/api/complaint_report', '/api/complaint_report', 500)
+
+        # Unsafe request ids are not recorded, and never used in file names
+        self.assertIsNone(record['request_id'])
+        self.assertNotIn('/', record['filename'])
+        with open(profiler.profile_path(record['id']), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(' ', 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any('busy_work' in line for line in lines))
+
+    def test_keeps_newest_profiles(self):
+        profiler = RequestProfiler(enabled=True, output_dir=self.output_dir, max_profiles=2)
+        # A reused request id must not overwrite an indexed profile and orphan its file
+        for index in range(4):
+            profile = profiler.start('req-1' if index < 2 else f'req-{index}', 'requested')
+            profile['created_at'] += index
+            profiler.finish(profile)
+
+        self.assertEqual([p['request_id'] for p in profiler.list_profiles()], ['req-3', 'req-2'])
+        files = [name for name in os.listdir(self.output_dir) if name.endswith('.pstats')]
+        self.assertEqual(len(files), 2)
+
+class TestStackSampler(unittest.TestCase):
+    def test_samples_calling_thread(self):
+        sampler = StackSampler(interval=0.001).start()
+        busy_work(0.1)
+        sampler.stop()
+        self.assertTrue(any('busy_work' in stack for stack in sampler.counts))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import pickle
+import sqlite3
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.result_cache import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'cache.db')
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_lru_eviction_and_counters(self):
+        cache = ResultCache(max_entries=2)
+        cache.set('a', {'value': 1})
+        cache.set('b', {'value': 2})
+        self.assertEqual(cache.get('a'), {'value': 1})
+        cache.set('c', {'value': 3})
+        
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), {'value': 3})
+        
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['evictions'], 1)
+    
+    def test_returns_copies(self):
+        cache = ResultCache()
+        value = {'warnings': []}
+        cache.set('key', value)
+        value['warnings'].append('changed')
+        
+        cached = cache.get('key')
+        cached['policy_id'] = 'x'
+        self.assertEqual(cache.get('key'), {'warnings': []})
+    
+    def test_disk_tier_shared_between_instances(self):
+        writer = ResultCache(max_entries=1, db_path=self.db_path)
+        writer.set('a', {'value': 1})
+        writer.set('b', {'value': 2})
+        
+        reader = pickle.loads(pickle.dumps(writer))
+        self.assertEqual(reader.get('a'), {'value': 1})
+        self.assertEqual(reader.stats()['disk_hits'], 1)
+        self.assertEqual(reader.get('a'), {'value': 1})
+        self.assertEqual(reader.stats()['hits'], 1)
+    
+    def test_disk_tier_bounded(self):
+        cache = ResultCache(max_entries=1, db_path=self.db_path, max_disk_entries=5)
+        for index in range(1000):
+            cache.set(str(index), index)
+        
+        self.assertIsNone(cache.get('0'))
+        self.assertEqual(cache.get('999'), 999)
+        self.assertEqual(cache.stats()['disk_evictions'], 995)
+
+    def test_disk_tier_evicts_least_recently_used(self):
+        cache = ResultCache(max_entries=1, db_path=self.db_path, max_disk_entries=5)
+        for index in range(1000):
+            cache.set(str(index), index)
+            if index == 996:
+                # Read from disk by another process, so it counts as recently used
+                self.assertEqual(pickle.loads(pickle.dumps(cache)).get('0'), 0)
+        
+        self.assertEqual(cache.get('0'), 0)
+        self.assertIsNone(cache.get('995'))
+        self.assertEqual(cache.get('996'), 996)
+    
+    def test_disk_tier_upgrades_old_table(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('CREATE TABLE results (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)')
+        conn.execute("INSERT INTO results VALUES ('a', '1', 0)")
+        conn.commit()
+        conn.close()
+        
+        cache = ResultCache(db_path=self.db_path)
+        self.assertEqual(cache.get('a'), 1)
+        cache.set('b', 2)
+        self.assertEqual(ResultCache(db_path=self.db_path).get('b'), 2)
+
+if __name__ == '__main__':
+    unittest.main()
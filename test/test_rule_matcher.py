@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.rule_matcher import RuleMatcher
+
+def naive_match(policy_rules, sections):
+    matches = {}
+    for rule_name, rule in policy_rules.items():
+        for section_name, section_text in sections.items():
+            section_lower = section_text.lower()
+            keyword_count = sum(1 for keyword in rule['keywords'] if keyword in section_lower)
+            if keyword_count > 0:
+                matches.setdefault(rule_name, []).append((section_name, keyword_count))
+    return matches
+
+class TestRuleMatcher(unittest.TestCase):
+    def setUp(self):
+        self.policy_rules = {
+            'data_collection': {'required': True, 'keywords': ['collect', 'gather', 'obtain'], 'weight': 1.0},
+            'third_party_sharing': {'required': True, 'keywords': ['third party', 'share with', 'partner'], 'weight': 1.0},
+            'user_rights': {'required': True, 'keywords': ['access', 'delete', 'modify', 'right'], 'weight': 1.0},
+            'overlapping': {'required': False, 'keywords': ['part', 'partner', 'partners', 'artne', 'right'], 'weight': 0.5},
+            'empty': {'required': False, 'keywords': [], 'weight': 1.0}
+        }
+        self.sections = {
+            'general': 'We COLLECT and gather data. Our Partners may access it.',
+            'user rights': 'You have the right to delete or modify records. Copyright applies.',
+            'sharing': 'We share with a third party partner.',
+            'other': 'Nothing relevant here.'
+        }
+    
+    def test_matches_naive_scan(self):
+        matcher = RuleMatcher(self.policy_rules)
+        compiled = {
+            rule_name: [(section, count) for section, count, _ in hits]
+            for rule_name, hits in matcher.match(self.sections).items()
+        }
+        
+        self.assertEqual(compiled, naive_match(self.policy_rules, self.sections))
+    
+    def test_scan_counts_overlapping_occurrences(self):
+        matcher = RuleMatcher(self.policy_rules)
+        hits = matcher.scan('partners partner right copyright')
+        
+        self.assertEqual(hits['part'], 2)
+        self.assertEqual(hits['partner'], 2)
+        self.assertEqual(hits['partners'], 1)
+        self.assertEqual(hits['artne'], 2)
+        self.assertEqual(hits['right'], 2)
+        self.assertNotIn('access', hits)
+    
+    def test_keyword_hits_reported_per_rule(self):
+        matcher = RuleMatcher(self.policy_rules)
+        matches = matcher.match({'general': 'collect collect obtain'})
+        
+        self.assertEqual(matches['data_collection'], [('general', 2, {'collect': 2, 'obtain': 1})])
+    
+    def test_special_characters_are_literal(self):
+        rules = {'opt_out': {'required': True, 'keywords': ['opt-out', 'a.b', '(x)'], 'weight': 1.0}}
+        matcher = RuleMatcher(rules)
+        
+        self.assertEqual(matcher.match({'s': 'you may opt-out (x)'})['opt_out'], [('s', 2, {'opt-out': 1, '(x)': 1})])
+        self.assertEqual(matcher.match({'s': 'axb'}), {})
+
+if __name__ == '__main__':
+    unittest.main()
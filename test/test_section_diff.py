@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+import random
+from difflib import SequenceMatcher
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.section_diff import SectionDiffer, MAJOR_REWRITE_THRESHOLD, SIGNIFICANT_CHANGE_THRESHOLD
+from src.models.similarity_model import SimilarityModel
+from benchmarks.synthetic import generate_sentence
+
+def band(similarity):
+    if similarity < MAJOR_REWRITE_THRESHOLD:
+        return 'major'
+    if similarity < SIGNIFICANT_CHANGE_THRESHOLD:
+        return 'significant'
+    return 'minor'
+
+class TestSectionDiffer(unittest.TestCase):
+    def test_tiers_agree_with_full_ratio_on_bands(self):
+        rng = random.Random(0)
+        differ = SectionDiffer()
+        for _ in range(200):
+            old = [generate_sentence(rng) for _ in range(rng.choice([2, 10, 40]))]
+            rewrite = rng.random()
+            new = [generate_sentence(rng) if rng.random() < rewrite else s for s in old]
+            if rng.random() < 0.2:
+                rng.shuffle(new)
+            old_text, new_text = ' '.join(old), ' '.join(new)
+            
+            similarity, _ = differ.compare(differ.section(old_text), differ.section(new_text))
+            exact = SequenceMatcher(None, old_text.split(), new_text.split()).ratio()
+            self.assertEqual(band(similarity), band(exact))
+    
+    def test_cheap_tiers_skip_full_ratio(self):
+        differ = SectionDiffer()
+        text = differ.section("we collect your email address")
+        
+        self.assertEqual(differ.compare(text, differ.section("we collect your email address")), (1.0, 'hash'))
+        self.assertEqual(differ.compare(text, differ.section("cookies")), (0.0, 'quick_ratio'))
+        self.assertEqual(differ.compare(text, differ.section("we")), (2 / 6, 'ratio'))
+        long_text = differ.section("we collect your email address and phone number for billing")
+        self.assertEqual(differ.compare(long_text, differ.section("we")), (2 / 11, 'real_quick_ratio'))
+    
+    def test_match_sections_pairs_best_candidates(self):
+        differ = SectionDiffer()
+        removed = {'security': differ.section("we encrypt all stored data and audit access logs yearly")}
+        added = {
+            'data protection': differ.section("we encrypt all stored data and audit access logs every year"),
+            'contact': differ.section("email the privacy team")
+        }
+        
+        pairs = differ.match_sections(removed, added)
+        self.assertEqual([(old, new) for old, new, _ in pairs], [('security', 'data protection')])
+
+class TestDetectChanges(unittest.TestCase):
+    def test_renamed_and_moved_sections(self):
+        old_policy = ("USER RIGHTS:\nYou may access and delete your data at any time.\n"
+                      "SECURITY:\nWe encrypt all data at rest.\n"
+                      "COOKIES:\nWe use cookies for analytics.")
+        new_policy = ("YOUR RIGHTS:\nYou may access and delete your data at any time.\n"
+                      "COOKIES:\nWe use cookies for analytics and ads.\n"
+                      "DATA PROTECTION:\nWe encrypt all data at rest.\n"
+                      "CONTACT:\nEmail us.")
+        
+        changes = {c['section']: c for c in SimilarityModel().detect_changes(old_policy, new_policy)}
+        
+        self.assertEqual(changes['your rights']['change_type'], 'renamed')
+        self.assertEqual(changes['your rights']['old_section'], 'user rights')
+        self.assertEqual(changes['data protection']['change_type'], 'moved')
+        self.assertEqual(changes['data protection']['similarity'], 1.0)
+        self.assertEqual(changes['cookies']['change_type'], 'modified')
+        self.assertEqual(changes['contact']['change_type'], 'added')
+        self.assertEqual(len(changes), 4)
+
+if __name__ == '__main__':
+    unittest.main()
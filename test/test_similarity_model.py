@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from scipy import sparse
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data_loader import DataLoader
+from src.history_store import InMemoryHistoryStore
+from src.models.similarity_model import SimilarityModel
+from src.models.online_vectorizer import OnlineTfidfVectorizer
+from src.update_tracker import UpdateTracker
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config.yaml')
+
+class TestSimilarityModel(unittest.TestCase):
+    def test_unfitted_model_uses_online_vectorizer(self):
+        model = SimilarityModel()
+        
+        self.assertTrue(model.is_online)
+        self.assertAlmostEqual(model.calculate_overall_similarity("we encrypt data", "we encrypt data"), 1.0)
+        self.assertEqual(model.calculate_overall_similarity("encrypt data", "cookies advertising"), 0.0)
+        self.assertTrue(sparse.issparse(model.vectorize(["we encrypt data"])))
+    
+    def test_online_idf_downweights_common_terms(self):
+        vectorizer = OnlineTfidfVectorizer(n_features=2 ** 10)
+        before = vectorizer.transform(["data encrypted"]).toarray()[0]
+        vectorizer.partial_fit(["data collected", "data shared", "data retained"])
+        after = vectorizer.transform(["data encrypted"], update=True).toarray()[0]
+        
+        self.assertEqual(vectorizer.n_documents, 4)
+        data_column = vectorizer.hasher.transform(["data"]).indices[0]
+        self.assertLess(after[data_column], before[data_column])
+    
+    def test_fit_from_csv_and_reload(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            csv_path = os.path.join(tmpdir, 'policies.csv')
+            pd.DataFrame({
+                'policy_id': ['p1', 'p2'],
+                'policy_text': ['We collect email addresses.', 'We encrypt stored data.'],
+                'version': [1, 1],
+                'effective_date': ['2024-01-01', '2024-01-01'],
+                'company': ['a', 'b']
+            }).to_csv(csv_path, index=False)
+            artifact = os.path.join(tmpdir, 'models', 'similarity_tfidf.pkl')
+            
+            model = SimilarityModel()
+            model.fit_vectorizer_from_csv(csv_path, DataLoader(CONFIG_PATH))
+            model.save_vectorizer(artifact)
+            loaded = SimilarityModel(vectorizer_path=artifact)
+            
+            self.assertFalse(loaded.is_online)
+            self.assertEqual(loaded.tfidf.vocabulary_, model.tfidf.vocabulary_)
+            self.assertAlmostEqual(loaded.calculate_overall_similarity("encrypt data", "encrypt data"), 1.0)
+
+class TestUpdateTrackerWithoutTraining(unittest.TestCase):
+    def test_track_and_find_similar_updates(self):
+        tracker = UpdateTracker(history_store=InMemoryHistoryStore())
+        old_policy = "PRIVACY:\nWe collect your email.\nSECURITY:\nWe encrypt data."
+        new_policy = "PRIVACY:\nWe collect your email and phone number."
+        
+        first = tracker.track_policy_update(old_policy, new_policy, policy_id='a', version=2)
+        second = tracker.track_policy_update(old_policy, new_policy, policy_id='b', version=2)
+        
+        self.assertLess(first['update_summary']['similarity_score'], 1.0)
+        similar = tracker.find_similar_updates(second['update_summary'], similarity_threshold=0.5)
+        self.assertEqual([u['historical_update']['policy_id'] for u in similar], ['a'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+import numpy as np
+from scipy import sparse
+from sklearn.metrics.pairwise import cosine_similarity
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.vector_index import VectorIndex
+from src.models.similarity_model import SimilarityModel
+
+class TestVectorIndex(unittest.TestCase):
+    def setUp(self):
+        self.vectors = sparse.random(300, 200, density=0.05, format='csr', random_state=0)
+        self.ids = np.arange(1000, 1300)
+        self.query = self.vectors[7] + sparse.random(1, 200, density=0.01, format='csr', random_state=1)
+    
+    def expected_top(self, k):
+        scores = cosine_similarity(self.query, self.vectors)[0]
+        order = np.argsort(-scores, kind='stable')[:k]
+        return [(int(self.ids[i]), scores[i]) for i in order]
+    
+    def test_exact_search_matches_cosine_similarity(self):
+        index = VectorIndex()
+        index.add(self.ids[:200], self.vectors[:200])
+        index.add(self.ids[200:], self.vectors[200:])
+        
+        results = index.search(self.query, k=10)
+        expected = self.expected_top(10)
+        self.assertEqual([i for i, _ in results], [i for i, _ in expected])
+        for (_, score), (_, expected_score) in zip(results, expected):
+            self.assertAlmostEqual(score, expected_score)
+    
+    def test_threshold_and_remove(self):
+        index = VectorIndex()
+        index.add(self.ids, self.vectors)
+        
+        self.assertEqual(index.search(self.query, k=None, threshold=0.9)[0][0], 1007)
+        self.assertEqual(index.remove([1007, 5]), 1)
+        self.assertNotIn(1007, [i for i, _ in index.search(self.query, k=None, threshold=0.0)])
+        self.assertEqual(len(index), 299)
+    
+    def test_approximate_finds_near_duplicate(self):
+        index = VectorIndex(approximate=True)
+        index.add(self.ids, self.vectors)
+        
+        self.assertEqual(index.search(self.query, k=1)[0][0], 1007)
+    
+    def test_save_and_memory_mapped_load(self):
+        for approximate in (False, True):
+            index = VectorIndex(approximate=approximate)
+            index.add(self.ids, self.vectors)
+            with tempfile.TemporaryDirectory() as tmpdir:
+                index.save(tmpdir)
+                loaded = VectorIndex.load(tmpdir)
+                
+                self.assertEqual(loaded.search(self.query, k=5), index.search(self.query, k=5))
+                loaded.remove([1007])
+                loaded.add([5000], self.vectors[7])
+                self.assertEqual(loaded.search(self.query, k=1)[0][0], 5000)
+                del loaded
+
+class TestSimilarityModelIndex(unittest.TestCase):
+    def setUp(self):
+        self.model = SimilarityModel()
+        self.model.train([
+            "We collect your email address and share it with partners.",
+            "All stored data is encrypted and kept secure.",
+            "Cookies are used for advertising and analytics.",
+            "You have the right to access and delete your data."
+        ])
+    
+    def test_returns_best_matches_first(self):
+        results = self.model.find_similar_policies("Stored data is encrypted", threshold=0.0, top_n=2)
+        
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['index'], 1)
+        self.assertGreaterEqual(results[0]['similarity'], results[1]['similarity'])
+    
+    def test_add_and_remove_policy(self):
+        new_index = self.model.add_policy("Encrypted data, encrypted backups.")
+        self.assertEqual(self.model.find_similar_policies("encrypted data", threshold=0.1)[0]['index'], new_index)
+        
+        self.model.remove_policy(new_index)
+        self.assertNotIn(new_index, [r['index'] for r in self.model.find_similar_policies("encrypted data", threshold=0.0)])
+
+if __name__ == '__main__':
+    unittest.main()